@@ -0,0 +1,123 @@
+"""
+Micro-benchmarks for page-object and driver operations.
+
+Run with: python run_tests.py --benchmark
+"""
+import pytest
+from selenium.webdriver.common.by import By
+from utils.driver_factory import DriverFactory
+from utils.screenshot import ScreenshotHelper
+from utils.static_driver import StaticDriverFactory
+from pages.base_page import BasePage
+from pages.homepage import Homepage
+from pages.search_results_page import SearchResultsPage
+from pages.streamer_page import StreamerPage
+
+
+MISSING_ELEMENT = (By.CSS_SELECTOR, "[data-a-target='does-not-exist']")
+
+# Misses wait out the implicit timeout, so they only get a few rounds
+MISS_ROUNDS = 3
+
+
+def bench_setup_driver(benchmark, standin_url):
+    """DriverFactory.setup_driver: cold browser start with mobile emulation."""
+    started = []
+    
+    def new_factory():
+        while started:
+            started.pop().quit_driver()
+        factory = DriverFactory()
+        started.append(factory)
+        return (factory,), {}
+    
+    benchmark.pedantic(lambda factory: factory.setup_driver(), setup=new_factory, rounds=5)
+    while started:
+        started.pop().quit_driver()
+
+
+class BenchBasePage:
+    """BasePage element lookups on the stand-in homepage."""
+    
+    @pytest.fixture(autouse=True)
+    def open_homepage(self, driver_manager):
+        driver_manager.navigate_to_twitch()
+        self.page = BasePage(driver_manager)
+    
+    def bench_find_element_hit(self, benchmark):
+        benchmark(self.page.find_element, Homepage.TWITCH_LOGO)
+    
+    def bench_find_element_miss(self, benchmark):
+        def find_missing():
+            try:
+                self.page.find_element(MISSING_ELEMENT)
+            except Exception:
+                pass
+        
+        benchmark.pedantic(find_missing, rounds=MISS_ROUNDS)
+    
+    def bench_is_element_present_hit(self, benchmark):
+        assert benchmark(self.page.is_element_present, Homepage.TWITCH_LOGO)
+    
+    def bench_is_element_present_miss(self, benchmark):
+        result = benchmark.pedantic(self.page.is_element_present, args=(MISSING_ELEMENT,), rounds=MISS_ROUNDS)
+        assert not result
+
+
+def bench_search_for_term(benchmark, driver_manager, standin_url):
+    """Homepage.search_for_term on a freshly loaded search page."""
+    homepage = Homepage(driver_manager)
+    
+    def open_search_page():
+        driver_manager.driver.get(f"{standin_url}/search")
+        return (), {}
+    
+    benchmark.pedantic(lambda: homepage.search_for_term("StarCraft II"), setup=open_search_page, rounds=10)
+
+
+def bench_scroll_down(benchmark, driver_manager, standin_url):
+    """SearchResultsPage.scroll_down twice from the top of a category page."""
+    driver_manager.driver.get(f"{standin_url}/directory/category/starcraft-ii")
+    results_page = SearchResultsPage(driver_manager)
+    
+    def scroll_to_top():
+        driver_manager.driver.execute_script("window.scrollTo(0, 0);")
+        return (2,), {}
+    
+    benchmark.pedantic(results_page.scroll_down, setup=scroll_to_top, rounds=20)
+
+
+def bench_validate_thumbnails(benchmark, driver_manager, standin_url):
+    """SearchResultsPage.validate_thumbnails over 200 result cards in one script call."""
+    driver_manager.driver.get(f"{standin_url}/directory/category/starcraft-ii?results=200")
+    results_page = SearchResultsPage(driver_manager)
+    checks = benchmark(results_page.validate_thumbnails, force_lazy=False)
+    assert len(checks) == 200
+
+
+def bench_streamer_is_page_loaded(benchmark, driver_manager, standin_url):
+    """StreamerPage.is_page_loaded on a loaded streamer page."""
+    driver_manager.driver.get(f"{standin_url}/videos/1")
+    streamer_page = StreamerPage(driver_manager)
+    assert benchmark(streamer_page.is_page_loaded)
+
+
+def bench_take_screenshot(benchmark, driver_manager, tmp_path):
+    """ScreenshotHelper.take_screenshot without the Allure attachment."""
+    driver_manager.navigate_to_twitch()
+    helper = ScreenshotHelper(driver_manager.driver, base_dir=str(tmp_path))
+    assert benchmark(helper.take_screenshot, "benchmark.png", attach_to_allure=False)
+
+
+def bench_http_tier_checks(benchmark, standin_url):
+    """Homepage fetch + logo check through the HTTP tier (no browser); rounds per second = checks per second."""
+    factory = StaticDriverFactory()
+    factory.setup_driver(device="desktop")
+    homepage = Homepage(factory)
+    
+    def check_homepage():
+        factory.driver.get(standin_url)
+        return homepage.get_twitch_logo_aria_label()
+    
+    assert benchmark(check_homepage) == "Go to the Twitch home page"
+    factory.quit_driver()
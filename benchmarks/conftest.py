@@ -0,0 +1,31 @@
+"""
+Pytest fixtures for the framework micro-benchmarks.
+
+The benchmarks always run headless against the local stand-in site, so results
+only move when the framework (or the machine) changes.
+"""
+import pytest
+from config.config import Config
+from utils.driver_factory import DriverFactory
+from utils.twitch_standin import StandinServer
+
+
+@pytest.fixture(scope="session")
+def standin_url():
+    """Start the stand-in site and point Config.TWITCH_URL at it."""
+    server = StandinServer(results=200).start()
+    original_url, original_headless = Config.TWITCH_URL, Config.HEADLESS
+    Config.TWITCH_URL = server.url
+    Config.HEADLESS = True
+    yield server.url
+    Config.TWITCH_URL, Config.HEADLESS = original_url, original_headless
+    server.stop()
+
+
+@pytest.fixture(scope="module")
+def driver_manager(standin_url):
+    """One headless browser session shared by the benchmarks of a module."""
+    driver_manager = DriverFactory()
+    driver_manager.setup_driver()
+    yield driver_manager
+    driver_manager.quit_driver()
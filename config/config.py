@@ -2,6 +2,8 @@
 Configuration settings for the Twitch UI automation framework.
 """
 import os
+import re
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,29 +11,85 @@ load_dotenv()
 class Config:
     """Configuration class for test settings."""
     
-    # Base URL
-    TWITCH_URL = "https://www.twitch.tv"
+    # Base URL (point TWITCH_URL at the local stand-in site for hermetic runs)
+    TWITCH_URL = os.getenv("TWITCH_URL", "https://www.twitch.tv").rstrip("/")
+    TWITCH_DOMAIN = re.sub(r"^www\.", "", urlparse(TWITCH_URL).netloc)
+    CONNECTIVITY_CHECK_URL = os.getenv("CONNECTIVITY_CHECK_URL", "https://www.google.com")
     
     # Browser settings
     BROWSER = os.getenv("BROWSER", "chrome")
     HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-    WINDOW_SIZE = os.getenv("WINDOW_SIZE", "375,812")  # iPhone X dimensions
-    
-    # Mobile emulation settings
-    MOBILE_EMULATION = {
-        "deviceMetrics": {
-            "width": 375,
-            "height": 812,
-            "pixelRatio": 3.0
-        },
-        "userAgent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1"
-    }
+    WINDOW_SIZE = os.getenv("WINDOW_SIZE", "1920,1080")  # window of the "desktop" device profile
+    
+    # Device emulation (profiles in config/devices.py)
+    DEVICE = os.getenv("DEVICE", "iphone_x")
+    DEVICES = os.getenv("DEVICES", "")  # run each test once per device: comma-separated names or "all"
     
     # Timeouts
     IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", "10"))
     EXPLICIT_WAIT = int(os.getenv("EXPLICIT_WAIT", "20"))
     PAGE_LOAD_TIMEOUT = int(os.getenv("PAGE_LOAD_TIMEOUT", "30"))
     
+    # Instrumentation
+    TRACE_COMMANDS = os.getenv("TRACE_COMMANDS", "false").lower() == "true"
+    COMMAND_TRACE_DIR = os.getenv("COMMAND_TRACE_DIR", "reports/command_traces")
+    STEP_TIMING = os.getenv("STEP_TIMING", "false").lower() == "true"
+    STEP_TIMELINE_FILE = os.getenv("STEP_TIMELINE_FILE", "reports/step_timeline.jsonl")
+    
+    # Front-end performance metrics and per-page budgets (page object class name -> metric maximums)
+    COLLECT_WEB_VITALS = os.getenv("COLLECT_WEB_VITALS", "false").lower() == "true"
+    PERFORMANCE_BUDGETS = {
+        "default": {
+            "ttfb_ms": 1500,
+            "lcp_ms": 4000,
+            "cls": 0.25,
+            "long_tasks_total_ms": 1000,
+        },
+        "Homepage": {
+            "dom_content_loaded_ms": 5000,
+        },
+        "SearchResultsPage": {
+            "dom_content_loaded_ms": 5000,
+            "transfer_kb": 8000,
+        },
+        "StreamerPage": {
+            "lcp_ms": 5000,
+            "long_tasks_total_ms": 2000,
+        },
+    }
+    
+    # Per-test HAR export from the Chrome performance log ("failure" or "always" attaches to Allure)
+    CAPTURE_HAR = os.getenv("CAPTURE_HAR", "false").lower() == "true"
+    HAR_DIR = os.getenv("HAR_DIR", "reports/har")
+    ATTACH_HAR = os.getenv("ATTACH_HAR", "failure").lower()
+    
+    # Ranked sleep / explicit-wait / WebDriver / Python time per call site across the suite
+    SLEEP_REPORT = os.getenv("SLEEP_REPORT", "false").lower() == "true"
+    SLEEP_REPORT_FILE = os.getenv("SLEEP_REPORT_FILE", "reports/sleep_report.json")
+    
+    # JS heap / DOM node growth sampling; slope limits are growth per sample (scroll step or playback tick)
+    SAMPLE_MEMORY = os.getenv("SAMPLE_MEMORY", "false").lower() == "true"
+    MEMORY_REPORT_DIR = os.getenv("MEMORY_REPORT_DIR", "reports/memory")
+    MEMORY_LEAK_SLOPES = {
+        "js_heap_mb": float(os.getenv("LEAK_SLOPE_JS_HEAP_MB", "0.5")),
+        "nodes": float(os.getenv("LEAK_SLOPE_NODES", "500")),
+        "harness_rss_mb": float(os.getenv("LEAK_SLOPE_HARNESS_RSS_MB", "1.0")),
+    }
+    
+    # Chrome tracing: "off", "steps" (keep traces of steps over budget) or "test" (trace whole tests)
+    CHROME_TRACE = os.getenv("CHROME_TRACE", "off").lower()
+    TRACE_CATEGORIES = os.getenv(
+        "TRACE_CATEGORIES",
+        "devtools.timeline,disabled-by-default-devtools.timeline,v8.execute,blink.user_timing,loading,netlog"
+    )
+    TRACE_DIR = os.getenv("TRACE_DIR", "reports/traces")
+    STEP_BUDGETS_MS = {
+        "default": int(os.getenv("STEP_BUDGET_MS", "5000")),
+        "DriverFactory.navigate_to_twitch": 8000,
+        "SearchResultsPage.click_starcraft_ii_category_link": 3000,
+        "Homepage.search_for_term": 3000,
+    }
+    
     # Screenshot settings
     SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", "screenshots")
     
@@ -39,7 +97,76 @@ class Config:
     SEARCH_TERM = "StarCraft II"
     SCROLL_COUNT = 2
     
+    # Multi-term search mode (comma-separated list or path to a file with one term per line)
+    SEARCH_TERMS = os.getenv("SEARCH_TERMS", "")
+    SEARCH_POOL_SIZE = int(os.getenv("SEARCH_POOL_SIZE", "0"))  # 0 = one session per CPU core
+    SEARCH_REPORT = os.getenv("SEARCH_REPORT", "reports/search_terms.jsonl")
+    
+    # Asyncio browser pool (utils/async_browser.py) and the crawl mode built on it
+    ASYNC_MAX_SESSIONS = int(os.getenv("ASYNC_MAX_SESSIONS", "0"))  # 0 = one session per CPU core
+    CRAWL_REPORT = os.getenv("CRAWL_REPORT", "reports/crawl.jsonl")
+    
+    # Browserless HTTP tier (tests marked http_tier): pooled HTTP client + parsed HTML instead of Chrome
+    HTTP_TIER_POOL_SIZE = int(os.getenv("HTTP_TIER_POOL_SIZE", "10"))  # keep-alive connections per host
+    
+    # Parallel execution
+    TEST_DURATIONS_FILE = os.getenv("TEST_DURATIONS_FILE", ".test_durations.json")
+    DEFAULT_TEST_DURATION = float(os.getenv("DEFAULT_TEST_DURATION", "60"))  # seconds, for tests without history
+    CHROME_MEMORY_MB = int(os.getenv("CHROME_MEMORY_MB", "700"))  # budget per Chrome with mobile emulation
+    
+    # Resource governor: admits browser sessions only while memory and CPU allow
+    GOVERNOR_RESERVE_MB = int(os.getenv("GOVERNOR_RESERVE_MB", "512"))  # memory left for the OS and harness
+    GOVERNOR_MAX_LOAD_PER_CPU = float(os.getenv("GOVERNOR_MAX_LOAD_PER_CPU", "1.5"))  # 1-minute load average per core
+    GOVERNOR_POLL_INTERVAL = float(os.getenv("GOVERNOR_POLL_INTERVAL", "1"))  # seconds between re-checks while queued
+    
+    # Browser broker daemon (run_tests.py --broker): workers lease warm browsers over a Unix socket
+    BROWSER_BROKER = os.getenv("BROWSER_BROKER", "")  # socket path; empty = each session launches its own Chrome
+    BROKER_SOCKET = os.getenv("BROKER_SOCKET", "/tmp/twitch-ui-broker.sock")
+    BROKER_MAX_BROWSERS = int(os.getenv("BROKER_MAX_BROWSERS", "0"))  # 0 = size by CPU count and free RAM
+    BROKER_WARM_BROWSERS = int(os.getenv("BROKER_WARM_BROWSERS", "0"))  # 0 = launch BROKER_MAX_BROWSERS up front
+    BROKER_MAX_LEASES = int(os.getenv("BROKER_MAX_LEASES", "50"))  # leases before a browser is replaced
+    BROKER_HEALTH_INTERVAL = float(os.getenv("BROKER_HEALTH_INTERVAL", "30"))  # seconds
+    BROKER_ACQUIRE_TIMEOUT = int(os.getenv("BROKER_ACQUIRE_TIMEOUT", "300"))  # seconds
+    
+    # Change-based test selection
+    RECORD_TEST_DEPS = os.getenv("RECORD_TEST_DEPS", "false").lower() == "true"
+    TEST_DEPS_FILE = os.getenv("TEST_DEPS_FILE", ".test_dependencies.json")
+    
+    # Warm-state snapshot (cookies and storage after first-visit UI) restored into every new session
+    WARM_STATE = os.getenv("WARM_STATE", "false").lower() == "true"
+    WARM_STATE_FILE = os.getenv("WARM_STATE_FILE", ".warm_state.json")
+    WARM_STATE_MAX_AGE_HOURS = float(os.getenv("WARM_STATE_MAX_AGE_HOURS", "12"))
+    WARM_STATE_SETTLE = 3  # seconds for deferred first-visit UI to appear before capture
+    
+    # Chrome profile template cloned per session (skips Chrome's first-run initialisation)
+    PROFILE_TEMPLATE = os.getenv("PROFILE_TEMPLATE", "false").lower() == "true"
+    PROFILE_ROOT = os.getenv("PROFILE_ROOT", ".chrome_profiles")
+    PROFILE_TEMPLATE_MAX_AGE_HOURS = float(os.getenv("PROFILE_TEMPLATE_MAX_AGE_HOURS", "24"))
+    PROFILE_TEMPLATE_SETTLE = 10  # seconds for component updates while building the template
+    
+    # Shared HTTP disk cache, one locked shard per concurrent browser (python run_tests.py --warm-cache)
+    DISK_CACHE = os.getenv("DISK_CACHE", "false").lower() == "true"
+    DISK_CACHE_DIR = os.getenv("DISK_CACHE_DIR", ".chrome_cache")
+    DISK_CACHE_MB = int(os.getenv("DISK_CACHE_MB", "512"))  # per shard
+    WARM_CACHE_PAGES = ["", "/search?term=StarCraft%20II", "/directory/category/starcraft-ii"]  # relative to TWITCH_URL
+    
     # Wait conditions
     MODAL_WAIT_TIMEOUT = 10
     VIDEO_LOAD_TIMEOUT = 30
+    VIDEO_APPEAR_TIMEOUT = 5  # give up waiting for playback early when the page has no <video>
+    
+    # In-browser modal auto-dismissal (";"-separated MODAL_DISMISS_SELECTORS overrides the defaults);
+    # only dialog, consent and mature-gate buttons, so unrelated close buttons (chat, side panels) stay put
+    AUTO_DISMISS_MODALS = os.getenv("AUTO_DISMISS_MODALS", "true").lower() == "true"
+    MODAL_DISMISS_SELECTORS = [
+        selector.strip() for selector in os.getenv(
+            "MODAL_DISMISS_SELECTORS",
+            "[role='dialog'] button[aria-label='Close'];"
+            ".modal-overlay button[aria-label='Close'];"
+            ".modal-close-button;"
+            "button[data-a-target='consent-banner-accept'];"
+            "button[data-a-target='player-overlay-mature-accept'];"
+            "button[data-a-target='content-classification-gate-overlay-start-watching-button']"
+        ).split(";") if selector.strip()
+    ]
 
@@ -0,0 +1,40 @@
+"""
+Device profiles for emulation: phones, tablets and desktop.
+"""
+
+IPHONE_USER_AGENT = "Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1"
+ANDROID_USER_AGENT = "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Mobile Safari/537.36"
+IPAD_USER_AGENT = "Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1"
+
+# Desktop profiles have no user agent override; "desktop" takes its size from Config.WINDOW_SIZE
+DEVICE_PROFILES = {
+    "iphone_x": {"width": 375, "height": 812, "pixel_ratio": 3.0, "mobile": True, "touch": True,
+                 "user_agent": IPHONE_USER_AGENT, "platform": "iPhone"},
+    "iphone_se": {"width": 375, "height": 667, "pixel_ratio": 2.0, "mobile": True, "touch": True,
+                  "user_agent": IPHONE_USER_AGENT, "platform": "iPhone"},
+    "pixel_7": {"width": 412, "height": 915, "pixel_ratio": 2.625, "mobile": True, "touch": True,
+                "user_agent": ANDROID_USER_AGENT, "platform": "Linux armv8l"},
+    "ipad_air": {"width": 820, "height": 1180, "pixel_ratio": 2.0, "mobile": True, "touch": True,
+                 "user_agent": IPAD_USER_AGENT, "platform": "iPad"},
+    "laptop": {"width": 1366, "height": 768, "pixel_ratio": 1.0, "mobile": False, "touch": False,
+               "user_agent": None, "platform": None},
+    "desktop": {"width": None, "height": None, "pixel_ratio": 1.0, "mobile": False, "touch": False,
+                "user_agent": None, "platform": None},
+}
+
+
+def get_device(name):
+    """Return a copy of a device profile with its name, raising ValueError for unknown names."""
+    if name not in DEVICE_PROFILES:
+        raise ValueError(f"Unknown device '{name}'; known devices: {', '.join(DEVICE_PROFILES)}")
+    return dict(DEVICE_PROFILES[name], name=name)
+
+
+def parse_devices(value):
+    """Turn "all" or a comma-separated list of device names into a validated list."""
+    if value.strip() == "all":
+        return list(DEVICE_PROFILES)
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    for name in names:
+        get_device(name)
+    return names
@@ -1,6 +1,9 @@
 """
 Base page class for the Twitch UI automation framework.
 """
+import json
+import allure
+from allure_commons.types import AttachmentType
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -8,11 +11,20 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from utils.driver_factory import DriverFactory
 from utils.waits import WaitHelpers
 from utils.screenshot import ScreenshotHelper
+from utils.step_timing import instrument_class, record_branch
+from utils.web_vitals import COLLECT_SCRIPT, check_budget
+from config.config import Config
 
 
 class BasePage:
     """Base page class with common functionality."""
     
+    def __init_subclass__(cls, **kwargs):
+        """Time every public page-object method when STEP_TIMING or step tracing is enabled (no wrapping otherwise)."""
+        super().__init_subclass__(**kwargs)
+        if Config.STEP_TIMING or Config.CHROME_TRACE == "steps":
+            instrument_class(cls)
+    
     def __init__(self, driver_manager):
         self.driver_manager = driver_manager
         self.driver = driver_manager.driver
@@ -27,10 +39,16 @@ class BasePage:
         """Find multiple elements."""
         return self.driver.find_elements(*locator)
     
+    def drain_performance_log(self):
+        """Hand buffered performance log events to the session's listeners (no-op unless HAR/cache/trace is on)."""
+        self.driver_manager.read_performance_log()
+    
     def click_element(self, locator):
         """Click an element."""
         element = self.wait_for_clickable(locator)
         element.click()
+        record_branch(locator)
+        self.drain_performance_log()
     
     def click_element_with_retry(self, locator, max_retries=3):
         """Click an element with retry logic to handle stale element references."""
@@ -41,6 +59,7 @@ class BasePage:
             try:
                 element = self.wait_for_clickable(locator)
                 element.click()
+                self.drain_performance_log()
                 return True
             except StaleElementReferenceException:
                 if attempt < max_retries - 1:
@@ -61,6 +80,8 @@ class BasePage:
         element = self.wait_for_visible(locator)
         element.clear()
         element.send_keys(text)
+        record_branch(locator)
+        self.drain_performance_log()
     
     def get_element_text(self, locator):
         """Get text from an element."""
@@ -85,21 +106,56 @@ class BasePage:
     
     def wait_for_clickable(self, locator, timeout=None):
         """Wait for element to be clickable."""
+        self.drain_performance_log()
         return self.wait_helpers.wait_for_element_clickable(locator, timeout)
     
     def wait_for_visible(self, locator, timeout=None):
         """Wait for element to be visible."""
+        self.drain_performance_log()
         return self.wait_helpers.wait_for_element_visible(locator, timeout)
     
     def wait_for_element(self, locator, timeout=None):
         """Wait for element to be present."""
+        self.drain_performance_log()
         return self.wait_helpers.wait_for_element_present(locator, timeout)
     
     def scroll_to_element(self, locator):
         """Scroll to an element."""
         element = self.wait_for_element(locator)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        self.drain_performance_log()
     
     def take_screenshot(self, filename):
         """Take a screenshot."""
         return self.screenshot_helper.take_screenshot(filename)
+    
+    def _sample_memory(self, series, label=None):
+        """Record a memory sample when SAMPLE_MEMORY is enabled for this session."""
+        sampler = getattr(self.driver_manager, "memory_sampler", None)
+        if sampler is not None:
+            sampler.sample(series, label)
+    
+    def performance_metrics(self):
+        """Collect Navigation/Resource Timing, LCP, CLS and long-task metrics for the current page."""
+        metrics = json.loads(self.driver.execute_async_script(COLLECT_SCRIPT))
+        for key, value in metrics.items():
+            if isinstance(value, float):
+                metrics[key] = round(value, 3)
+        return metrics
+    
+    def performance_budget(self):
+        """Return the configured budget for this page (defaults overridden per page class)."""
+        budgets = Config.PERFORMANCE_BUDGETS
+        return dict(budgets.get("default", {}), **budgets.get(type(self).__name__, {}))
+    
+    def check_performance_budget(self, attach_to_allure=True):
+        """Collect metrics, attach them to Allure and return the list of budget violations."""
+        metrics = self.performance_metrics()
+        violations = check_budget(metrics, self.performance_budget())
+        if attach_to_allure:
+            allure.attach(json.dumps(dict(metrics, violations=violations), indent=2),
+                          name=f"Performance metrics: {type(self).__name__}",
+                          attachment_type=AttachmentType.JSON)
+        for violation in violations:
+            print(f"⚠️ Performance budget: {violation}")
+        return violations
@@ -1,8 +1,77 @@
 """
 Searching and scrolling logic for Twitch search results.
 """
+import json
+import re
+import uuid
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
+from utils.step_timing import record_branch
+
+
+class SearchResultCard:
+    """Lightweight record for a single search-result card."""
+    
+    __slots__ = ("title", "href", "thumbnail_src", "viewer_count")
+    
+    def __init__(self, title=None, href=None, thumbnail_src=None, viewer_count=None):
+        self.title = title
+        self.href = href
+        self.thumbnail_src = thumbnail_src
+        self.viewer_count = viewer_count
+    
+    def __repr__(self):
+        return (f"SearchResultCard(title={self.title!r}, href={self.href!r}, "
+                f"viewer_count={self.viewer_count!r})")
+
+
+class ThumbnailCheck:
+    """Validation result for a single thumbnail image."""
+    
+    __slots__ = ("src", "complete", "natural_width", "natural_height",
+                 "rendered_width", "rendered_height", "pixel_ratio", "loading", "lazy_state")
+    
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+    
+    @property
+    def problem(self):
+        """Return why the thumbnail is not OK, or None."""
+        if not self.src:
+            return "no src"
+        if not self.complete:
+            return "not loaded"
+        if not self.natural_width:
+            return "broken"
+        if self.rendered_width and self.natural_width < self.rendered_width * self.pixel_ratio / 2:
+            return "upscaled"
+        return None
+    
+    @property
+    def ok(self):
+        return self.problem is None
+    
+    def __repr__(self):
+        return (f"ThumbnailCheck(src={self.src!r}, natural={self.natural_width}x{self.natural_height}, "
+                f"rendered={self.rendered_width}x{self.rendered_height}, problem={self.problem!r})")
+
+
+def parse_viewer_count(text):
+    """Convert a viewer label such as '1.2K viewers' into an integer."""
+    if not text:
+        return None
+    match = re.search(r"(\d[\d.,]*)\s*([KkMm]?)", text)
+    if not match:
+        return None
+    try:
+        number = float(match.group(1).rstrip(".,").replace(",", ""))
+    except ValueError:
+        return None
+    multiplier = {"k": 1000, "m": 1000000}.get(match.group(2).lower(), 1)
+    return int(number * multiplier)
 
 
 class SearchResultsPage(BasePage):
@@ -23,6 +92,105 @@ class SearchResultsPage(BasePage):
     STARCRAFT_II_TITLE = (By.XPATH, "//h1[contains(@class, 'CoreText-sc-1txzju1-0') and contains(@class, 'kuIRux')]")
     FOLLOW_BUTTON = (By.CSS_SELECTOR, "[data-a-target='game-directory-follow-button']")
     
+    # Result cards harvested by iter_results (anchors are deduplicated by href)
+    RESULT_CARD_CSS = "[data-a-target='search-result-card'], a[href*='/videos/']"
+    HARVESTED_ATTRIBUTE = "data-harvested"
+    
+    CARD_FIELDS = SearchResultCard.__slots__
+    
+    # Serializes the requested fields of every card in one round trip. Cards are
+    # deduplicated by href; when a marker attribute is given, cards already marked
+    # with the token are skipped and new ones marked, so repeated calls with the
+    # same token only return fresh cards.
+    CARD_DATA_SCRIPT = """
+        var selector = arguments[0], fields = arguments[1], marker = arguments[2], token = arguments[3];
+        var readers = {
+            title: function (card) {
+                var titled = card.querySelector('[title]');
+                return titled ? titled.getAttribute('title') : (card.textContent || '').trim().split('\\n')[0];
+            },
+            href: function (card, link) { return link ? link.href : null; },
+            thumbnail_src: function (card) {
+                var img = card.querySelector('img.tw-image') || card.querySelector('img');
+                return img ? (img.currentSrc || img.src) : null;
+            },
+            viewer_count: function (card) {
+                var viewers = card.querySelector("[data-a-target*='viewer'], [class*='viewer']");
+                return viewers ? viewers.textContent : null;
+            }
+        };
+        var cards = document.querySelectorAll(selector);
+        var seen = new Set();
+        var rows = [];
+        for (var i = 0; i < cards.length; i++) {
+            var card = cards[i];
+            if (marker) {
+                if (card.getAttribute(marker) === token) { continue; }
+                card.setAttribute(marker, token);
+            }
+            var link = card.matches('a[href]') ? card : (card.querySelector('a[href]') || card.closest('a[href]'));
+            var key = link ? link.href : null;
+            if (key !== null) {
+                if (seen.has(key)) { continue; }
+                seen.add(key);
+            }
+            rows.push(fields.map(function (field) { return readers[field](card, link); }));
+        }
+        return JSON.stringify(rows);
+    """
+    
+    THUMBNAIL_CSS = "img.tw-image"
+    SCRIPT_TIMEOUT_MARGIN = 5  # seconds left for reading the rows back before the script timeout
+    
+    # Async script validating every thumbnail in one round trip. Optionally scrolls
+    # lazy images that have not loaded yet into view in batches and waits for them
+    # to decode, within a total budget, then restores the scroll position. Returns
+    # one row per image with the ThumbnailCheck fields, in order, and the number of
+    # lazy images the budget left unforced.
+    THUMBNAIL_CHECK_SCRIPT = """
+        var selector = arguments[0], forceLazy = arguments[1], batchSize = arguments[2], batchTimeoutMs = arguments[3];
+        var deadline = performance.now() + arguments[4], unforced = 0;
+        var done = arguments[arguments.length - 1];
+        var images = Array.prototype.slice.call(document.querySelectorAll(selector));
+        var scrollX = window.scrollX, scrollY = window.scrollY;
+        function loaded(img) { return img.complete && img.naturalWidth > 0; }
+        function settle(img) {
+            if (img.complete) { return Promise.resolve(); }
+            return new Promise(function (resolve) {
+                img.addEventListener('load', resolve, { once: true });
+                img.addEventListener('error', resolve, { once: true });
+            });
+        }
+        function timeout(ms) { return new Promise(function (resolve) { setTimeout(resolve, ms); }); }
+        function forceBatches(pending) {
+            var chain = Promise.resolve();
+            for (var start = 0; start < pending.length; start += batchSize) {
+                (function (batch) {
+                    chain = chain.then(function () {
+                        var remaining = deadline - performance.now();
+                        if (remaining <= 0) { unforced += batch.length; return; }
+                        batch[batch.length - 1].scrollIntoView({ block: 'end' });
+                        batch.forEach(function (img) { if (img.loading === 'lazy') { img.loading = 'eager'; } });
+                        return Promise.race([Promise.all(batch.map(settle)), timeout(Math.min(batchTimeoutMs, remaining))]);
+                    });
+                })(pending.slice(start, start + batchSize));
+            }
+            return chain;
+        }
+        var pending = forceLazy ? images.filter(function (img) { return !loaded(img); }) : [];
+        forceBatches(pending).then(function () {
+            window.scrollTo(scrollX, scrollY);
+            var ratio = window.devicePixelRatio || 1;
+            done(JSON.stringify({unforced: unforced, rows: images.map(function (img) {
+                var rect = img.getBoundingClientRect();
+                var src = img.currentSrc || img.src || img.getAttribute('data-src') || null;
+                var lazyState = loaded(img) ? 'loaded' : (img.getAttribute('src') ? 'loading' : 'pending');
+                return [src, img.complete, img.naturalWidth, img.naturalHeight,
+                        Math.round(rect.width), Math.round(rect.height), ratio, img.loading || 'auto', lazyState];
+            })}));
+        });
+    """
+    
     # StarCraft II category link selectors (ordered by preference)
     STARCRAFT_SELECTORS = [
         "//*[@id='page-main-content-wrapper']/div[3]/div/div/div[3]/div/article/button",  # Special button selector that works well
@@ -46,6 +214,77 @@ class SearchResultsPage(BasePage):
         # Fallback to general search results
         return self.find_elements(self.STREAMER_CARDS)
     
+    def iter_results(self, max_results=None, max_idle_scrolls=3, batch_timeout=5):
+        """Yield SearchResultCard records while scrolling through the results.
+        
+        Only cards added to the DOM since the previous batch are read, and no
+        WebElement references are kept, so memory stays flat on long harvests.
+        Stops after max_results cards or max_idle_scrolls scrolls with no new cards.
+        Cards are marked with a per-call token, so a later call starts over.
+        """
+        token = uuid.uuid4().hex
+        # Hashes keep the seen-set compact; a 64-bit collision is negligible here
+        seen = set()
+        yielded = 0
+        idle_scrolls = 0
+        batch = self._fetch_new_cards(token)
+        
+        while True:
+            new_cards = 0
+            for card in batch:
+                key = hash(card.href)
+                if card.href is None or key in seen:
+                    continue
+                seen.add(key)
+                new_cards += 1
+                yielded += 1
+                yield card
+                if max_results is not None and yielded >= max_results:
+                    return
+            
+            idle_scrolls = 0 if new_cards else idle_scrolls + 1
+            if idle_scrolls >= max_idle_scrolls:
+                return
+            self.driver.execute_script("window.scrollBy(0, window.innerHeight);")
+            self._sample_memory("search_scroll", f"{len(seen)} cards")
+            self.drain_performance_log()
+            batch = self._fetch_new_cards(token, timeout=batch_timeout)
+    
+    def extract_results(self, fields=None):
+        """Read every result card on the page in a single script call.
+        
+        fields projects the SearchResultCard attributes to fetch (default: all);
+        attributes left out of the projection are None on the returned records.
+        """
+        return self._extract_cards(fields)
+    
+    def _extract_cards(self, fields=None, marker=None, token=None):
+        """Run the card data script and parse its JSON payload into records."""
+        fields = list(fields or self.CARD_FIELDS)
+        unknown = set(fields) - set(self.CARD_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown result card fields: {', '.join(sorted(unknown))}")
+        
+        payload = self.driver.execute_script(self.CARD_DATA_SCRIPT, self.RESULT_CARD_CSS, fields, marker, token)
+        cards = []
+        for row in json.loads(payload):
+            values = dict(zip(fields, row))
+            if "viewer_count" in values:
+                values["viewer_count"] = parse_viewer_count(values["viewer_count"])
+            cards.append(SearchResultCard(**values))
+        return cards
+    
+    def _fetch_new_cards(self, token, timeout=0):
+        """Return records for cards not harvested with this token yet, polling up to timeout seconds."""
+        fetch = lambda driver: self._extract_cards(marker=self.HARVESTED_ATTRIBUTE, token=token)
+        batch = fetch(self.driver)
+        if batch or not timeout:
+            return batch
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(fetch)
+        except TimeoutException:
+            return []
+    
     def wait_for_search_results(self):
         """Wait for search results to load."""
         self.wait_for_visible(self.SEARCH_RESULTS)
@@ -55,6 +294,8 @@ class SearchResultsPage(BasePage):
         for i in range(times):
             self.driver.execute_script("window.scrollBy(0, 500);")
             print(f"Scrolled down {i+1}/{times} times")
+            self._sample_memory("search_scroll", f"scroll {i+1}")
+            self.drain_performance_log()
     
     def get_scroll_position(self):
         """Get current scroll position."""
@@ -75,6 +316,35 @@ class SearchResultsPage(BasePage):
         except:
             return None
     
+    def validate_thumbnails(self, force_lazy=True, batch_size=20, batch_timeout_ms=2000, selector=None):
+        """Validate every thumbnail on the page in one script call.
+        
+        Checks load completion, decoded (natural) size against rendered size and
+        lazy-load state; with force_lazy, images that have not loaded are scrolled
+        into view batch by batch first. Forcing stops a few seconds before the
+        session's script timeout, so long pages report their remaining lazy images
+        as not loaded instead of failing. Returns a list of ThumbnailCheck records.
+        """
+        try:
+            script_timeout_s = self.driver.timeouts.script
+        except Exception:
+            script_timeout_s = self.driver_manager.config.VIDEO_LOAD_TIMEOUT + 10
+        budget_ms = max(0, (script_timeout_s - self.SCRIPT_TIMEOUT_MARGIN) * 1000)
+        result = json.loads(self.driver.execute_async_script(
+            self.THUMBNAIL_CHECK_SCRIPT, selector or self.THUMBNAIL_CSS, force_lazy, batch_size, batch_timeout_ms, budget_ms
+        ))
+        checks = [ThumbnailCheck(*row) for row in result["rows"]]
+        if result["unforced"]:
+            print(f"⚠️ Thumbnail budget ({budget_ms / 1000:.0f}s) ran out; {result['unforced']} lazy images were not forced")
+        
+        problems = {}
+        for check in checks:
+            if check.problem:
+                problems[check.problem] = problems.get(check.problem, 0) + 1
+        summary = ", ".join(f"{count} {problem}" for problem, count in problems.items()) or "all OK"
+        print(f"🖼️ Validated {len(checks)} thumbnails: {summary}")
+        return checks
+    
     def get_streamer_thumbnail_class(self):
         """Get the class attribute of streamer thumbnail."""
         try:
@@ -99,6 +369,7 @@ class SearchResultsPage(BasePage):
                 try:
                     if self.is_element_present(selector):
                         element = self.find_element(selector)
+                        record_branch(selector)
                         if element.tag_name == "p":
                             # Find the parent link element
                             parent_link = element.find_element(By.XPATH, "./ancestor::a")
@@ -185,6 +456,7 @@ class SearchResultsPage(BasePage):
                 try:
                     starcraft_result = wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
                     starcraft_result.click()
+                    record_branch(selector)
                     print(f"✅ Clicked on StarCraft II category link using selector: {selector}")
                     return True
                 except Exception as e:
@@ -193,7 +465,7 @@ class SearchResultsPage(BasePage):
             
             print("⚠️ All StarCraft II category selectors failed")
             return False
-            
+        
         except Exception as e:
             print(f"⚠️ Could not click on StarCraft II category link: {e}")
             return False
@@ -1,8 +1,10 @@
 """
 Streamer page interactions - wait for page load and take screenshots.
 """
+import json
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from utils.video_readiness import STATE_SCRIPT
 
 
 class StreamerPage(BasePage):
@@ -32,6 +34,7 @@ class StreamerPage(BasePage):
     
     def wait_for_page_load(self):
         """Wait for the streamer page to fully load."""
+        self.drain_performance_log()
         # Wait for either video player or streamer info to be visible
         try:
             self.wait_for_visible(self.VIDEO_PLAYER, timeout=30)
@@ -47,13 +50,26 @@ class StreamerPage(BasePage):
         self.driver_manager.handle_modal_popup()
     
     def is_video_playing(self):
-        """Check if video is playing."""
+        """Check if video is playing (has data, is not paused and has advanced)."""
+        state = self.get_video_state()
+        if state is not None:
+            return bool(state["has_video"] and state["ready_state"] >= 3
+                        and not state["paused"] and state["current_time"] > 0)
         try:
             video = self.find_element(self.VIDEO_PLAYER)
             return video.is_displayed()
         except:
             return False
     
+    def get_video_state(self):
+        """Get playback state plus time-to-first-frame and rebuffer metrics of the main video."""
+        try:
+            state = json.loads(self.driver.execute_script(STATE_SCRIPT))
+            return {key: round(value, 1) if isinstance(value, float) else value for key, value in state.items()}
+        except Exception as e:
+            print(f"⚠️ Could not read video state: {e}")
+            return None
+    
     def get_streamer_name(self):
         """Get the streamer's name."""
         try:
@@ -84,7 +100,17 @@ class StreamerPage(BasePage):
     
     def wait_for_video_content(self):
         """Wait for video content to load."""
-        self.driver_manager.wait_for_video_load()
+        self._sample_memory("video_playback", "before video load")
+        metrics = self.driver_manager.wait_for_video_load()
+        self._sample_memory("video_playback", "video loaded")
+        return bool(metrics and metrics["ready"])
+    
+    def sample_playback_memory(self, duration=60, interval=5):
+        """Sample memory at a fixed interval while the stream plays (soak runs)."""
+        import time
+        for tick in range(max(1, int(duration / interval))):
+            time.sleep(interval)
+            self._sample_memory("video_playback", f"playing {(tick + 1) * interval}s")
     
     def is_page_loaded(self):
         """Check if the page has loaded properly."""
@@ -137,12 +163,14 @@ class StreamerPage(BasePage):
         
         # Wait for page to settle
         time.sleep(3)
+        self._sample_memory("video_playback", "settled")
         
         # Handle any modal popups
         self.handle_modal_popup()
         
         # Additional wait for page to settle
         time.sleep(3)
+        self._sample_memory("video_playback", "modal handled")
         
         print("✅ Page settled after loading")
 
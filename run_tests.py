@@ -17,7 +17,123 @@ def create_directories():
         print(f"Created directory: {directory}")
 
 
-def run_tests(test_type="all", verbose=False, headless=False):
+def workers_arg(value):
+    """Validate the --workers value: a positive number or "auto"."""
+    if value == "auto":
+        return value
+    try:
+        return max(1, int(value))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a number or 'auto', got: {value}")
+
+
+def resolve_workers(workers):
+    """Resolve the --workers value to a worker count."""
+    from utils.duration_scheduler import auto_worker_count
+    from utils.resource_governor import ResourceGovernor
+    
+    if workers == "auto":
+        count = auto_worker_count()
+        metrics = ResourceGovernor().metrics()
+        print(f"🧮 Auto workers: {count} ({metrics['free_mb']} MB free, "
+              f"load {metrics['load_per_cpu']} per CPU, ~{metrics['session_memory_mb']} MB per browser)")
+        return count
+    return workers or 1
+
+
+def print_schedule_forecast(workers):
+    """Print the predicted LPT makespan for the known tests against the ideal."""
+    from utils.duration_scheduler import load_durations, lpt_schedule, ideal_makespan
+    
+    history = load_durations()
+    if not history:
+        print("ℹ️ No test duration history yet; scheduling falls back to collection order")
+        return
+    _, loads = lpt_schedule(history, workers)
+    ideal = ideal_makespan(list(history.values()), workers)
+    print(f"⏱️ Predicted makespan: {max(loads):.1f}s (ideal {ideal:.1f}s) across {workers} workers")
+
+
+def warm_disk_cache(shards=1, headless=False):
+    """
+    Load the key pages once so every disk cache shard starts warm.
+    
+    Args:
+        shards (int): Number of shards to fill (one per parallel worker)
+        headless (bool): Run the warm-up browser in headless mode
+    """
+    # Picked up by the pytest workers, which import Config afresh
+    os.environ["DISK_CACHE"] = "true"
+    
+    from config.config import Config
+    from utils.driver_factory import DriverFactory
+    from utils.disk_cache import DiskCache
+    
+    # Config may already have been imported in this process (e.g. by resolve_workers),
+    # so its class attributes predate the environment; set this session's explicitly
+    factory = DriverFactory()
+    factory.config.DISK_CACHE = True
+    factory.config.HEADLESS = factory.config.HEADLESS or headless
+    try:
+        factory.setup_driver()
+        shard_name = os.path.basename(factory.cache_shard).split("-")[-1]
+        shard_index = int(shard_name) if shard_name.isdigit() else 0
+        for page in Config.WARM_CACHE_PAGES:
+            factory.driver.get(f"{Config.TWITCH_URL}{page}")
+            factory.wait_for_page_load()
+            print(f"🔥 Warmed cache with {Config.TWITCH_URL}{page}")
+    finally:
+        factory.quit_driver()
+    
+    seeded = DiskCache(Config.DISK_CACHE_DIR, Config.DISK_CACHE_MB).seed_shards(shards, source_index=shard_index)
+    print(f"✅ Disk cache warm: shard {shard_index} filled, {seeded} more shard(s) seeded")
+
+
+def start_broker(max_browsers):
+    """
+    Start the browser broker daemon and point the test workers at it.
+    
+    Args:
+        max_browsers (int): Browsers the broker may run at once
+    
+    Returns:
+        subprocess.Popen: The broker process
+    """
+    from config.config import Config
+    from utils.browser_broker import wait_for_broker
+    
+    # Per-run socket, so concurrent runs each get their own broker
+    base, extension = os.path.splitext(Config.BROKER_SOCKET)
+    socket_path = f"{base}-{os.getpid()}{extension}"
+    broker = subprocess.Popen([sys.executable, "-m", "utils.browser_broker",
+                               "--socket", socket_path, "--max-browsers", str(max_browsers)])
+    try:
+        wait_for_broker(socket_path)
+    except TimeoutError:
+        broker.terminate()
+        raise
+    os.environ["BROWSER_BROKER"] = socket_path
+    return broker
+
+
+def stop_broker(broker):
+    """Print the broker's final stats and shut it down."""
+    from utils.browser_broker import BrokerClient
+    
+    try:
+        client = BrokerClient(os.environ["BROWSER_BROKER"])
+        stats = client.stats()
+        client.close()
+        print(f"🤝 Broker: {stats['leases']} leases over {stats['launched']} browsers "
+              f"(avg wait {stats['avg_acquire_wait_ms']}ms, {stats['recycled']} recycled)")
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️ Could not read broker stats: {e}")
+    broker.terminate()
+    broker.wait(timeout=60)
+
+
+def run_tests(test_type="all", verbose=False, headless=False, workers=None,
+              changed_since=None, record_deps=False, warm_cache=False, broker=False, devices=None):
     """
     Run tests based on the specified type.
     
@@ -25,8 +141,20 @@ def run_tests(test_type="all", verbose=False, headless=False):
         test_type (str): Type of tests to run (all, smoke)
         verbose (bool): Run tests in verbose mode
         headless (bool): Run tests in headless mode
+        workers (str): Number of parallel workers, or "auto" to size by CPU and free RAM
+        changed_since (str): Only run tests affected by changes since this git ref
+        record_deps (bool): Record per-test dependencies for later --changed-since runs
+        warm_cache (bool): Fill the shared disk cache with the key pages before the tests
+        broker (bool): Lease warm browsers from a broker daemon instead of launching one per test
+        devices (str): Run every test once per device profile (comma-separated names or "all")
     """
     create_directories()
+    if devices and workers is None:
+        # One worker per device (as far as the machine allows) keeps the matrix close to one run's time
+        from config.devices import parse_devices
+        
+        workers = min(len(parse_devices(devices)), resolve_workers("auto"))
+    worker_count = resolve_workers(workers)
     
     # Base pytest command
     cmd = ["python3", "-m", "pytest"]
@@ -38,6 +166,10 @@ def run_tests(test_type="all", verbose=False, headless=False):
         # Run all tests without marker filtering
         pass
     
+    # Device matrix, parametrized by conftest
+    if devices:
+        cmd.extend(["--devices", devices])
+    
     # Add verbosity
     if verbose:
         cmd.append("-v")
@@ -46,14 +178,41 @@ def run_tests(test_type="all", verbose=False, headless=False):
     if headless:
         os.environ["HEADLESS"] = "true"
     
-    # Add test path
-    cmd.append("tests/")
+    # Add parallel execution; conftest assigns LPT groups for loadgroup distribution
+    if worker_count > 1:
+        cmd.extend(["-n", str(worker_count), "--dist", "loadgroup"])
+        print_schedule_forecast(worker_count)
+    
+    # Shared disk cache, warmed up front so the first test of every worker hits it
+    if warm_cache:
+        warm_disk_cache(shards=worker_count, headless=headless)
+    
+    # Record the framework functions each test calls
+    if record_deps:
+        os.environ["RECORD_TEST_DEPS"] = "true"
+    
+    # Add test path, narrowed to the tests affected by changes when requested
+    test_paths = ["tests/"]
+    if changed_since:
+        from utils.change_selection import select_tests
+        
+        selected = select_tests(changed_since)
+        if selected is not None:
+            if not selected:
+                print(f"✅ No tests affected by changes since {changed_since}")
+                return 0
+            test_paths = selected
+            print(f"🎯 Running {len(selected)} test selection(s) affected by changes since {changed_since}")
+    cmd.extend(test_paths)
     
     print(f"Running command: {' '.join(cmd)}")
     print(f"Test type: {test_type}")
     print(f"Headless mode: {headless}")
+    print(f"Workers: {worker_count}")
     print("-" * 50)
     
+    # One broker for all workers; started after HEADLESS and DISK_CACHE are set
+    broker_process = start_broker(worker_count) if broker else None
     try:
         result = subprocess.run(cmd, check=True)
         print("\n" + "=" * 50)
@@ -64,6 +223,85 @@ def run_tests(test_type="all", verbose=False, headless=False):
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Tests failed with exit code: {e.returncode}")
         return e.returncode
+    finally:
+        if broker_process is not None:
+            stop_broker(broker_process)
+
+
+def run_benchmarks(compare=None, threshold=10, verbose=False):
+    """
+    Run the framework micro-benchmarks headless against the local stand-in site.
+    
+    Args:
+        compare (str): Saved run to compare against ("" for the latest), or None to skip
+        threshold (float): Mean-time regression, in percent, that fails the comparison
+        verbose (bool): Run benchmarks in verbose mode
+    """
+    create_directories()
+    
+    # benchmarks/pytest.ini collects bench_*.py; results are saved under .benchmarks/
+    cmd = ["python3", "-m", "pytest", "benchmarks/", "--benchmark-autosave",
+           "--benchmark-json=reports/benchmarks.json"]
+    if compare is not None:
+        cmd.append(f"--benchmark-compare={compare}" if compare else "--benchmark-compare")
+        cmd.append(f"--benchmark-compare-fail=mean:{threshold}%")
+    if verbose:
+        cmd.append("-v")
+    
+    print(f"Running command: {' '.join(cmd)}")
+    print("-" * 50)
+    result = subprocess.run(cmd)
+    if result.returncode == 0:
+        print("✅ Benchmarks completed; results saved under .benchmarks/")
+    else:
+        print(f"❌ Benchmarks failed or regressed beyond {threshold}% (exit code {result.returncode})")
+    return result.returncode
+
+
+def run_search_terms(source, pool_size=None, report_path=None, headless=False):
+    """
+    Run the multi-term search mode instead of the pytest suite.
+    
+    Args:
+        source (str): Comma-separated search terms or a file with one term per line
+        pool_size (int): Number of concurrent browser sessions
+        report_path (str): JSONL report path
+        headless (bool): Run browsers in headless mode
+    """
+    create_directories()
+    if headless:
+        os.environ["HEADLESS"] = "true"
+    
+    # Imported here so HEADLESS is picked up by Config
+    from utils.search_pool import SearchPool
+    
+    summary = SearchPool(pool_size=pool_size, report_path=report_path).run(source)
+    return 1 if summary["failures"] else 0
+
+
+def run_crawl(source, pool_size=None, report_path=None, headless=False):
+    """
+    Snapshot many pages concurrently from one process with the asyncio browser pool.
+    
+    Args:
+        source (str): Whitespace-separated URLs/paths or a file with one per line
+        pool_size (int): Maximum number of concurrent browser sessions
+        report_path (str): JSONL report path
+        headless (bool): Run browsers in headless mode
+    """
+    create_directories()
+    if headless:
+        os.environ["HEADLESS"] = "true"
+    
+    # Imported here so HEADLESS is picked up by Config
+    from utils.async_browser import crawl, load_urls
+    
+    urls = load_urls(source)
+    if not urls:
+        print("❌ No pages given to crawl")
+        return 1
+    summary = crawl(urls, max_sessions=pool_size, report_path=report_path)
+    return 1 if summary["failures"] else 0
 
 
 def main():
@@ -86,15 +324,117 @@ def main():
         help="Run tests in headless mode"
     )
     
+    parser.add_argument(
+        "--workers", "-n",
+        type=workers_arg,
+        metavar="N|auto",
+        help="Run tests in parallel with pytest-xdist, longest tests first (auto: size by CPU and free RAM)"
+    )
+    parser.add_argument(
+        "--devices",
+        metavar="NAMES|all",
+        help="Run every test once per device profile from config/devices.py, in parallel (e.g. iphone_x,pixel_7,desktop)"
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="GIT_REF",
+        help="Only run tests that exercise pages/, utils/ or config/ files changed since GIT_REF"
+    )
+    parser.add_argument(
+        "--record-deps",
+        action="store_true",
+        help="Record which page-object methods each test calls (used by --changed-since)"
+    )
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="Use the shared HTTP disk cache and load the key pages into it before the tests"
+    )
+    parser.add_argument(
+        "--broker",
+        action="store_true",
+        help="Share a warm pool of browsers between workers through a local broker daemon"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Run the framework micro-benchmarks against the local stand-in site"
+    )
+    parser.add_argument(
+        "--benchmark-compare",
+        nargs="?",
+        const="",
+        metavar="RUN_ID",
+        help="With --benchmark, compare against a saved run (default: the latest) and flag regressions"
+    )
+    parser.add_argument(
+        "--benchmark-threshold",
+        type=float,
+        default=10,
+        help="Mean-time regression in percent that fails --benchmark-compare (default: 10)"
+    )
+    parser.add_argument(
+        "--search-terms",
+        metavar="TERMS_OR_FILE",
+        help="Run the multi-term search mode for a comma-separated list or a file of terms"
+    )
+    parser.add_argument(
+        "--crawl",
+        metavar="URLS_OR_FILE",
+        help="Snapshot a space-separated list or a file of URLs/paths concurrently with the asyncio browser pool"
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        help="Concurrent browser sessions for --search-terms and --crawl (default: CPU count)"
+    )
+    parser.add_argument(
+        "--search-report",
+        help="JSONL report path for --search-terms (default: reports/search_terms.jsonl)"
+    )
+    parser.add_argument(
+        "--crawl-report",
+        help="JSONL report path for --crawl (default: reports/crawl.jsonl)"
+    )
+    
     args = parser.parse_args()
     
     print("🎮 Twitch UI Automation Test Runner")
     print("=" * 50)
     
+    if args.benchmark or args.benchmark_compare is not None:
+        sys.exit(run_benchmarks(
+            compare=args.benchmark_compare,
+            threshold=args.benchmark_threshold,
+            verbose=args.verbose
+        ))
+    
+    if args.search_terms:
+        sys.exit(run_search_terms(
+            args.search_terms,
+            pool_size=args.pool_size,
+            report_path=args.search_report,
+            headless=args.headless
+        ))
+    
+    if args.crawl:
+        sys.exit(run_crawl(
+            args.crawl,
+            pool_size=args.pool_size,
+            report_path=args.crawl_report,
+            headless=args.headless
+        ))
+    
     exit_code = run_tests(
         test_type=args.type,
         verbose=args.verbose,
-        headless=args.headless
+        headless=args.headless,
+        workers=args.workers,
+        changed_since=args.changed_since,
+        record_deps=args.record_deps,
+        warm_cache=args.warm_cache,
+        broker=args.broker,
+        devices=args.devices
     )
     
     sys.exit(exit_code)
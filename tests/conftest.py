@@ -3,19 +3,141 @@ Pytest configuration and fixtures for the Twitch UI automation framework.
 """
 import pytest
 import os
+import re
+import allure
+from allure_commons.types import AttachmentType
 from utils.driver_factory import DriverFactory
+from utils.command_tracer import CommandTracer
+from utils.har_writer import HarWriter
+from utils.sleep_accounting import SleepAccountingPlugin
+from utils.warm_state import ensure_warm_state
+from utils.static_driver import StaticDriverFactory
+from config.config import Config
+from config.devices import parse_devices
+from utils.change_selection import DependencyRecorder
+from utils.duration_scheduler import (
+    load_durations, save_durations, expected_duration, lpt_schedule, ideal_makespan
+)
 from pages.homepage import Homepage
 from pages.search_results_page import SearchResultsPage
 from pages.streamer_page import StreamerPage
 
 
+# Per-test durations and worker ids observed in this run (nodeid -> value)
+_run_durations = {}
+_run_workers = {}
+_completed_tests = set()
+
+# HTTP cache response sources summed over this process's sessions (DISK_CACHE=true)
+_cache_sources = {}
+
+# Records per-test calls into pages/, utils/ and config/ for --changed-since selection
+_dependency_recorder = DependencyRecorder() if Config.RECORD_TEST_DEPS else None
+
+
+def _capture_warm_state():
+    """Capture the warm state in a throwaway session."""
+    factory = DriverFactory()
+    try:
+        factory.setup_driver()
+        return factory.capture_warm_state()
+    except Exception as e:
+        print(f"⚠️ Could not capture warm state, sessions will start cold: {e}")
+        return None
+    finally:
+        factory.quit_driver()
+
+
+@pytest.fixture(scope="session")
+def warm_state():
+    """Capture the warm Twitch state once per run (WARM_STATE=true)."""
+    if not Config.WARM_STATE:
+        return None
+    return ensure_warm_state(Config.WARM_STATE_FILE, Config.WARM_STATE_MAX_AGE_HOURS * 3600, _capture_warm_state)
+
+
+def pytest_addoption(parser):
+    """Add the device matrix option."""
+    parser.addoption(
+        "--devices", default=Config.DEVICES,
+        help="Run every browser test once per device profile (comma-separated names from config/devices.py, or 'all')"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize browser tests over the --devices matrix."""
+    devices = metafunc.config.getoption("devices")
+    if devices and "device" in metafunc.fixturenames:
+        metafunc.parametrize("device", parse_devices(devices), indirect=True)
+
+
 @pytest.fixture(scope="function")
-def driver_manager():
-    """Create and manage WebDriver instance."""
+def device(request):
+    """Device profile name for this test (None: Config.DEVICE)."""
+    return getattr(request, "param", None)
+
+
+@pytest.fixture(scope="function")
+def driver_manager(request, device):
+    """Create and manage WebDriver instance (a browserless StaticDriver for http_tier tests)."""
+    if request.node.get_closest_marker("http_tier"):
+        driver_manager = StaticDriverFactory()
+        driver_manager.setup_driver(device=device)
+        try:
+            yield driver_manager
+        finally:
+            driver_manager.quit_driver()
+        return
+    
+    # Requested here so http_tier runs never start a browser to capture it
+    request.getfixturevalue("warm_state")
     driver_manager = DriverFactory()
-    driver_manager.setup_driver()
-    yield driver_manager
-    driver_manager.quit_driver()
+    driver_manager.setup_driver(device=device)
+    
+    # Report errors must not leak the browser or its disk-cache shard, so quit_driver always runs
+    try:
+        # Opt-in WebDriver command tracing (TRACE_COMMANDS=true)
+        tracer = CommandTracer(driver_manager.driver).start(request.node.name) if Config.TRACE_COMMANDS else None
+        
+        # Opt-in HAR export (CAPTURE_HAR=true)
+        har = None
+        if Config.CAPTURE_HAR:
+            # The node id keeps same-named tests in different modules or classes apart
+            filename = re.sub(r"[^\w.-]+", "_", request.node.nodeid) + ".har"
+            har = driver_manager.add_performance_log_listener(HarWriter(os.path.join(Config.HAR_DIR, filename)))
+        
+        # CHROME_TRACE=test keeps a Chrome trace of the whole test
+        if Config.CHROME_TRACE == "test":
+            with driver_manager.chrome_tracer.trace(request.node.name, budget_ms=0):
+                yield driver_manager
+        else:
+            yield driver_manager
+        if tracer is not None:
+            tracer.stop()
+            tracer.write_report(Config.COMMAND_TRACE_DIR)
+        if har is not None:
+            driver_manager.read_performance_log()
+            _finish_har(har, request.node)
+        if driver_manager.memory_sampler is not None:
+            driver_manager.memory_sampler.write_report(request.node.name, Config.MEMORY_REPORT_DIR)
+    finally:
+        driver_manager.quit_driver()
+        if driver_manager.cache_stats is not None:
+            for source, count in driver_manager.cache_stats.sources.items():
+                _cache_sources[source] = _cache_sources.get(source, 0) + count
+
+
+def _finish_har(har, node):
+    """Close a test's HAR file and attach it to Allure on failure (or always, if configured)."""
+    path = har.close()
+    print(f"🌐 HAR saved: {path} ({har.entry_count} requests)")
+    report = getattr(node, "rep_call", None)
+    failed = report is None or report.failed
+    if Config.ATTACH_HAR == "always" or (Config.ATTACH_HAR == "failure" and failed):
+        try:
+            allure.attach.file(path, name="Network (HAR)", attachment_type=AttachmentType.JSON, extension="har")
+        except Exception as e:
+            print(f"⚠️ Failed to attach HAR to Allure: {e}")
 
 
 @pytest.fixture(scope="function")
@@ -65,3 +187,112 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "regression: mark test as regression test"
     )
+    config.addinivalue_line(
+        "markers", "http_tier: run against the served HTML with a pooled HTTP client instead of a browser"
+    )
+    
+    # Opt-in sleep-vs-work accounting (SLEEP_REPORT=true)
+    if Config.SLEEP_REPORT and not config.pluginmanager.has_plugin("sleep_accounting"):
+        config.pluginmanager.register(SleepAccountingPlugin(Config.SLEEP_REPORT_FILE), "sleep_accounting")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keep each phase's report on the item so fixtures can see the test outcome."""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+def _xdist_workers(config):
+    """Return the xdist worker count when running with --dist loadgroup, else 0."""
+    workers = config.getoption("numprocesses", default=None)
+    if not isinstance(workers, int) or config.getoption("dist", default="no") != "loadgroup":
+        return 0
+    return workers
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Schedule tests longest-processing-time-first across xdist workers.
+    
+    Each test is assigned to an xdist_group (one group per worker) from the
+    persisted duration history, and tests are ordered slowest first within
+    their group so the longest test starts immediately.
+    """
+    workers = _xdist_workers(config)
+    if workers < 2:
+        return
+    
+    history = load_durations()
+    durations = {item.nodeid: expected_duration(item.nodeid, history) for item in items}
+    bins, _ = lpt_schedule(durations, workers)
+    group_of = {nodeid: index for index, nodeids in enumerate(bins) for nodeid in nodeids}
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(name=f"lpt{group_of[item.nodeid]}"))
+    items.sort(key=lambda item: -durations[item.nodeid])
+
+
+def pytest_runtest_logreport(report):
+    """Accumulate setup, call and teardown time per test."""
+    nodeid = report.nodeid.split("@lpt")[0]
+    _run_durations[nodeid] = _run_durations.get(nodeid, 0.0) + report.duration
+    if report.when == "call":
+        _completed_tests.add(nodeid)
+    gateway = getattr(getattr(report, "node", None), "gateway", None)
+    if gateway is not None:
+        _run_workers[nodeid] = gateway.id
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Record the framework functions each test calls, fixtures included."""
+    if _dependency_recorder is None:
+        yield
+        return
+    _dependency_recorder.start()
+    try:
+        yield
+    finally:
+        _dependency_recorder.stop(item.nodeid.split("@lpt")[0])
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Persist this run's durations and recorded dependencies."""
+    if _dependency_recorder is not None:
+        _dependency_recorder.save()
+    if hasattr(session.config, "workerinput"):
+        return
+    # Tests that errored during setup never ran their body and would skew the history
+    completed = {nodeid: _run_durations[nodeid] for nodeid in _completed_tests}
+    if completed:
+        save_durations(completed)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report the HTTP cache hit rate and, for parallel runs, the makespan against the ideal."""
+    total = sum(_cache_sources.values())
+    if total:
+        terminalreporter.section("HTTP cache")
+        hits = total - _cache_sources.get("network", 0)
+        terminalreporter.write_line(f"Hit rate: {hits / total * 100:.0f}% ({hits}/{total} responses) {_cache_sources}")
+    
+    workers = _xdist_workers(config)
+    if workers < 2 or not _run_durations:
+        return
+    
+    loads = {}
+    for nodeid, seconds in _run_durations.items():
+        worker = _run_workers.get(nodeid, "?")
+        loads[worker] = loads.get(worker, 0.0) + seconds
+    makespan = max(loads.values())
+    ideal = ideal_makespan(list(_run_durations.values()), workers)
+    
+    terminalreporter.section("LPT schedule")
+    for worker, load in sorted(loads.items()):
+        terminalreporter.write_line(f"{worker}: {load:.1f}s")
+    terminalreporter.write_line(
+        f"Makespan: {makespan:.1f}s, ideal: {ideal:.1f}s ({makespan / ideal * 100:.0f}% of ideal)"
+        if ideal else f"Makespan: {makespan:.1f}s"
+    )
+
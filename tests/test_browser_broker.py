@@ -0,0 +1,72 @@
+"""
+Unit tests for the browser broker's client side and socket handling (no browser needed).
+"""
+import os
+import socket
+import tempfile
+import pytest
+from utils.browser_broker import AttachedDriver, BrowserBroker, broker_listening
+
+
+class FakeExecutor:
+    """Records WebDriver commands and answers getLog with canned entries."""
+    
+    def __init__(self, entries):
+        self.entries = entries
+        self.commands = []
+    
+    def execute(self, command, params):
+        self.commands.append((command, params))
+        if command == "getLog":
+            return {"value": self.entries}
+        return {"value": None}
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are length-limited, so keep them short rather than under tmp_path
+    directory = tempfile.mkdtemp(prefix="broker-")
+    yield os.path.join(directory, "broker.sock")
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+class TestAttachedDriver:
+    """AttachedDriver drives a session the broker created."""
+    
+    def test_get_log(self):
+        entries = [{"level": "INFO", "message": "{}", "timestamp": 1}]
+        executor = FakeExecutor(entries)
+        driver = AttachedDriver(executor, "session-1", {"browserName": "chrome"})
+        
+        assert driver.session_id == "session-1"
+        assert driver.get_log("performance") == entries
+        assert executor.commands[-1] == ("getLog", {"type": "performance", "sessionId": "session-1"})
+
+
+class TestBrokerSocket:
+    """BrowserBroker.start only replaces sockets no broker is answering on."""
+    
+    def test_refuses_a_live_socket(self, socket_path):
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen(1)
+        try:
+            with pytest.raises(RuntimeError, match="already listening"):
+                BrowserBroker(socket_path, max_browsers=1, warm_browsers=0).start()
+            assert os.path.exists(socket_path)
+        finally:
+            listener.close()
+    
+    def test_stale_socket_is_not_listening(self, socket_path):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        
+        assert os.path.exists(socket_path)
+        assert not broker_listening(socket_path)
+        assert not broker_listening(socket_path + ".missing")
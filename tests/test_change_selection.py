@@ -0,0 +1,113 @@
+"""
+Unit tests for change-based test selection against a scratch git repository.
+"""
+import subprocess
+import textwrap
+import pytest
+from utils import change_selection
+from utils.change_selection import changed_functions, select_tests
+
+
+PAGE_SOURCE = textwrap.dedent('''\
+    LIMIT = 3
+    
+    
+    class Page:
+        def open(self):
+            return "open"
+        
+        def close(self):
+            return "close"
+    
+    
+    def helper():
+        return LIMIT
+''')
+
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A committed repo with one page module and two test modules."""
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "pages" / "page.py").write_text(PAGE_SOURCE)
+    (tmp_path / "pages" / "locators.py").write_text('BUTTON = "button.open"\n')
+    (tmp_path / "tests" / "test_page.py").write_text("from pages.page import Page\nfrom pages.locators import BUTTON\n")
+    (tmp_path / "tests" / "test_other.py").write_text("import os\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "base")
+    monkeypatch.setattr(change_selection, "ROOT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def edit(repo, old, new):
+    path = repo / "pages" / "page.py"
+    path.write_text(path.read_text().replace(old, new))
+
+
+class TestChangedFunctions:
+    """changed_functions maps diff hunks to the innermost enclosing function."""
+    
+    def test_method_change(self, repo):
+        edit(repo, 'return "close"', 'return "closed"')
+        assert changed_functions("HEAD", "pages/page.py") == {"Page.close"}
+    
+    def test_function_change(self, repo):
+        edit(repo, "return LIMIT", "return LIMIT + 1")
+        assert changed_functions("HEAD", "pages/page.py") == {"helper"}
+    
+    def test_module_level_change(self, repo):
+        edit(repo, "LIMIT = 3", "LIMIT = 4")
+        assert changed_functions("HEAD", "pages/page.py") is None
+    
+    def test_no_change(self, repo):
+        assert changed_functions("HEAD", "pages/page.py") == set()
+
+
+class TestSelectTests:
+    """select_tests picks recorded tests by method and unrecorded modules by import."""
+    
+    DEPENDENCIES = {
+        "tests/test_page.py::test_open": {"files": ["pages/page.py"], "methods": ["pages/page.py::Page.open"]},
+        "tests/test_page.py::test_close": {"files": ["pages/page.py"], "methods": ["pages/page.py::Page.close"]},
+    }
+    
+    def test_method_granularity(self, repo):
+        edit(repo, 'return "close"', 'return "closed"')
+        assert select_tests("HEAD", self.DEPENDENCIES) == ["tests/test_page.py::test_close"]
+    
+    def test_module_level_change_selects_every_dependent(self, repo):
+        edit(repo, "LIMIT = 3", "LIMIT = 4")
+        assert select_tests("HEAD", self.DEPENDENCIES) == [
+            "tests/test_page.py::test_close", "tests/test_page.py::test_open"]
+    
+    def test_static_imports_without_recordings(self, repo):
+        edit(repo, 'return "open"', 'return "opened"')
+        assert select_tests("HEAD", {}) == ["tests/test_page.py"]
+    
+    def test_changed_test_module_is_selected(self, repo):
+        (repo / "tests" / "test_other.py").write_text("import sys\n")
+        assert select_tests("HEAD", self.DEPENDENCIES) == ["tests/test_other.py"]
+    
+    def test_unrecorded_file_falls_back_to_static_imports(self, repo):
+        (repo / "pages" / "locators.py").write_text('BUTTON = "button.opened"\n')
+        assert select_tests("HEAD", self.DEPENDENCIES) == ["tests/test_page.py"]
+    
+    def test_config_change_runs_everything(self, repo):
+        (repo / "config").mkdir()
+        (repo / "config" / "config.py").write_text('class Config:\n    TWITCH_URL = "http://127.0.0.1:8765"\n')
+        git(repo, "add", "config")
+        assert select_tests("HEAD", self.DEPENDENCIES) is None
+    
+    def test_run_all_files(self, repo):
+        (repo / "requirements.txt").write_text("selenium\n")
+        git(repo, "add", "requirements.txt")
+        assert select_tests("HEAD", self.DEPENDENCIES) is None
+    
+    def test_nothing_changed(self, repo):
+        assert select_tests("HEAD", self.DEPENDENCIES) == []
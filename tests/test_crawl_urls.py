@@ -0,0 +1,20 @@
+"""
+Unit tests for loading crawl URLs (no browser needed).
+"""
+from utils.async_browser import load_urls
+
+
+class TestLoadUrls:
+    """load_urls keeps commas inside URLs intact."""
+    
+    def test_whitespace_separated_string(self):
+        assert load_urls(" /directory  /search?term=chess,checkers\nhttps://example.com/a,b ") == [
+            "/directory", "/search?term=chess,checkers", "https://example.com/a,b"]
+    
+    def test_file_with_one_url_per_line(self, tmp_path):
+        source = tmp_path / "urls.txt"
+        source.write_text("# nightly crawl\n/directory\n\n  /search?term=a,b  \n", encoding="utf-8")
+        assert load_urls(str(source)) == ["/directory", "/search?term=a,b"]
+    
+    def test_list(self):
+        assert load_urls(["/directory", " ", "/videos/1"]) == ["/directory", "/videos/1"]
@@ -0,0 +1,35 @@
+"""
+Unit tests for device profile lookup and the DEVICES list parsing.
+"""
+import pytest
+from config.devices import DEVICE_PROFILES, get_device, parse_devices
+
+
+class TestParseDevices:
+    """parse_devices validates the device list the suite is parametrized over."""
+    
+    def test_all(self):
+        assert parse_devices(" all ") == list(DEVICE_PROFILES)
+    
+    def test_comma_separated_list(self):
+        assert parse_devices("iphone_x, pixel_7,,laptop ") == ["iphone_x", "pixel_7", "laptop"]
+    
+    def test_single_device(self):
+        assert parse_devices("desktop") == ["desktop"]
+    
+    def test_empty(self):
+        assert parse_devices(" , ") == []
+    
+    def test_unknown_device(self):
+        with pytest.raises(ValueError, match="Unknown device 'nokia_3310'"):
+            parse_devices("iphone_x,nokia_3310")
+
+
+class TestGetDevice:
+    """get_device returns a named copy of a profile."""
+    
+    def test_copy_with_name(self):
+        device = get_device("pixel_7")
+        device["width"] = 0
+        assert device["name"] == "pixel_7"
+        assert DEVICE_PROFILES["pixel_7"]["width"] == 412
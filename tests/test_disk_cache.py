@@ -0,0 +1,112 @@
+"""
+Unit tests for the shared disk cache: response accounting and the warm-up step, with Chrome stubbed out.
+"""
+import os
+import pytest
+import run_tests
+from config.config import Config
+from utils import driver_factory
+from utils.disk_cache import CacheStats
+
+
+def response(request_id, url="https://www.twitch.tv/app.js", **flags):
+    return {"requestId": request_id, "response": dict(url=url, **flags)}
+
+
+class TestCacheStats:
+    """CacheStats attributes every response to the cache layer that served it."""
+    
+    def test_sources(self):
+        stats = CacheStats()
+        stats.handle("Network.requestServedFromCache", {"requestId": "1"})
+        stats.handle("Network.responseReceived", response("1"))
+        stats.handle("Network.responseReceived", response("2", fromDiskCache=True))
+        stats.handle("Network.responseReceived", response("3", fromServiceWorker=True))
+        stats.handle("Network.responseReceived", response("4"))
+        assert stats.sources == {"disk": 1, "memory": 1, "service-worker": 1, "network": 1}
+        assert stats.hit_rate == 0.75
+    
+    def test_non_http_responses_are_ignored(self):
+        stats = CacheStats()
+        stats.handle("Network.responseReceived", response("1", url="data:image/png;base64,AAAA"))
+        stats.handle("Network.loadingFinished", {"requestId": "2"})
+        assert stats.total == 0
+        assert stats.hit_rate == 0.0
+    
+    def test_memory_marker_is_consumed(self):
+        stats = CacheStats()
+        stats.handle("Network.requestServedFromCache", {"requestId": "1"})
+        stats.handle("Network.responseReceived", response("1"))
+        stats.handle("Network.responseReceived", response("1"))
+        assert stats.sources["memory"] == 1
+        assert stats.sources["network"] == 1
+    
+    def test_summary(self):
+        stats = CacheStats()
+        stats.handle("Network.responseReceived", response("1", fromDiskCache=True))
+        assert stats.summary().startswith("100% of 1 responses from cache")
+
+
+class FakeChrome:
+    """Stands in for webdriver.Chrome: writes into its cache dir and records navigations."""
+    
+    instances = []
+    
+    def __init__(self, service=None, options=None):
+        self.arguments = options.arguments
+        self.visited = []
+        cache_dir = next(argument.split("=", 1)[1] for argument in self.arguments
+                         if argument.startswith("--disk-cache-dir="))
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, "index"), "w") as f:
+            f.write("cached")
+        FakeChrome.instances.append(self)
+    
+    def implicitly_wait(self, seconds):
+        pass
+    
+    def set_page_load_timeout(self, seconds):
+        pass
+    
+    def set_script_timeout(self, seconds):
+        pass
+    
+    def set_window_size(self, width, height):
+        pass
+    
+    def execute_cdp_cmd(self, command, params):
+        return {"identifier": "1"}
+    
+    def get_log(self, log_type):
+        return []
+    
+    def get(self, url):
+        self.visited.append(url)
+    
+    def quit(self):
+        pass
+
+
+class TestWarmDiskCache:
+    """run_tests.warm_disk_cache works even when Config was imported before DISK_CACHE was set."""
+    
+    def test_warms_and_seeds_shards(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("DISK_CACHE", raising=False)
+        monkeypatch.setattr(Config, "DISK_CACHE", False)
+        monkeypatch.setattr(Config, "DISK_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(Config, "BROWSER_BROKER", "")
+        monkeypatch.setattr(Config, "PROFILE_TEMPLATE", False)
+        monkeypatch.setattr(Config, "WARM_STATE", False)
+        monkeypatch.setattr(driver_factory.webdriver, "Chrome", FakeChrome)
+        monkeypatch.setattr(driver_factory.DriverFactory, "wait_for_page_load", lambda self: None)
+        monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/true")
+        FakeChrome.instances = []
+        
+        run_tests.warm_disk_cache(shards=3, headless=True)
+        
+        chrome = FakeChrome.instances[0]
+        assert "--headless=new" in chrome.arguments
+        assert chrome.visited == [f"{Config.TWITCH_URL}{page}" for page in Config.WARM_CACHE_PAGES]
+        for index in range(3):
+            assert os.path.exists(os.path.join(Config.DISK_CACHE_DIR, f"shard-{index}", "index"))
+        assert os.environ["DISK_CACHE"] == "true"
@@ -0,0 +1,83 @@
+"""
+Unit tests for duration history and LPT scheduling (no browser needed).
+"""
+import json
+import pytest
+from utils.duration_scheduler import expected_duration, ideal_makespan, load_durations, lpt_schedule, save_durations
+
+
+class TestLptSchedule:
+    """lpt_schedule spreads tests longest-first over the least-loaded worker."""
+    
+    def test_balances_longest_first(self):
+        durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 1.0}
+        bins, loads = lpt_schedule(durations, 2)
+        assert bins == [["a", "d"], ["b", "c", "e"]]
+        assert loads == [8.0, 8.0]
+    
+    def test_ties_are_ordered_by_nodeid(self):
+        bins, _ = lpt_schedule({"b": 1.0, "a": 1.0}, 1)
+        assert bins == [["a", "b"]]
+    
+    def test_at_least_one_worker(self):
+        bins, loads = lpt_schedule({"a": 2.0}, 0)
+        assert bins == [["a"]]
+        assert loads == [2.0]
+    
+    def test_more_workers_than_tests(self):
+        bins, loads = lpt_schedule({"a": 2.0}, 3)
+        assert bins == [["a"], [], []]
+        assert loads == [2.0, 0.0, 0.0]
+
+
+class TestIdealMakespan:
+    """ideal_makespan is the perfect-balance lower bound."""
+    
+    def test_perfect_balance(self):
+        assert ideal_makespan([4.0, 4.0, 4.0, 4.0], 2) == 8.0
+    
+    def test_never_below_the_longest_test(self):
+        assert ideal_makespan([10.0, 1.0, 1.0], 4) == 10.0
+    
+    def test_empty(self):
+        assert ideal_makespan([], 4) == 0.0
+
+
+class TestDurationHistory:
+    """save_durations merges runs with an exponential moving average."""
+    
+    def test_first_run_is_stored_as_is(self, tmp_path):
+        path = str(tmp_path / "durations.json")
+        assert save_durations({"a": 4.0}, path) == {"a": 4.0}
+        assert load_durations(path) == {"a": 4.0}
+    
+    def test_ewma_merge(self, tmp_path):
+        path = str(tmp_path / "durations.json")
+        save_durations({"a": 4.0, "b": 2.0}, path)
+        history = save_durations({"a": 8.0}, path, smoothing=0.25)
+        assert history["a"] == pytest.approx(5.0)
+        assert history["b"] == 2.0
+    
+    def test_unreadable_history_is_empty(self, tmp_path):
+        path = tmp_path / "durations.json"
+        path.write_text("{not json")
+        assert load_durations(str(path)) == {}
+    
+    def test_saved_values_are_rounded(self, tmp_path):
+        path = tmp_path / "durations.json"
+        save_durations({"a": 1.23456}, str(path))
+        assert json.loads(path.read_text()) == {"a": 1.235}
+
+
+class TestExpectedDuration:
+    """expected_duration falls back to the history mean, then the configured default."""
+    
+    def test_known_test(self):
+        assert expected_duration("a", {"a": 3.0, "b": 5.0}) == 3.0
+    
+    def test_unknown_test_uses_mean(self):
+        assert expected_duration("c", {"a": 3.0, "b": 5.0}) == 4.0
+    
+    def test_no_history_uses_default(self, monkeypatch):
+        monkeypatch.setattr("config.config.Config.DEFAULT_TEST_DURATION", 42.0)
+        assert expected_duration("a", {}) == 42.0
@@ -0,0 +1,54 @@
+"""
+Unit tests for memory sampling and leak detection (no browser needed).
+"""
+import builtins
+import pytest
+from utils import memory_sampler
+from utils.memory_sampler import MemorySampler, harness_rss_mb, slope
+
+
+class TestHarnessRss:
+    """harness_rss_mb reports current RSS or nothing, never a peak."""
+    
+    def test_reads_current_rss(self):
+        if harness_rss_mb() is None:
+            pytest.skip("no /proc on this platform")
+        assert harness_rss_mb() > 0
+    
+    def test_none_without_proc(self, monkeypatch):
+        real_open = builtins.open
+        
+        def no_proc(path, *args, **kwargs):
+            if str(path).startswith("/proc/"):
+                raise FileNotFoundError(path)
+            return real_open(path, *args, **kwargs)
+        
+        monkeypatch.setattr(builtins, "open", no_proc)
+        assert harness_rss_mb() is None
+        assert "harness_rss_mb" not in MemorySampler(driver=None).sample("series")
+
+
+class TestSuspectedLeaks:
+    """Slopes above the configured limits are reported once a series has enough samples."""
+    
+    def test_slope(self):
+        assert slope([1, 3, 5, 7]) == 2
+        assert slope([4]) == 0.0
+    
+    def test_harness_growth(self, monkeypatch):
+        readings = iter([100, 102, 104, 106, 108])
+        monkeypatch.setattr(memory_sampler, "harness_rss_mb", lambda: next(readings))
+        sampler = MemorySampler(driver=None, leak_slopes={"harness_rss_mb": 1.0}, min_samples=5)
+        for step in range(5):
+            sampler.sample("scroll", label=step)
+        
+        assert sampler.trends() == {"scroll": {"harness_rss_mb": 2.0}}
+        assert sampler.suspected_leaks() == ["scroll: harness_rss_mb grows 2.0/sample (limit 1.0, harness)"]
+    
+    def test_too_few_samples(self, monkeypatch):
+        readings = iter([100, 200])
+        monkeypatch.setattr(memory_sampler, "harness_rss_mb", lambda: next(readings))
+        sampler = MemorySampler(driver=None, leak_slopes={"harness_rss_mb": 1.0}, min_samples=5)
+        sampler.sample("scroll")
+        sampler.sample("scroll")
+        assert sampler.suspected_leaks() == []
@@ -0,0 +1,33 @@
+"""
+Unit tests for profile clone garbage collection.
+"""
+import os
+import subprocess
+import sys
+from utils.profile_template import ProfileTemplate
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class TestCollectGarbage:
+    """collect_garbage removes only clones no live process owns."""
+    
+    def test_keeps_live_owners_regardless_of_age(self, tmp_path):
+        template = ProfileTemplate(str(tmp_path))
+        live = os.path.join(template.clones_dir, f"{os.getpid()}-aaaaaaaa")
+        dead = os.path.join(template.clones_dir, f"{dead_pid()}-bbbbbbbb")
+        unnamed = os.path.join(template.clones_dir, "leftover")
+        for path in (live, dead, unnamed):
+            os.makedirs(path)
+        # A week-old clone of a live owner (e.g. the broker) is still in use
+        os.utime(live, (0, 0))
+        
+        assert template.collect_garbage() == 2
+        assert os.listdir(template.clones_dir) == [os.path.basename(live)]
+    
+    def test_no_clones(self, tmp_path):
+        assert ProfileTemplate(str(tmp_path)).collect_garbage() == 0
@@ -0,0 +1,119 @@
+"""
+Unit tests for the resource governor's admission decisions, with /proc readings faked.
+"""
+import pytest
+from utils import resource_governor
+from utils.resource_governor import ResourceGovernor
+
+
+class FakeProc:
+    """Stands in for /proc: free/total memory, load average and per-pid process tree memory."""
+    
+    def __init__(self, monkeypatch, free_mb=4000, total_mb=8000, load=0.5):
+        self.meminfo = {"MemAvailable": free_mb, "MemTotal": total_mb}
+        self.load = load
+        self.tree_mb = {}
+        monkeypatch.setattr(resource_governor, "read_meminfo", lambda: dict(self.meminfo))
+        monkeypatch.setattr(resource_governor, "load_average", lambda: self.load)
+        monkeypatch.setattr(resource_governor, "_children_by_parent", lambda: {})
+        monkeypatch.setattr(resource_governor, "process_tree_memory_mb",
+                            lambda pid, children=None: self.tree_mb.get(pid))
+
+
+@pytest.fixture
+def proc(monkeypatch):
+    return FakeProc(monkeypatch)
+
+
+def governor(**overrides):
+    settings = dict(memory_per_session_mb=1000, reserve_mb=500, max_load_per_cpu=1.5, poll_interval=0.01)
+    settings.update(overrides)
+    governor = ResourceGovernor(**settings)
+    governor.cpus = 4
+    return governor
+
+
+class TestCapacity:
+    """ResourceGovernor._capacity from memory, load and measured session sizes."""
+    
+    def test_first_session_always_fits(self, proc):
+        proc.meminfo["MemAvailable"] = 0
+        proc.load = 100.0
+        assert governor().capacity() == 1
+    
+    def test_starting_session_reserves_its_expected_size(self, proc):
+        gov = governor()
+        gov.try_acquire()
+        # 4000 free - 500 reserve - 1000 still to come for the untracked session
+        assert gov.capacity() == 2
+    
+    def test_measured_sessions_raise_the_estimate(self, proc):
+        gov = governor()
+        slot = gov.try_acquire()
+        gov.track(slot, 101)
+        proc.tree_mb[101] = 1500
+        # Fully grown at 1500 MB: (4000 - 500) // 1500
+        assert gov.capacity() == 2
+        assert gov.metrics()["session_memory_mb"] == 1500
+    
+    def test_estimate_never_drops_below_the_floor(self, proc):
+        gov = governor()
+        slot = gov.try_acquire()
+        gov.track(slot, 101)
+        proc.tree_mb[101] = 200
+        # Still growing towards 1000 MB: (4000 - 500 - 800) // 1000
+        assert gov.capacity() == 2
+    
+    def test_measured_peak_is_kept(self, proc):
+        gov = governor()
+        slot = gov.try_acquire()
+        gov.track(slot, 101)
+        proc.tree_mb[101] = 1750
+        gov.capacity()
+        proc.tree_mb[101] = 900
+        assert gov.capacity() == 2
+        assert gov.metrics()["session_memory_mb"] == 1750
+    
+    def test_low_memory_queues(self, proc):
+        gov = governor()
+        gov.try_acquire()
+        proc.meminfo["MemAvailable"] = 2400
+        assert gov.capacity() == 0
+        assert gov.try_acquire() is None
+    
+    def test_cpu_load_ceiling(self, proc):
+        gov = governor()
+        gov.try_acquire()
+        proc.load = 6.5  # 1.625 per CPU
+        assert gov.capacity() == 0
+    
+    def test_max_sessions_cap(self, proc):
+        gov = governor(max_sessions=2)
+        gov.try_acquire()
+        proc.meminfo["MemAvailable"] = 64000
+        assert gov.capacity() == 1
+    
+    def test_release_frees_capacity(self, proc):
+        gov = governor()
+        first = gov.try_acquire()
+        gov.try_acquire()
+        proc.meminfo["MemAvailable"] = 2600
+        assert gov.capacity() == 0
+        gov.release(first)
+        assert gov.capacity() == 1
+    
+    def test_without_proc_only_max_sessions_limits(self, proc):
+        proc.meminfo = {}
+        proc.load = None
+        gov = governor(max_sessions=3)
+        gov.try_acquire()
+        gov.try_acquire()
+        assert gov.capacity() == 1
+    
+    def test_acquire_times_out_when_nothing_fits(self, proc):
+        gov = governor()
+        gov.try_acquire()
+        proc.meminfo["MemAvailable"] = 1000
+        with pytest.raises(TimeoutError):
+            gov.acquire(timeout=0.05)
+        assert gov.metrics()["queued"] == 1
@@ -0,0 +1,74 @@
+"""
+Unit tests for search-result parsing and harvesting (no browser needed).
+"""
+import json
+import pytest
+from pages.search_results_page import SearchResultsPage, parse_viewer_count
+
+
+class FakeResultsDriver:
+    """Answers the card data script from an in-memory list of cards, honouring marker tokens."""
+    
+    def __init__(self, hrefs):
+        self.cards = [{"href": href, "marks": {}} for href in hrefs]
+    
+    def execute_script(self, script, *args):
+        if not args:
+            return None
+        _, fields, marker, token = args
+        rows = []
+        for card in self.cards:
+            if marker:
+                if card["marks"].get(marker) == token:
+                    continue
+                card["marks"][marker] = token
+            rows.append([card["href"] if field == "href" else None for field in fields])
+        return json.dumps(rows)
+
+
+class FakeDriverManager:
+    def __init__(self, driver):
+        self.driver = driver
+    
+    def read_performance_log(self):
+        return 0
+
+
+class TestParseViewerCount:
+    """parse_viewer_count turns viewer labels into integers."""
+    
+    @pytest.mark.parametrize("text, expected", [
+        ("1.2K viewers", 1200),
+        ("3 viewers", 3),
+        ("1,234 viewers", 1234),
+        ("2.5M", 2500000),
+        ("Live, 3 viewers", 3),
+        ("3. viewers", 3),
+    ])
+    def test_parses_labels(self, text, expected):
+        assert parse_viewer_count(text) == expected
+    
+    @pytest.mark.parametrize("text", [None, "", "Live", ". viewers", ", viewers"])
+    def test_labels_without_a_number(self, text):
+        assert parse_viewer_count(text) is None
+
+
+class TestIterResults:
+    """iter_results harvests each card once per call."""
+    
+    def test_second_call_starts_over(self):
+        driver = FakeResultsDriver([f"https://www.twitch.tv/videos/{i}" for i in range(5)])
+        page = SearchResultsPage(FakeDriverManager(driver))
+        
+        first = [card.href for card in page.iter_results(max_idle_scrolls=1, batch_timeout=0)]
+        second = [card.href for card in page.iter_results(max_idle_scrolls=1, batch_timeout=0)]
+        
+        assert len(first) == 5
+        assert second == first
+    
+    def test_cards_cut_off_by_max_results_are_not_lost(self):
+        driver = FakeResultsDriver([f"https://www.twitch.tv/videos/{i}" for i in range(5)])
+        page = SearchResultsPage(FakeDriverManager(driver))
+        
+        assert len(list(page.iter_results(max_results=2))) == 2
+        assert len(list(page.iter_results(max_idle_scrolls=1, batch_timeout=0))) == 5
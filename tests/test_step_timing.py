@@ -0,0 +1,37 @@
+"""
+Unit tests for the step timeline aggregation.
+"""
+import json
+import pytest
+from utils.step_timing import aggregate, percentile
+
+
+class TestPercentile:
+    """percentile is the nearest-rank percentile: the ceil(p * n)-th smallest value."""
+    
+    @pytest.mark.parametrize("values, fraction, expected", [
+        ([1, 2], 0.50, 1),
+        (list(range(1, 7)), 0.50, 3),
+        (list(range(1, 11)), 0.50, 5),
+        (list(range(1, 21)), 0.95, 19),
+        (list(range(1, 101)), 0.95, 95),
+        ([1, 2, 3], 0.50, 2),
+        ([7], 0.95, 7),
+        ([3, 1, 2], 1.0, 3),
+        ([3, 1, 2], 0.0, 1),
+    ])
+    def test_nearest_rank(self, values, fraction, expected):
+        assert percentile(values, fraction) == expected
+
+
+class TestAggregate:
+    """aggregate summarises timeline records per step."""
+    
+    def test_summary(self, tmp_path):
+        timeline = tmp_path / "step_timeline.jsonl"
+        records = [{"step": "HomePage.search", "duration_ms": ms, "outcome": "ok"} for ms in (10, 20, 30, 40)]
+        records.append({"step": "HomePage.search", "duration_ms": 50, "outcome": "error", "branch": "retry"})
+        timeline.write_text("\n".join(json.dumps(record) for record in records) + "\n\n")
+        
+        assert aggregate([str(timeline)]) == {"HomePage.search": {
+            "count": 5, "p50_ms": 30, "p95_ms": 50, "total_ms": 150, "not_ok": 1, "branches": {"retry": 1}}}
@@ -48,9 +48,15 @@ class TestTwitchBasicFunctionality:
 
                 # Assert we're on Twitch homepage
                 assert "Twitch" in page_title, f"Page title should contain 'Twitch', got: {page_title}"
-                assert "twitch.tv" in current_url, f"URL should contain 'twitch.tv', got: {current_url}"
+                assert config.TWITCH_DOMAIN in current_url, f"URL should contain '{config.TWITCH_DOMAIN}', got: {current_url}"
                 print("✅ Successfully verified we're on Twitch homepage!")
 
+            if config.COLLECT_WEB_VITALS:
+                with allure.step("Check homepage performance budget"):
+                    violations = homepage.check_performance_budget()
+                    assert not violations, f"Homepage performance budget exceeded: {violations}"
+                    print("✅ Homepage is within its performance budget!")
+
             with allure.step("Verify Twitch logo visibility"):
                 # Assert Twitch logo is visible
                 if homepage.is_twitch_logo_visible():
@@ -251,6 +257,12 @@ class TestTwitchBasicFunctionality:
             except Exception as e:
                 print(f"⚠️ StarCraft II page verification failed: {e}")
 
+            # Front-end performance gate for the StarCraft II category page
+            if config.COLLECT_WEB_VITALS:
+                violations = search_results_page.check_performance_budget()
+                assert not violations, f"StarCraft II page performance budget exceeded: {violations}"
+                print("✅ StarCraft II page is within its performance budget!")
+
             print("✅ StarCraft II search test completed successfully!")
 
         except Exception as e:
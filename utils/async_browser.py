@@ -0,0 +1,249 @@
+"""
+Asyncio facade over DriverFactory and the page objects.
+
+Selenium calls block, so every call runs on a bounded thread pool while the
+event loop stays free. A semaphore caps how many browser sessions are open at
+once and a per-session lock keeps calls on one session in order, so a single
+Python process can drive many browsers concurrently.
+"""
+import asyncio
+import functools
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from config.config import Config
+from utils.driver_factory import DriverFactory
+from utils.resource_governor import process_governor
+
+
+class AsyncPage:
+    """Proxy that turns a page object's methods into coroutines run on its session."""
+    
+    def __init__(self, session, page):
+        self._session = session
+        self._page = page
+    
+    def __getattr__(self, name):
+        attribute = getattr(self._page, name)
+        if not callable(attribute):
+            return attribute
+        
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self._session.run(attribute, *args, **kwargs)
+        return call
+
+
+class AsyncSession:
+    """One browser session whose blocking calls run on the pool's executor, one at a time."""
+    
+    def __init__(self, driver_manager, executor):
+        self.driver_manager = driver_manager
+        self.slot = None
+        self._executor = executor
+        self._lock = asyncio.Lock()
+    
+    @property
+    def driver(self):
+        return self.driver_manager.driver
+    
+    async def run(self, function, *args, **kwargs):
+        """Run a blocking call on the executor once this session's previous calls finished."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+    
+    async def navigate(self, url=None):
+        """Load a URL (default: the Twitch homepage) and return the final URL."""
+        url = url or self.driver_manager.config.TWITCH_URL
+        if not url.startswith(("http://", "https://")):
+            url = f"{self.driver_manager.config.TWITCH_URL}/{url.lstrip('/')}"
+        
+        def navigate():
+            self.driver_manager.read_performance_log()
+            self.driver.get(url)
+            return self.driver.current_url
+        return await self.run(navigate)
+    
+    async def find_first(self, *locators, timeout=None):
+        """Return the first element matching any of the (By, value) locators, or None on timeout.
+        
+        A plain string is treated as a CSS selector.
+        """
+        locators = [(By.CSS_SELECTOR, locator) if isinstance(locator, str) else locator for locator in locators]
+        timeout = timeout if timeout is not None else self.driver_manager.config.EXPLICIT_WAIT
+        
+        def first(driver):
+            for locator in locators:
+                elements = driver.find_elements(*locator)
+                if elements:
+                    return elements[0]
+            return False
+        
+        def find():
+            try:
+                return WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(first)
+            except TimeoutException:
+                return None
+        return await self.run(find)
+    
+    async def snapshot(self):
+        """Return the current URL, title and HTML of the page."""
+        def snapshot():
+            return {"url": self.driver.current_url, "title": self.driver.title, "html": self.driver.page_source}
+        return await self.run(snapshot)
+    
+    async def screenshot(self, filename):
+        """Save a screenshot under screenshots/ and return its path."""
+        return await self.run(self.driver_manager.take_screenshot, filename)
+    
+    def page(self, page_class):
+        """Return an AsyncPage wrapping a page object bound to this session."""
+        return AsyncPage(self, page_class(self.driver_manager))
+
+
+class AsyncBrowserPool:
+    """Open, reuse and close browser sessions for asyncio code.
+    
+    At most max_sessions browsers are open at a time; further session()
+    requests wait on the semaphore. New browsers are also admitted by the
+    process's resource governor, so they wait while memory or CPU is short.
+    Released sessions are kept for reuse until close().
+    """
+    
+    def __init__(self, max_sessions=None):
+        self.config = Config()
+        self.max_sessions = max_sessions or self.config.ASYNC_MAX_SESSIONS or os.cpu_count() or 1
+        # Each session runs at most one call at a time, so one thread per session is enough
+        self._executor = ThreadPoolExecutor(max_workers=self.max_sessions, thread_name_prefix="async-browser")
+        self._semaphore = asyncio.Semaphore(self.max_sessions)
+        self._governor = process_governor()
+        self._idle = []
+        self._sessions = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    @asynccontextmanager
+    async def session(self):
+        """Yield an AsyncSession, starting a browser if no idle one is available."""
+        async with self._semaphore:
+            session = self._idle.pop() if self._idle else await self._start_session()
+            healthy = False
+            try:
+                yield session
+                healthy = True
+            finally:
+                if healthy:
+                    self._idle.append(session)
+                else:
+                    # A failed call may leave the page in any state; start the next user clean
+                    await self._quit_session(session)
+    
+    async def _start_session(self):
+        # Wait for the governor off the pool's executor, whose threads the open sessions need
+        slot = await asyncio.to_thread(self._governor.acquire)
+        driver_manager = DriverFactory()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, driver_manager.setup_driver)
+        except Exception:
+            self._governor.release(slot)
+            raise
+        self._governor.track(slot, driver_manager.browser_pid())
+        session = AsyncSession(driver_manager, self._executor)
+        session.slot = slot
+        self._sessions.append(session)
+        return session
+    
+    async def _quit_session(self, session):
+        self._sessions.remove(session)
+        try:
+            await session.run(session.driver_manager.quit_driver)
+        except Exception as e:
+            print(f"⚠️ Failed to quit browser session: {e}")
+        finally:
+            self._governor.release(session.slot)
+    
+    async def close(self):
+        """Quit every browser session and shut down the executor."""
+        sessions, self._idle = list(self._sessions), []
+        await asyncio.gather(*(self._quit_session(session) for session in sessions))
+        self._executor.shutdown(wait=True)
+    
+    async def crawl(self, urls, report_path=None):
+        """Snapshot every URL concurrently and return a run summary.
+        
+        Each record (URL, final URL, title, HTML size, timing or error) is
+        appended to a JSONL report as soon as its page finishes.
+        """
+        report_path = report_path or self.config.CRAWL_REPORT
+        report_dir = os.path.dirname(report_path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        
+        print(f"🕸️ Crawling {len(urls)} pages across up to {self.max_sessions} browser sessions")
+        started = time.perf_counter()
+        with open(report_path, "w", encoding="utf-8") as report:
+            async def crawl_one(url):
+                record = {"url": url, "ok": False, "error": None}
+                page_started = time.perf_counter()
+                try:
+                    async with self.session() as session:
+                        await session.navigate(url)
+                        snapshot = await session.snapshot()
+                    record.update(final_url=snapshot["url"], title=snapshot["title"],
+                                  html_bytes=len(snapshot["html"]), ok=True)
+                except Exception as e:
+                    record["error"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+                record["elapsed_s"] = round(time.perf_counter() - page_started, 3)
+                report.write(json.dumps(record) + "\n")
+                report.flush()
+                return record["ok"]
+            
+            results = await asyncio.gather(*(crawl_one(url) for url in urls))
+        
+        elapsed = time.perf_counter() - started
+        summary = {
+            "pages": len(urls),
+            "failures": results.count(False),
+            "sessions": len(self._sessions),
+            "elapsed_s": round(elapsed, 3),
+            "pages_per_minute": round(len(urls) / elapsed * 60, 1) if elapsed else None,
+        }
+        print(f"✅ Crawl finished: {summary}")
+        print(f"🧮 Resources: {self._governor.metrics()}")
+        print(f"📊 Report written to {report_path}")
+        return summary
+
+
+def load_urls(source):
+    """Load URLs/paths from a list, a file with one per line, or a whitespace-separated string.
+    
+    Commas are legal inside URLs (query strings, paths), so unlike search
+    terms they are never used as a separator.
+    """
+    if isinstance(source, (list, tuple)):
+        urls = source
+    elif os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            urls = [line for line in f if not line.lstrip().startswith("#")]
+    else:
+        urls = source.split()
+    return [url.strip() for url in urls if url.strip()]
+
+
+def crawl(urls, max_sessions=None, report_path=None):
+    """Crawl URLs (absolute or relative to TWITCH_URL) from synchronous code."""
+    async def main():
+        async with AsyncBrowserPool(max_sessions) as pool:
+            return await pool.crawl(urls, report_path)
+    return asyncio.run(main())
@@ -0,0 +1,443 @@
+"""
+Local browser broker: one long-lived process owns a pool of warm Chrome
+sessions and leases them to test workers over a Unix socket.
+
+Protocol: one JSON object per line in each direction.
+    {"op": "acquire", "timeout": 300}  -> {"ok": true, "lease": ..., "executor_url": ..., "session_id": ...}
+    {"op": "release", "lease": ...}    -> {"ok": true}
+    {"op": "stats"}                    -> {"ok": true, "idle": ..., "leased": ..., ...}
+A lease belongs to the connection that acquired it; when the connection
+closes, its leases are returned to the pool. Workers drive the leased browser
+directly through its ChromeDriver with AttachedDriver.
+"""
+import argparse
+import itertools
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from config.config import Config
+from utils.resource_governor import ResourceGovernor
+
+
+class AttachedDriver(webdriver.Remote):
+    """Remote driver bound to a session another process created, instead of starting a new one."""
+    
+    def __init__(self, executor_url, session_id, capabilities):
+        self._attached_session = (session_id, capabilities)
+        super().__init__(command_executor=executor_url, options=Options())
+    
+    def start_session(self, capabilities):
+        self.session_id, self.caps = self._attached_session
+    
+    def get_log(self, log_type):
+        """Read and clear a browser log (e.g. "performance"); webdriver.Remote has no get_log of its own."""
+        return self.execute("getLog", {"type": log_type})["value"]
+    
+    def quit(self):
+        """Leave the session running; the broker owns the browser."""
+        self.command_executor.close()
+
+
+class BrokerClient:
+    """Connection to the broker; leases taken on it are returned when it closes."""
+    
+    def __init__(self, socket_path):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(socket_path)
+        self._file = self._socket.makefile("rwb")
+    
+    def request(self, op, **fields):
+        """Send one request and return the response, raising RuntimeError on a broker error."""
+        self._file.write((json.dumps(dict(fields, op=op)) + "\n").encode())
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise RuntimeError("Browser broker closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(f"Browser broker: {response.get('error')}")
+        return response
+    
+    def acquire(self, timeout=300):
+        return self.request("acquire", timeout=timeout)
+    
+    def release(self, lease):
+        return self.request("release", lease=lease)
+    
+    def stats(self):
+        return self.request("stats")
+    
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self._socket.close()
+
+
+class BrokeredBrowser:
+    """A browser session owned by the broker."""
+    
+    def __init__(self, browser_id, driver_manager, slot):
+        self.id = browser_id
+        self.driver_manager = driver_manager
+        self.slot = slot
+        self.leases = 0
+        self.started_at = time.time()
+    
+    def lease_info(self):
+        """Everything a worker needs to drive this browser."""
+        driver_manager = self.driver_manager
+        return {
+            "browser": self.id,
+            "executor_url": driver_manager.driver.service.service_url,
+            "session_id": driver_manager.driver.session_id,
+            "capabilities": driver_manager.driver.caps,
+            "modal_dismisser": driver_manager.modal_dismisser_installed,
+            "cache_shard": driver_manager.cache_shard,
+        }
+    
+    def is_healthy(self):
+        """Return True if the browser still answers WebDriver commands."""
+        try:
+            self.driver_manager.driver.execute_script("return document.readyState")
+            return bool(self.driver_manager.driver.window_handles)
+        except Exception:
+            return False
+
+
+class _BrokerRequestHandler(socketserver.StreamRequestHandler):
+    """Serve one client connection; its leases end with it."""
+    
+    broker = None
+    
+    def handle(self):
+        leases = set()
+        try:
+            for line in self.rfile:
+                try:
+                    response = self.broker.handle_request(json.loads(line), leases)
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                self.wfile.write((json.dumps(response) + "\n").encode())
+                self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            for lease in leases:
+                print(f"⚠️ Client disconnected holding lease {lease}; reclaiming its browser")
+                self.broker.release(lease)
+
+
+class BrowserBroker:
+    """Keep a warm pool of browsers and lease them out, within global limits.
+    
+    At most max_browsers run at once, and a new one is only launched when the
+    resource governor admits it (free memory and CPU load). Returned browsers
+    are reset and health-checked before reuse; browsers that fail the check or
+    reach max_leases are replaced.
+    """
+    
+    def __init__(self, socket_path, max_browsers=None, warm_browsers=None, max_leases=None, health_interval=None):
+        self.config = Config()
+        self.socket_path = socket_path
+        self.governor = ResourceGovernor()
+        self.max_browsers = max_browsers or self.config.BROKER_MAX_BROWSERS or self.governor.recommended_sessions()
+        self.governor.max_sessions = self.max_browsers
+        warm_browsers = warm_browsers if warm_browsers is not None else self.config.BROKER_WARM_BROWSERS
+        self.warm_browsers = min(warm_browsers or self.max_browsers, self.max_browsers)
+        self.max_leases = max_leases or self.config.BROKER_MAX_LEASES
+        self.health_interval = health_interval or self.config.BROKER_HEALTH_INTERVAL
+        self._idle = []
+        self._leased = {}
+        self._starting = 0
+        self._resetting = 0
+        self._condition = threading.Condition()
+        self._browser_ids = itertools.count(1)
+        self._lease_ids = itertools.count(1)
+        self._stopped = threading.Event()
+        self._counters = {"launched": 0, "recycled": 0, "failed_health_checks": 0, "leases": 0, "acquire_wait_ms": 0.0}
+        self.server = None
+    
+    def start(self):
+        """Bind the socket, warm the pool and start serving in background threads.
+        
+        A socket left behind by a dead broker is replaced; one a live broker
+        still answers on is not, so two runs never share or steal a path.
+        """
+        if os.path.exists(self.socket_path):
+            if broker_listening(self.socket_path):
+                raise RuntimeError(f"A browser broker is already listening on {self.socket_path}")
+            os.remove(self.socket_path)
+        handler = type("BoundBrokerRequestHandler", (_BrokerRequestHandler,), {"broker": self})
+        self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="broker", daemon=True).start()
+        threading.Thread(target=self._health_loop, name="broker-health", daemon=True).start()
+        for _ in range(self.warm_browsers):
+            threading.Thread(target=self._replenish, daemon=True).start()
+        print(f"✅ Browser broker listening on {self.socket_path} "
+              f"(max {self.max_browsers} browsers, {self.warm_browsers} warm)")
+        return self
+    
+    def stop(self):
+        """Stop serving and quit every browser."""
+        self._stopped.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        with self._condition:
+            browsers = self._idle + list(self._leased.values())
+            self._idle, self._leased = [], {}
+            self._condition.notify_all()
+        for browser in browsers:
+            self._quit(browser)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        print(f"✅ Browser broker stopped: {self.stats()}")
+    
+    def handle_request(self, request, leases):
+        """Answer one protocol request; leases is the connection's set of lease ids."""
+        op = request.get("op")
+        if op == "acquire":
+            lease, info = self.acquire(request.get("timeout", 300))
+            leases.add(lease)
+            return dict(info, ok=True, lease=lease)
+        if op == "release":
+            leases.discard(request["lease"])
+            self.release(request["lease"])
+            return {"ok": True}
+        if op == "stats":
+            return dict(self.stats(), ok=True)
+        raise ValueError(f"Unknown op: {op}")
+    
+    def acquire(self, timeout):
+        """Lease an idle browser, launching one if the limits allow, or wait for a release."""
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._stopped.is_set():
+                    raise RuntimeError("Broker is shutting down")
+                if self._idle:
+                    browser = self._idle.pop()
+                    break
+                slot = self._reserve_launch()
+                if slot is not None:
+                    browser = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser free within {timeout}s ({self.stats()})")
+                # Wake up periodically: free memory can change without a release
+                self._condition.wait(min(remaining, 1.0))
+        
+        if browser is None:
+            browser = self._launch(slot)
+        lease = f"{os.getpid()}-{next(self._lease_ids)}"
+        with self._condition:
+            self._leased[lease] = browser
+            browser.leases += 1
+            self._counters["leases"] += 1
+            self._counters["acquire_wait_ms"] += (time.perf_counter() - started) * 1000
+        return lease, browser.lease_info()
+    
+    def release(self, lease):
+        """Take a browser back; it is reset and checked in the background before reuse."""
+        with self._condition:
+            browser = self._leased.pop(lease, None)
+            if browser is None:
+                return
+            self._resetting += 1
+        threading.Thread(target=self._recycle, args=(browser,), daemon=True).start()
+    
+    def stats(self):
+        """Pool state and counters (utilisation = leased / max_browsers)."""
+        with self._condition:
+            leases = self._counters["leases"]
+            return {
+                "max_browsers": self.max_browsers,
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "starting": self._starting,
+                "resetting": self._resetting,
+                "utilisation": round(len(self._leased) / self.max_browsers, 3),
+                "launched": self._counters["launched"],
+                "recycled": self._counters["recycled"],
+                "failed_health_checks": self._counters["failed_health_checks"],
+                "leases": leases,
+                "avg_acquire_wait_ms": round(self._counters["acquire_wait_ms"] / leases, 1) if leases else None,
+                "resources": self.governor.metrics(),
+            }
+    
+    def _running(self):
+        return len(self._idle) + len(self._leased) + self._starting + self._resetting
+    
+    def _reserve_launch(self):
+        """Count one more starting browser and return its governor slot, or None if it doesn't fit (call under lock)."""
+        if self._running() >= self.max_browsers:
+            return None
+        slot = self.governor.try_acquire()
+        if slot is not None:
+            self._starting += 1
+        return slot
+    
+    def _launch(self, slot):
+        """Start a browser for a slot reserved with _reserve_launch."""
+        from utils.driver_factory import DriverFactory
+        
+        driver_manager = DriverFactory()
+        try:
+            driver_manager.setup_driver()
+        except Exception:
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify_all()
+            driver_manager.quit_driver()
+            self.governor.release(slot)
+            raise
+        self.governor.track(slot, driver_manager.browser_pid())
+        with self._condition:
+            self._starting -= 1
+            self._counters["launched"] += 1
+        return BrokeredBrowser(next(self._browser_ids), driver_manager, slot)
+    
+    def _replenish(self):
+        """Launch an idle browser if the pool is below its warm size."""
+        with self._condition:
+            if self._stopped.is_set() or self._running() >= self.warm_browsers:
+                return
+            slot = self._reserve_launch()
+            if slot is None:
+                return
+        try:
+            browser = self._launch(slot)
+        except Exception as e:
+            print(f"⚠️ Broker could not launch a browser: {e}")
+            return
+        self._make_idle(browser)
+    
+    def _make_idle(self, browser):
+        with self._condition:
+            stopped = self._stopped.is_set()
+            if not stopped:
+                self._idle.append(browser)
+                self._condition.notify()
+        if stopped:
+            self._quit(browser)
+    
+    def _recycle(self, browser):
+        """Reset a returned browser and put it back, or replace it if it is worn out or broken."""
+        reusable = browser.leases < self.max_leases
+        if reusable:
+            try:
+                browser.driver_manager.reset_session()
+            except Exception as e:
+                print(f"⚠️ Could not reset browser {browser.id}: {e}")
+                reusable = False
+        healthy = reusable and browser.is_healthy()
+        with self._condition:
+            self._resetting -= 1
+            if reusable and not healthy:
+                self._counters["failed_health_checks"] += 1
+            self._condition.notify_all()
+        if healthy:
+            self._make_idle(browser)
+            return
+        with self._condition:
+            self._counters["recycled"] += 1
+        self._quit(browser)
+        self._replenish()
+    
+    def _health_loop(self):
+        """Check idle browsers every health_interval seconds and replace the dead ones."""
+        while not self._stopped.wait(self.health_interval):
+            with self._condition:
+                candidates = list(self._idle)
+            for browser in candidates:
+                # Take the browser out of the pool while checking it
+                with self._condition:
+                    if browser not in self._idle:
+                        continue
+                    self._idle.remove(browser)
+                    self._resetting += 1
+                healthy = browser.is_healthy()
+                with self._condition:
+                    self._resetting -= 1
+                    if not healthy:
+                        self._counters["failed_health_checks"] += 1
+                        self._counters["recycled"] += 1
+                    self._condition.notify_all()
+                if healthy:
+                    self._make_idle(browser)
+                else:
+                    print(f"⚠️ Browser {browser.id} failed its health check; replacing it")
+                    self._quit(browser)
+                    self._replenish()
+    
+    def _quit(self, browser):
+        try:
+            browser.driver_manager.quit_driver()
+        except Exception as e:
+            print(f"⚠️ Failed to quit brokered browser {browser.id}: {e}")
+        finally:
+            self.governor.release(browser.slot)
+
+
+def broker_listening(socket_path):
+    """True if something accepts connections on socket_path."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def wait_for_broker(socket_path, timeout=30):
+    """Block until a broker answers on socket_path; return its stats."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client = BrokerClient(socket_path)
+            try:
+                return client.stats()
+            finally:
+                client.close()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Browser broker did not start on {socket_path} within {timeout}s")
+            time.sleep(0.1)
+
+
+def main():
+    """Run the broker in the foreground until SIGTERM or Ctrl+C."""
+    parser = argparse.ArgumentParser(description="Local browser broker for parallel test workers")
+    parser.add_argument("--socket", default=Config.BROKER_SOCKET)
+    parser.add_argument("--max-browsers", type=int, help="Browsers running at once (default: CPU and RAM based)")
+    parser.add_argument("--warm", type=int, help="Browsers to launch up front (default: --max-browsers)")
+    parser.add_argument("--max-leases", type=int, help="Leases before a browser is replaced")
+    parser.add_argument("--health-interval", type=float, help="Seconds between idle health checks")
+    args = parser.parse_args()
+    
+    broker = BrowserBroker(args.socket, args.max_browsers, args.warm, args.max_leases, args.health_interval).start()
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    try:
+        while not stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Change-based test selection: map changed framework files to the tests that exercise them.
+"""
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from config.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: xdist workers may race when merging the file
+    fcntl = None
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACKED_DIRS = ("pages", "utils", "config")
+TESTS_DIR = "tests"
+SELF_PATH = "utils/change_selection.py"
+
+# Changes to these files can affect any test, so they trigger the full suite
+# (config/config.py holds only class attributes, which a call profile never records)
+RUN_ALL_FILES = ("tests/conftest.py", "pytest.ini", "requirements.txt", "config/config.py")
+
+
+class DependencyRecorder:
+    """Record which framework files and functions each test calls, via sys.setprofile."""
+    
+    def __init__(self):
+        self._tracked = {}
+        self._calls = set()
+        self.dependencies = {}
+    
+    def start(self):
+        """Start recording calls for a new test."""
+        self._calls = set()
+        sys.setprofile(self._profile)
+    
+    def stop(self, nodeid):
+        """Stop recording and store the calls made by the test."""
+        sys.setprofile(None)
+        files = sorted({path for path, _ in self._calls})
+        methods = sorted(f"{path}::{qualname}" for path, qualname in self._calls)
+        self.dependencies[nodeid] = {"files": files, "methods": methods}
+    
+    def _profile(self, frame, event, arg):
+        if event != "call":
+            return
+        code = frame.f_code
+        path = self._tracked.get(code.co_filename)
+        if path is None:
+            path = self._tracked[code.co_filename] = _tracked_path(code.co_filename) or ""
+        if path:
+            self._calls.add((path, getattr(code, "co_qualname", code.co_name)))
+    
+    def save(self, path=None):
+        """Merge the recorded dependencies into the dependency file (safe across xdist workers)."""
+        if not self.dependencies:
+            return
+        path = path or Config.TEST_DEPS_FILE
+        with open(path, "a+", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                existing = json.loads(f.read() or "{}")
+            except ValueError:
+                existing = {}
+            existing.update(self.dependencies)
+            f.seek(0)
+            f.truncate()
+            json.dump(existing, f, indent=2, sort_keys=True)
+
+
+def _tracked_path(filename):
+    """Return the repo-relative path of a file in a tracked directory, else None."""
+    relative = os.path.relpath(os.path.abspath(filename), ROOT_DIR)
+    relative = relative.replace(os.sep, "/")
+    if relative.split("/")[0] in TRACKED_DIRS and relative.endswith(".py") and relative != SELF_PATH:
+        return relative
+    return None
+
+
+def load_dependencies(path=None):
+    """Load recorded per-test dependencies (nodeid -> {"files": [...], "methods": [...]})."""
+    path = path or Config.TEST_DEPS_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def changed_files(ref):
+    """Return repo-relative paths changed between a git ref and the working tree."""
+    output = subprocess.run(
+        ["git", "diff", "--name-only", ref], cwd=ROOT_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    return [line.strip() for line in output.splitlines() if line.strip()]
+
+
+def changed_functions(ref, path):
+    """Return qualnames of functions whose lines changed, or None if module-level code changed."""
+    diff = subprocess.run(
+        ["git", "diff", "-U0", ref, "--", path], cwd=ROOT_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    lines = set()
+    for match in re.finditer(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", diff, re.MULTILINE):
+        start, count = int(match.group(1)), int(match.group(2) or 1)
+        # A pure deletion (count 0) still touches the line it was removed at
+        lines.update(range(start, start + max(count, 1)))
+    
+    try:
+        with open(os.path.join(ROOT_DIR, path), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError):
+        return None
+    
+    spans = []
+    
+    def collect(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    first_line = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                    spans.append((first_line, child.end_lineno, qualname))
+                collect(child, f"{qualname}.")
+    
+    collect(tree, "")
+    functions = set()
+    for line in lines:
+        owners = [qualname for start, end, qualname in spans if start <= line <= end]
+        if not owners:
+            return None
+        functions.add(max(owners, key=len))
+    return functions
+
+
+def static_dependencies(test_path):
+    """Return the tracked files a test module imports, directly or transitively."""
+    seen = set()
+    pending = [test_path]
+    while pending:
+        path = pending.pop()
+        try:
+            with open(os.path.join(ROOT_DIR, path), encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                modules = [node.module]
+            elif isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            else:
+                continue
+            for module in modules:
+                candidate = module.replace(".", "/") + ".py"
+                if candidate.split("/")[0] in TRACKED_DIRS and candidate not in seen:
+                    if os.path.exists(os.path.join(ROOT_DIR, candidate)):
+                        seen.add(candidate)
+                        pending.append(candidate)
+    return seen
+
+
+def list_test_modules():
+    """Return repo-relative paths of all test modules."""
+    tests_dir = os.path.join(ROOT_DIR, TESTS_DIR)
+    return sorted(
+        f"{TESTS_DIR}/{name}" for name in os.listdir(tests_dir)
+        if name.startswith("test_") and name.endswith(".py")
+    )
+
+
+def _method_matches(recorded, changed):
+    """Match a recorded qualname against a changed one (co_name only before Python 3.11)."""
+    return recorded == changed or changed.endswith(f".{recorded}")
+
+
+def select_tests(ref, dependencies=None):
+    """Return the pytest node ids / test files to run for changes since ref.
+    
+    Returns None when the full suite must run, or a sorted (possibly empty) list.
+    Tests with recorded coverage are selected at method granularity; test modules
+    without any recorded coverage fall back to static import analysis. A changed
+    file no recording lists (e.g. one holding only data, whose use a call profile
+    cannot see) falls back to static import analysis for every module.
+    """
+    dependencies = load_dependencies() if dependencies is None else dependencies
+    modules = list_test_modules()
+    recorded_modules = {nodeid.split("::")[0] for nodeid in dependencies}
+    selected = set()
+    
+    for path in changed_files(ref):
+        if path in RUN_ALL_FILES:
+            print(f"🔁 {path} changed, running the full suite")
+            return None
+        if path in modules:
+            selected.add(path)
+            continue
+        if path.split("/")[0] not in TRACKED_DIRS or not path.endswith(".py"):
+            continue
+        
+        functions = changed_functions(ref, path) if os.path.exists(os.path.join(ROOT_DIR, path)) else None
+        recorded = False
+        for nodeid, deps in dependencies.items():
+            if path not in deps["files"]:
+                continue
+            recorded = True
+            if functions is None:
+                selected.add(nodeid)
+                continue
+            called = [method.split("::", 1)[1] for method in deps["methods"] if method.startswith(f"{path}::")]
+            if any(_method_matches(recorded, changed) for recorded in called for changed in functions):
+                selected.add(nodeid)
+        
+        for module in modules:
+            if (not recorded or module not in recorded_modules) and path in static_dependencies(module):
+                selected.add(module)
+    
+    # Drop node ids of deleted modules or already covered by a whole-module selection
+    return sorted(
+        item for item in selected
+        if "::" not in item or item.split("::")[0] in modules and item.split("::")[0] not in selected
+    )
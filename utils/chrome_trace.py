@@ -0,0 +1,96 @@
+"""
+Chrome tracing capture for slow steps and tests.
+
+ChromeDriver records a DevTools trace when perfLoggingPrefs.traceCategories is
+set and hands the events out as "Tracing.dataCollected" entries each time the
+performance log is read. Draining the log before and after a step therefore
+brackets exactly that step's trace events.
+"""
+import contextlib
+import gzip
+import json
+import os
+import re
+import time
+
+
+class TraceFile:
+    """Stream trace events into a gzipped JSON file readable by chrome://tracing and Perfetto."""
+    
+    def __init__(self, path):
+        self.path = path
+        self.event_count = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write('{"traceEvents": [\n')
+    
+    def write_events(self, events):
+        """Append a chunk of trace events."""
+        for event in events:
+            self._file.write((",\n" if self.event_count else "") + json.dumps(event))
+            self.event_count += 1
+    
+    def close(self):
+        """Close the JSON document and the file."""
+        if not self._file.closed:
+            self._file.write("\n]}\n")
+            self._file.close()
+        return self.path
+
+
+class ChromeTracer:
+    """Capture Chrome trace events for a named span and keep the trace only when it was slow.
+    
+    Registered as a DriverFactory performance log listener. Nested spans are
+    folded into the outermost one, so a slow page-object method that calls
+    other methods produces a single trace.
+    """
+    
+    def __init__(self, driver_manager, budgets_ms, trace_dir="reports/traces"):
+        self.driver_manager = driver_manager
+        self.budgets_ms = budgets_ms
+        self.trace_dir = trace_dir
+        self.kept = []
+        self._trace_file = None
+    
+    def handle(self, method, params):
+        """Forward trace chunks from the performance log to the active trace file."""
+        if method == "Tracing.dataCollected" and self._trace_file is not None:
+            self._trace_file.write_events(params.get("value", []))
+    
+    def budget_for(self, name):
+        """Return the latency budget (ms) for a step name."""
+        return self.budgets_ms.get(name, self.budgets_ms.get("default", 0))
+    
+    @contextlib.contextmanager
+    def trace(self, name, budget_ms=None):
+        """Trace the enclosed code; keep the .json.gz if it took longer than the budget.
+        
+        Yields a dict that receives the kept trace path under "trace".
+        """
+        result = {"trace": None}
+        if self._trace_file is not None:
+            yield result
+            return
+        
+        budget_ms = self.budget_for(name) if budget_ms is None else budget_ms
+        # Flush events from before the span so they do not land in its file
+        self.driver_manager.read_performance_log()
+        filename = re.sub(r"[^\w.-]+", "_", name) + f"_{int(time.time() * 1000)}.json.gz"
+        self._trace_file = TraceFile(os.path.join(self.trace_dir, filename))
+        started = time.perf_counter()
+        try:
+            yield result
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.driver_manager.read_performance_log()
+            path = self._trace_file.close()
+            self._trace_file = None
+            if elapsed_ms > budget_ms:
+                self.kept.append(path)
+                result["trace"] = path
+                print(f"🧭 {name} took {elapsed_ms:.0f}ms (budget {budget_ms}ms), trace saved: {path}")
+            else:
+                os.remove(path)
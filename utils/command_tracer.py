@@ -0,0 +1,154 @@
+"""
+WebDriver command tracing and round-trip accounting per test.
+"""
+import json
+import os
+import re
+import time
+import allure
+from allure_commons.types import AttachmentType
+
+
+class CommandTracer:
+    """Record every WebDriver command a driver sends, plus time spent in time.sleep.
+    
+    Wraps the driver's command executor, so every page object, helper and test
+    is covered without changes. Wall-clock time of a traced test is split into
+    time in WebDriver, time sleeping and the remaining time in Python.
+    """
+    
+    # Upper bounds (ms) of the per-command latency histogram buckets
+    HISTOGRAM_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.commands = []
+        self.test_name = None
+        self.sleep_time = 0.0
+        self._started = None
+        self._wall_time = 0.0
+        self._original_execute = None
+        self._original_sleep = None
+    
+    def start(self, test_name):
+        """Start tracing commands and sleeps for a test."""
+        self.test_name = test_name
+        self.commands = []
+        self.sleep_time = 0.0
+        
+        executor = self.driver.command_executor
+        self._original_execute = executor.execute
+        executor.execute = self._traced_execute
+        
+        self._original_sleep = time.sleep
+        time.sleep = self._traced_sleep
+        
+        self._started = time.perf_counter()
+        return self
+    
+    def stop(self):
+        """Stop tracing and return the test summary."""
+        self._wall_time = time.perf_counter() - self._started
+        if self._original_sleep is not None:
+            time.sleep = self._original_sleep
+            self._original_sleep = None
+        if self._original_execute is not None:
+            # Remove the instance attribute so the class method is used again
+            del self.driver.command_executor.execute
+            self._original_execute = None
+        return self.summary()
+    
+    def _traced_execute(self, command, params):
+        # The executor strips URL parameters from params, so read the locator first
+        locator = None
+        if isinstance(params, dict) and "using" in params:
+            locator = f"{params['using']}={params.get('value')}"
+        
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            response = self._original_execute(command, params)
+            outcome = self._outcome(response)
+            return response
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            self.commands.append({
+                "command": command,
+                "locator": locator,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "outcome": outcome,
+            })
+    
+    def _traced_sleep(self, seconds):
+        started = time.perf_counter()
+        try:
+            self._original_sleep(seconds)
+        finally:
+            self.sleep_time += time.perf_counter() - started
+    
+    @staticmethod
+    def _outcome(response):
+        """Classify a raw executor response as "ok" or the W3C error name."""
+        if not isinstance(response, dict):
+            return "ok"
+        value = response.get("value")
+        if isinstance(value, dict) and value.get("error"):
+            return value["error"]
+        status = response.get("status")
+        if isinstance(status, int) and status >= 400:
+            return f"http {status}"
+        return "ok"
+    
+    def histogram(self):
+        """Return per-command-type counts, totals, errors and latency buckets."""
+        by_command = {}
+        for record in self.commands:
+            stats = by_command.setdefault(record["command"], {
+                "count": 0,
+                "total_ms": 0.0,
+                "errors": 0,
+                "buckets": dict({f"<={bound}ms": 0 for bound in self.HISTOGRAM_BUCKETS_MS}, slower=0),
+            })
+            stats["count"] += 1
+            stats["total_ms"] = round(stats["total_ms"] + record["duration_ms"], 3)
+            stats["errors"] += record["outcome"] != "ok"
+            bucket = next((f"<={bound}ms" for bound in self.HISTOGRAM_BUCKETS_MS
+                           if record["duration_ms"] <= bound), "slower")
+            stats["buckets"][bucket] += 1
+        return by_command
+    
+    def summary(self):
+        """Return the per-test accounting of commands and time."""
+        webdriver_time = sum(record["duration_ms"] for record in self.commands) / 1000
+        return {
+            "test": self.test_name,
+            "total_commands": len(self.commands),
+            "wall_s": round(self._wall_time, 3),
+            "webdriver_s": round(webdriver_time, 3),
+            "sleep_s": round(self.sleep_time, 3),
+            "python_s": round(max(0.0, self._wall_time - webdriver_time - self.sleep_time), 3),
+            "by_command": self.histogram(),
+            "slowest": sorted(self.commands, key=lambda record: -record["duration_ms"])[:10],
+        }
+    
+    def write_report(self, report_dir="reports/command_traces", attach_to_allure=True):
+        """Write the summary and full command log to JSON and attach the summary to Allure."""
+        summary = self.summary()
+        os.makedirs(report_dir, exist_ok=True)
+        filename = re.sub(r"[^\w.-]+", "_", self.test_name or "test") + ".json"
+        filepath = os.path.join(report_dir, filename)
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(dict(summary, commands=self.commands), f, indent=2)
+        
+        print(f"🛰️ WebDriver: {summary['total_commands']} commands, {summary['webdriver_s']}s in WebDriver, "
+              f"{summary['sleep_s']}s sleeping, {summary['python_s']}s in Python")
+        
+        if attach_to_allure:
+            try:
+                allure.attach(json.dumps(summary, indent=2), name="WebDriver command trace",
+                              attachment_type=AttachmentType.JSON)
+            except Exception as e:
+                print(f"⚠️ Failed to attach command trace to Allure: {e}")
+        return filepath
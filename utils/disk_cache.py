@@ -0,0 +1,120 @@
+"""
+Shared, size-bounded Chrome HTTP disk cache and cache hit-rate accounting.
+
+Chrome's disk cache belongs to one browser process at a time, so the cache
+root is split into shards and every session locks a free shard for its
+lifetime. Sessions that run one after another (a pytest-xdist worker) reuse
+the same warm shard, while concurrent sessions never share one.
+"""
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to one shard per process
+    fcntl = None
+
+
+class DiskCache:
+    """Hand out locked cache shards under a common root."""
+    
+    def __init__(self, root=".chrome_cache", size_mb=512, max_shards=64):
+        self.root = os.path.abspath(root)
+        self.size_mb = size_mb
+        self.max_shards = max_shards
+    
+    def shard_path(self, index):
+        return os.path.join(self.root, f"shard-{index}")
+    
+    def acquire(self):
+        """Lock the first free shard; return (path, lock) and keep the lock until release."""
+        if fcntl is None:
+            return self.shard_path(f"pid{os.getpid()}"), None
+        for index in range(self.max_shards):
+            path, lock = self._try_lock(index)
+            if lock is not None:
+                return path, lock
+        raise RuntimeError(f"All {self.max_shards} disk cache shards under {self.root} are in use")
+    
+    @staticmethod
+    def release(lock):
+        """Release a shard once its browser has quit."""
+        if lock is not None:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+            lock.close()
+    
+    def chrome_arguments(self, path):
+        """Return the Chrome switches that put the HTTP cache in a shard, bounded in size."""
+        return [f"--disk-cache-dir={path}", f"--disk-cache-size={self.size_mb * 1024 * 1024}"]
+    
+    def seed_shards(self, count, source_index=0):
+        """Copy a warmed shard into shards 1..count-1 (skipping shards in use)."""
+        source = self.shard_path(source_index)
+        seeded = 0
+        for index in range(count):
+            if index == source_index:
+                continue
+            path, lock = self._try_lock(index)
+            if lock is None:
+                continue
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+                shutil.copytree(source, path)
+                seeded += 1
+            finally:
+                self.release(lock)
+        return seeded
+    
+    def _try_lock(self, index):
+        """Return (path, lock) for a shard, with lock None if it is in use."""
+        if fcntl is None:
+            return self.shard_path(index), None
+        os.makedirs(self.root, exist_ok=True)
+        lock = open(f"{self.shard_path(index)}.lock", "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return self.shard_path(index), None
+        return self.shard_path(index), lock
+
+
+class CacheStats:
+    """Count where HTTP responses came from, fed by the DriverFactory performance log."""
+    
+    def __init__(self):
+        self.sources = {"disk": 0, "memory": 0, "service-worker": 0, "network": 0}
+        self._from_memory = set()
+    
+    def handle(self, method, params):
+        """Consume one CDP Network event."""
+        if method == "Network.requestServedFromCache":
+            self._from_memory.add(params["requestId"])
+        elif method == "Network.responseReceived":
+            response = params["response"]
+            if not response.get("url", "").startswith("http"):
+                return
+            if params["requestId"] in self._from_memory:
+                self._from_memory.discard(params["requestId"])
+                source = "memory"
+            elif response.get("fromServiceWorker"):
+                source = "service-worker"
+            elif response.get("fromDiskCache"):
+                source = "disk"
+            else:
+                source = "network"
+            self.sources[source] += 1
+    
+    @property
+    def total(self):
+        return sum(self.sources.values())
+    
+    @property
+    def hit_rate(self):
+        """Fraction of responses served without going to the network."""
+        return (self.total - self.sources["network"]) / self.total if self.total else 0.0
+    
+    def summary(self):
+        return (f"{self.hit_rate * 100:.0f}% of {self.total} responses from cache "
+                f"(disk {self.sources['disk']}, memory {self.sources['memory']}, "
+                f"service worker {self.sources['service-worker']}, network {self.sources['network']})")
@@ -1,11 +1,24 @@
 """
 WebDriver setup and teardown utilities.
 """
+import json
+import os
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from config.config import Config
+from config.devices import get_device
+from utils.web_vitals import OBSERVER_SCRIPT
+from utils.memory_sampler import MemorySampler
+from utils.chrome_trace import ChromeTracer
+from utils.modal_dismisser import dismiss_script, COUNTER_SCRIPT, PROBE_SCRIPT
+from utils.video_readiness import MONITOR_SCRIPT, WAIT_FOR_PLAYBACK_SCRIPT
+from utils.warm_state import capture_warm_state, load_warm_state, seed_script
+from utils.profile_template import ProfileTemplate
+from utils.disk_cache import DiskCache, CacheStats
+from utils.browser_broker import BrokerClient, AttachedDriver
 
 
 class DriverFactory:
@@ -14,18 +27,49 @@ class DriverFactory:
     def __init__(self):
         self.config = Config()
         self.driver = None
+        self.device = None
+        # Objects with a handle(method, params) method, fed by read_performance_log
+        self.performance_log_listeners = []
+        self.memory_sampler = None
+        self.chrome_tracer = None
+        self.modal_dismisser_installed = False
+        self.video_metrics = None
+        self.profile_dir = None
+        self.cache_shard = None
+        self.cache_stats = None
+        self._cache_lock = None
+        self.startup_scripts = []
+        self.warm_state = None
+        self.broker = None
+        self.broker_lease = None
     
-    def setup_driver(self):
-        """Set up Chrome WebDriver with mobile emulation."""
+    def setup_driver(self, user_data_dir=None, device=None):
+        """Set up Chrome WebDriver emulating a device profile (default: Config.DEVICE)."""
+        self.device = get_device(device or self.config.DEVICE)
+        
+        # Lease a warm browser from the broker daemon instead of launching one
+        if user_data_dir is None and self.config.BROWSER_BROKER:
+            return self.attach_to_broker()
+        
         chrome_options = Options()
         
-        # Mobile emulation settings
-        if self.config.MOBILE_EMULATION:
-            chrome_options.add_experimental_option("mobileEmulation", self.config.MOBILE_EMULATION)
-            print("✅ Mobile emulation enabled")
-        else:
-            # Only apply window-size if mobile emulation is not active
-            chrome_options.add_argument("--window-size=1920,1080")
+        # Private clone of the prepared profile template, unless a profile is given
+        if user_data_dir is None and self.config.PROFILE_TEMPLATE:
+            user_data_dir = self.profile_dir = self.clone_profile_template()
+        if user_data_dir:
+            chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+            chrome_options.add_argument("--no-first-run")
+            chrome_options.add_argument("--no-default-browser-check")
+        
+        # HTTP cache in a shard this session holds exclusively until quit
+        if self.config.DISK_CACHE:
+            cache = DiskCache(self.config.DISK_CACHE_DIR, self.config.DISK_CACHE_MB)
+            self.cache_shard, self._cache_lock = cache.acquire()
+            for argument in cache.chrome_arguments(self.cache_shard):
+                chrome_options.add_argument(argument)
+        
+        # The device's viewport is emulated per tab once the browser is up (apply_device)
+        chrome_options.add_argument("--window-size={},{}".format(*self._window_size()))
         
         # Add headless mode if specified
         if self.config.HEADLESS:
@@ -44,6 +88,14 @@ class DriverFactory:
         chrome_options.add_argument("--ignore-ssl-errors")
         chrome_options.add_argument("--ignore-certificate-errors-spki-list")
         
+        # DevTools events in the performance log (HAR export, Chrome tracing)
+        if self.performance_log_enabled():
+            perf_logging_prefs = {"enableNetwork": self.config.CAPTURE_HAR or self.config.DISK_CACHE, "enablePage": False}
+            if self.config.CHROME_TRACE != "off":
+                perf_logging_prefs["traceCategories"] = self.config.TRACE_CATEGORIES
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            chrome_options.add_experimental_option("perfLoggingPrefs", perf_logging_prefs)
+        
         # Set up ChromeDriver with robust executable detection
         import os
         import glob
@@ -95,7 +147,7 @@ class DriverFactory:
                         'THIRD_PARTY_NOTICES' not in file_path):
                         print(f"✅ Found ChromeDriver via glob: {file_path}")
                         return file_path
-                        
+            
             except Exception as e:
                 print(f"⚠️ ChromeDriverManager failed: {e}")
             
@@ -126,23 +178,277 @@ class DriverFactory:
         # Set timeouts
         self.driver.implicitly_wait(self.config.IMPLICIT_WAIT)
         self.driver.set_page_load_timeout(self.config.PAGE_LOAD_TIMEOUT)
+        # Async scripts must outlive the longest in-page wait (video playback)
+        self.driver.set_script_timeout(self.config.VIDEO_LOAD_TIMEOUT + 10)
+        
+        # Viewport, user agent and touch before the first navigation
+        self.apply_device()
+        
+        # Performance observers must be in place before the first paint
+        if self.config.COLLECT_WEB_VITALS:
+            self.add_startup_script(OBSERVER_SCRIPT)
         
+        # Media events from first frame on feed time-to-first-frame and rebuffer metrics
+        self.add_startup_script(MONITOR_SCRIPT)
+        
+        # Modals are dismissed in the page as soon as they appear
+        if self.config.AUTO_DISMISS_MODALS:
+            self.modal_dismisser_installed = self.add_startup_script(
+                dismiss_script(self.config.MODAL_DISMISS_SELECTORS)
+            )
+        
+        # Start warm: restore cookies and storage captured after first-visit UI
+        if self.config.WARM_STATE:
+            self.restore_saved_warm_state()
+        
+        self._add_session_listeners()
         print("✅ WebDriver setup completed")
         return self.driver
     
+    def _add_session_listeners(self):
+        """Attach the per-session memory sampler and performance log listeners."""
+        if self.config.SAMPLE_MEMORY:
+            self.memory_sampler = MemorySampler(self.driver, self.config.MEMORY_LEAK_SLOPES).enable()
+        
+        if self.config.DISK_CACHE:
+            self.cache_stats = self.add_performance_log_listener(CacheStats())
+        
+        if self.config.CHROME_TRACE != "off":
+            self.chrome_tracer = self.add_performance_log_listener(
+                ChromeTracer(self, self.config.STEP_BUDGETS_MS, self.config.TRACE_DIR)
+            )
+    
+    def attach_to_broker(self):
+        """Lease a warm browser from the broker daemon (BROWSER_BROKER) and drive it remotely."""
+        started = time.perf_counter()
+        self.broker = BrokerClient(self.config.BROWSER_BROKER)
+        try:
+            self.broker_lease = self.broker.acquire(self.config.BROKER_ACQUIRE_TIMEOUT)
+        except Exception:
+            self.broker.close()
+            self.broker = None
+            raise
+        lease = self.broker_lease
+        self.driver = AttachedDriver(lease["executor_url"], lease["session_id"], lease["capabilities"])
+        self.modal_dismisser_installed = lease["modal_dismisser"]
+        self.cache_shard = lease["cache_shard"]
+        self.apply_device()
+        # Drop events left over from before the lease so listeners only see this session's
+        if self.performance_log_enabled():
+            self.driver.get_log("performance")
+        self._add_session_listeners()
+        print(f"✅ Leased browser {lease['browser']} from broker in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return self.driver
+    
+    def apply_device(self, device=None):
+        """Emulate a device profile in the current tab through Chrome DevTools.
+        
+        Overrides are per tab, so sessions sharing one browser (or one broker)
+        can each emulate a different device.
+        """
+        if device is not None:
+            self.device = get_device(device)
+        device = self.device
+        if device["mobile"]:
+            self.driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+                "width": device["width"],
+                "height": device["height"],
+                "deviceScaleFactor": device["pixel_ratio"],
+                "mobile": True,
+                "screenWidth": device["width"],
+                "screenHeight": device["height"],
+            })
+        else:
+            self.driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+            self.driver.set_window_size(*self._window_size())
+        if device["user_agent"]:
+            self.driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {
+                "userAgent": device["user_agent"], "platform": device["platform"]
+            })
+        if device["touch"]:
+            self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": True, "maxTouchPoints": 5})
+            self.driver.execute_cdp_cmd("Emulation.setEmitTouchEventsForMouse", {"enabled": True, "configuration": "mobile"})
+        else:
+            self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+        print(f"✅ Emulating {device['name']} ({'x'.join(map(str, self._window_size()))})")
+    
+    def _window_size(self):
+        """Return the device's (width, height); the "desktop" profile uses Config.WINDOW_SIZE."""
+        if self.device["width"]:
+            return self.device["width"], self.device["height"]
+        width, height = self.config.WINDOW_SIZE.split(",")
+        return int(width), int(height)
+    
+    def reset_session(self):
+        """Return a reused browser to a clean state before its next lease.
+        
+        Opens a fresh tab (new sessionStorage, no in-page state) and closes the
+        others, clears cookies and site storage for the Twitch origin, then
+        re-registers the startup scripts and the warm state. The HTTP cache is
+        kept on purpose.
+        """
+        old_handles = self.driver.window_handles
+        self.driver.switch_to.new_window("tab")
+        fresh_handle = self.driver.current_window_handle
+        for handle in old_handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(fresh_handle)
+        
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+            "origin": self.config.TWITCH_URL,
+            "storageTypes": "local_storage,indexeddb,websql,service_workers,cache_storage",
+        })
+        # Startup scripts belong to a tab, so the new one needs them again
+        scripts, self.startup_scripts = self.startup_scripts, []
+        for source in scripts:
+            self.add_startup_script(source)
+        if self.warm_state and self.warm_state["cookies"]:
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": self.warm_state["cookies"]})
+        elif self.config.WARM_STATE and not self.warm_state:
+            # The state may have been captured after this browser started
+            self.restore_saved_warm_state()
+        
+        if self.performance_log_enabled():
+            self.driver.get_log("performance")
+        self.video_metrics = None
+    
+    def add_startup_script(self, source):
+        """Run a script in every new document before the page's own scripts (Chrome DevTools)."""
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+            self.startup_scripts.append(source)
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not register startup script: {e}")
+            return False
+    
+    def capture_warm_state(self):
+        """Open Twitch, get past first-visit UI and return the session's cookies and storage."""
+        self.navigate_to_twitch()
+        self.wait_for_page_load()
+        time.sleep(self.config.WARM_STATE_SETTLE)
+        self.handle_modal_popup()
+        state = capture_warm_state(self.driver)
+        print(f"✅ Captured warm state: {len(state['cookies'])} cookies, "
+              f"{len(state['local_storage'])} localStorage keys, {len(state['indexeddb'])} IndexedDB databases")
+        return state
+    
+    def restore_warm_state(self, state):
+        """Restore a captured state before the first navigation."""
+        try:
+            if state["cookies"]:
+                self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": state["cookies"]})
+        except Exception as e:
+            print(f"⚠️ Could not restore cookies: {e}")
+            return False
+        if not self.add_startup_script(seed_script(state)):
+            return False
+        self.warm_state = state
+        print(f"✅ Restored warm state from {self.config.WARM_STATE_FILE}")
+        return True
+    
+    def restore_saved_warm_state(self):
+        """Restore the cached warm state if a fresh one exists."""
+        state = load_warm_state(self.config.WARM_STATE_FILE, self.config.WARM_STATE_MAX_AGE_HOURS * 3600)
+        return self.restore_warm_state(state) if state else False
+    
+    def browser_pid(self):
+        """Return the pid of this session's ChromeDriver (parent of the Chrome processes), or None."""
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        return process.pid if process is not None else None
+    
+    def performance_log_enabled(self):
+        """Return True when a feature needs Chrome's performance log."""
+        return self.config.CAPTURE_HAR or self.config.DISK_CACHE or self.config.CHROME_TRACE != "off"
+    
+    def add_performance_log_listener(self, listener):
+        """Register an object whose handle(method, params) receives every performance log event."""
+        self.performance_log_listeners.append(listener)
+        return listener
+    
+    def read_performance_log(self):
+        """Drain Chrome's performance log and fan the DevTools events out to the listeners.
+        
+        Chrome buffers the log until it is read, so it is drained on navigation,
+        page loads, page-object clicks, typing, scrolls and waits, during video
+        waits and at teardown to keep that buffer small.
+        """
+        if not self.driver or not self.performance_log_enabled():
+            return 0
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            print(f"⚠️ Could not read performance log: {e}")
+            return 0
+        
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            for listener in self.performance_log_listeners:
+                listener.handle(message["method"], message.get("params", {}))
+        return len(entries)
+    
+    def clone_profile_template(self):
+        """Return a fresh clone of the Chrome profile template, building the template if needed."""
+        template = ProfileTemplate(self.config.PROFILE_ROOT, self.config.PROFILE_TEMPLATE_MAX_AGE_HOURS)
+        template.ensure(self._build_profile_template)
+        removed = template.collect_garbage()
+        if removed:
+            print(f"🧹 Removed {removed} stale profile clone(s)")
+        clone = template.clone()
+        print(f"✅ Cloned profile template ({template.clone_method}): {clone}")
+        return clone
+    
+    @staticmethod
+    def _build_profile_template(template_dir):
+        """Let Chrome initialise a profile: first run, Twitch visit and component updates."""
+        builder = DriverFactory()
+        try:
+            builder.setup_driver(user_data_dir=template_dir)
+            builder.navigate_to_twitch()
+            time.sleep(builder.config.PROFILE_TEMPLATE_SETTLE)
+        finally:
+            builder.quit_driver()
+    
     def quit_driver(self):
         """Quit the WebDriver instance."""
+        if self.driver and self.cache_stats is not None:
+            self.read_performance_log()
+            print(f"💾 HTTP cache ({os.path.basename(self.cache_shard)}): {self.cache_stats.summary()}")
+        if self.broker is not None:
+            # The broker owns the browser; hand it back for reuse
+            try:
+                self.broker.release(self.broker_lease["lease"])
+                print(f"✅ Returned browser {self.broker_lease['browser']} to broker")
+            except Exception as e:
+                print(f"⚠️ Could not return browser to broker: {e}")
+            self.broker.close()
+            self.broker = self.broker_lease = self.driver = None
+            return
         if self.driver:
             self.driver.quit()
             self.driver = None
             print("✅ WebDriver closed")
+        if self.profile_dir:
+            ProfileTemplate.remove_clone(self.profile_dir)
+            self.profile_dir = None
+        if self._cache_lock is not None:
+            DiskCache.release(self._cache_lock)
+            self._cache_lock = None
     
     def navigate_to_twitch(self):
         """Navigate to Twitch homepage."""
         if not self.driver:
             self.setup_driver()
         
-        self.driver.get(self.config.TWITCH_URL)
+        if self.config.CHROME_TRACE == "steps":
+            with self.chrome_tracer.trace("DriverFactory.navigate_to_twitch"):
+                self.driver.get(self.config.TWITCH_URL)
+        else:
+            self.read_performance_log()
+            self.driver.get(self.config.TWITCH_URL)
         print(f"✅ Navigated to {self.config.TWITCH_URL}")
     
     def take_screenshot(self, filename):
@@ -162,16 +468,35 @@ class DriverFactory:
     
     def handle_modal_popup(self):
         """Handle any modal popups that appear."""
+        # Common modal close selectors
+        modal_selectors = [
+            "button[aria-label='Close']",
+            ".modal-close-button",
+            "[data-a-target='player-overlay-click-handler']",
+            "button[class*='close']",
+            "button[class*='dismiss']"
+        ]
+        
+        if self.modal_dismisser_installed:
+            # The in-page dismisser already closed the known modals; read its counter
+            dismissals = self.modal_dismissals()
+            if dismissals is not None:
+                if dismissals["count"]:
+                    print(f"✅ {dismissals['count']} modal popup(s) auto-dismissed: {', '.join(dismissals['selectors'])}")
+                    return True
+                # Generic close buttons are only probed on request, in one round trip
+                try:
+                    selector = self.driver.execute_script(PROBE_SCRIPT, modal_selectors)
+                except Exception as e:
+                    print(f"⚠️ Error handling modal popup: {e}")
+                    return False
+                if selector:
+                    print(f"✅ Closed modal popup with selector: {selector}")
+                    return True
+                print("ℹ️ No modal popups found to close")
+                return False
+        
         try:
-            # Common modal close selectors
-            modal_selectors = [
-                "button[aria-label='Close']",
-                ".modal-close-button",
-                "[data-a-target='player-overlay-click-handler']",
-                "button[class*='close']",
-                "button[class*='dismiss']"
-            ]
-            
             for selector in modal_selectors:
                 try:
                     modal_element = self.driver.find_element("css selector", selector)
@@ -184,11 +509,19 @@ class DriverFactory:
             
             print("ℹ️ No modal popups found to close")
             return False
-            
+        
         except Exception as e:
             print(f"⚠️ Error handling modal popup: {e}")
             return False
     
+    def modal_dismissals(self):
+        """Return {"count", "selectors"} from the in-page dismisser, or None if it is not active."""
+        try:
+            return self.driver.execute_script(COUNTER_SCRIPT)
+        except Exception as e:
+            print(f"⚠️ Could not read modal dismissal counter: {e}")
+            return None
+    
     def scroll_page(self, times=1):
         """Scroll the page down a specified number of times."""
         for i in range(times):
@@ -199,8 +532,30 @@ class DriverFactory:
         """Wait for page to load completely."""
         import time
         time.sleep(2)  # Basic wait for page load
+        self.read_performance_log()
     
-    def wait_for_video_load(self):
-        """Wait for video content to load."""
-        import time
-        time.sleep(3)  # Wait for video content
+    def wait_for_video_load(self, timeout=None):
+        """Wait until video playback has really started and return its metrics.
+        
+        Returns as soon as the video is playing with currentTime advancing, with
+        time-to-first-frame and rebuffer figures, or None if the wait failed.
+        """
+        timeout = timeout or self.config.VIDEO_LOAD_TIMEOUT
+        try:
+            metrics = json.loads(self.driver.execute_async_script(
+                WAIT_FOR_PLAYBACK_SCRIPT, timeout * 1000, self.config.VIDEO_APPEAR_TIMEOUT * 1000
+            ))
+            metrics = {key: round(value, 1) if isinstance(value, float) else value for key, value in metrics.items()}
+        except Exception as e:
+            print(f"⚠️ Could not wait for video playback: {e}")
+            metrics = None
+        
+        if metrics and metrics["ready"]:
+            print(f"🎬 Video playing after {metrics['waited_ms']}ms "
+                  f"(TTFF {metrics['ttff_ms']}ms, {metrics['rebuffer_count']} rebuffers)")
+        elif metrics:
+            print(f"⚠️ Video not playing after {metrics['waited_ms']}ms "
+                  f"(video found: {metrics['has_video']}, readyState: {metrics['ready_state']})")
+        self.read_performance_log()
+        self.video_metrics = metrics
+        return metrics
@@ -0,0 +1,64 @@
+"""
+Duration history and longest-processing-time-first scheduling for parallel runs.
+"""
+import json
+from config.config import Config
+from utils.resource_governor import ResourceGovernor
+
+
+def load_durations(path=None):
+    """Load the persisted per-test duration history (nodeid -> seconds)."""
+    path = path or Config.TEST_DURATIONS_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations, path=None, smoothing=0.5):
+    """Merge this run's durations into the history using an exponential moving average."""
+    path = path or Config.TEST_DURATIONS_FILE
+    history = load_durations(path)
+    for nodeid, seconds in durations.items():
+        previous = history.get(nodeid)
+        history[nodeid] = seconds if previous is None else smoothing * seconds + (1 - smoothing) * previous
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({nodeid: round(seconds, 3) for nodeid, seconds in sorted(history.items())}, f, indent=2)
+    return history
+
+
+def expected_duration(nodeid, history):
+    """Return the expected duration of a test, falling back to the history mean."""
+    if nodeid in history:
+        return history[nodeid]
+    if history:
+        return sum(history.values()) / len(history)
+    return Config.DEFAULT_TEST_DURATION
+
+
+def lpt_schedule(durations, workers):
+    """Assign tests to workers longest-first, each to the currently least-loaded worker.
+    
+    Returns (bins, loads): bins[i] lists the nodeids for worker i in start order.
+    """
+    workers = max(1, workers)
+    bins = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for nodeid, seconds in sorted(durations.items(), key=lambda item: (-item[1], item[0])):
+        target = loads.index(min(loads))
+        bins[target].append(nodeid)
+        loads[target] += seconds
+    return bins, loads
+
+
+def ideal_makespan(durations, workers):
+    """Lower bound on wall-clock time: perfect balance, but never below the longest test."""
+    if not durations:
+        return 0.0
+    return max(sum(durations) / max(1, workers), max(durations))
+
+
+def auto_worker_count(memory_per_browser_mb=None):
+    """Pick a worker count bounded by CPU cores, current load and free RAM per Chrome."""
+    return ResourceGovernor(memory_per_browser_mb).recommended_sessions()
@@ -0,0 +1,164 @@
+"""
+Streaming HAR writer fed by Chrome performance-log (CDP Network) events.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+
+class HarWriter:
+    """Build a HAR file from CDP Network events, writing each entry as soon as it completes.
+    
+    Only requests still in flight are held in memory, so long video pages with
+    thousands of segment requests keep a flat memory profile. Register it with
+    DriverFactory.add_performance_log_listener and call close() at the end.
+    """
+    
+    CREATOR = {"name": "twitch-ui-automation", "version": "1.0"}
+    
+    def __init__(self, path):
+        self.path = path
+        self.entry_count = 0
+        self._pending = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        # Leave the entries array open so entries can be appended one by one
+        self._file.write('{"log": {"version": "1.2", "creator": ' + json.dumps(self.CREATOR)
+                         + ', "pages": [], "entries": [\n')
+    
+    def handle(self, method, params):
+        """Consume one CDP event from the performance log."""
+        if self._file.closed:
+            return
+        if method == "Network.requestWillBeSent":
+            request_id = params["requestId"]
+            if params.get("redirectResponse") and request_id in self._pending:
+                # A redirect completes the previous hop under the same request id
+                pending = self._pending.pop(request_id)
+                pending["response"] = params["redirectResponse"]
+                self._write_entry(pending, params["timestamp"])
+            self._pending[request_id] = {
+                "request": params["request"],
+                "wall_time": params.get("wallTime"),
+                "timestamp": params["timestamp"],
+                "type": params.get("type"),
+                "cache": None,
+            }
+        elif method == "Network.responseReceived":
+            pending = self._pending.get(params["requestId"])
+            if pending:
+                pending["response"] = params["response"]
+        elif method == "Network.requestServedFromCache":
+            pending = self._pending.get(params["requestId"])
+            if pending:
+                pending["cache"] = "memory"
+        elif method == "Network.loadingFinished":
+            pending = self._pending.pop(params["requestId"], None)
+            if pending:
+                pending["encoded_length"] = params.get("encodedDataLength", 0)
+                self._write_entry(pending, params["timestamp"])
+        elif method == "Network.loadingFailed":
+            pending = self._pending.pop(params["requestId"], None)
+            if pending:
+                pending["error"] = params.get("errorText") or "failed"
+                self._write_entry(pending, params["timestamp"])
+    
+    def _write_entry(self, pending, end_timestamp):
+        entry = self._build_entry(pending, end_timestamp)
+        self._file.write((",\n" if self.entry_count else "") + json.dumps(entry))
+        self.entry_count += 1
+    
+    @staticmethod
+    def _cache_status(pending, response):
+        """Return where the response came from: network, disk, memory or service-worker."""
+        if pending.get("cache"):
+            return pending["cache"]
+        if response.get("fromServiceWorker"):
+            return "service-worker"
+        if response.get("fromDiskCache"):
+            return "disk"
+        return "network"
+    
+    @staticmethod
+    def _timings(response, started, end_timestamp):
+        """Convert CDP ResourceTiming offsets into HAR timings (ms, -1 when not applicable)."""
+        timing = response.get("timing")
+        if not timing:
+            return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0,
+                    "wait": 0, "receive": round(max(0.0, (end_timestamp - started) * 1000), 3)}
+        
+        def span(start, end):
+            return round(timing[end] - timing[start], 3) if timing.get(start, -1) >= 0 else -1
+        
+        first_activity = next((timing[key] for key in ("dnsStart", "connectStart", "sendStart")
+                               if timing.get(key, -1) >= 0), 0)
+        headers_end = timing["requestTime"] + timing.get("receiveHeadersEnd", 0) / 1000
+        return {
+            "blocked": round(first_activity, 3),
+            "dns": span("dnsStart", "dnsEnd"),
+            "connect": span("connectStart", "connectEnd"),
+            "ssl": span("sslStart", "sslEnd"),
+            "send": max(0, span("sendStart", "sendEnd")),
+            "wait": round(max(0.0, timing.get("receiveHeadersEnd", 0) - timing.get("sendEnd", 0)), 3),
+            "receive": round(max(0.0, (end_timestamp - headers_end) * 1000), 3),
+        }
+    
+    def _build_entry(self, pending, end_timestamp):
+        request = pending["request"]
+        response = pending.get("response") or {}
+        timings = self._timings(response, pending["timestamp"], end_timestamp)
+        started = datetime.fromtimestamp(pending["wall_time"] or 0, tz=timezone.utc)
+        headers_size = len(response.get("headersText", "")) or -1
+        entry = {
+            "startedDateTime": started.isoformat(),
+            # ssl is already part of connect in HAR timings
+            "time": round(sum(value for phase, value in timings.items() if phase != "ssl" and value > 0), 3),
+            "request": {
+                "method": request.get("method", "GET"),
+                "url": request.get("url", ""),
+                "httpVersion": response.get("protocol", ""),
+                "headers": [{"name": k, "value": str(v)} for k, v in request.get("headers", {}).items()],
+                "queryString": [],
+                "cookies": [],
+                "headersSize": -1,
+                "bodySize": len(request.get("postData", "")),
+            },
+            "response": {
+                "status": response.get("status", 0),
+                "statusText": response.get("statusText", ""),
+                "httpVersion": response.get("protocol", ""),
+                "headers": [{"name": k, "value": str(v)} for k, v in response.get("headers", {}).items()],
+                "cookies": [],
+                "content": {
+                    "size": pending.get("encoded_length", 0),
+                    "mimeType": response.get("mimeType", ""),
+                },
+                "redirectURL": next((value for name, value in response.get("headers", {}).items()
+                                     if name.lower() == "location"), ""),
+                "headersSize": headers_size,
+                "bodySize": pending.get("encoded_length", -1),
+                "_transferSize": response.get("encodedDataLength", pending.get("encoded_length", 0)),
+            },
+            "cache": {},
+            "timings": timings,
+            "serverIPAddress": response.get("remoteIPAddress", ""),
+            "_resourceType": pending.get("type"),
+            "_cacheStatus": self._cache_status(pending, response),
+        }
+        if pending.get("error"):
+            entry["_error"] = pending["error"]
+        return entry
+    
+    def close(self):
+        """Flush requests still in flight as unfinished entries and close the HAR document."""
+        if self._file.closed:
+            return self.path
+        for pending in list(self._pending.values()):
+            pending["error"] = "unfinished"
+            self._write_entry(pending, pending["timestamp"])
+        self._pending.clear()
+        self._file.write("\n]}}\n")
+        self._file.close()
+        return self.path
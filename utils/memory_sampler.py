@@ -0,0 +1,135 @@
+"""
+JS heap, DOM node and layout growth tracking with leak detection.
+"""
+import json
+import os
+import re
+import time
+import allure
+from allure_commons.types import AttachmentType
+
+
+def slope(values):
+    """Return the least-squares slope of values against their sample index."""
+    count = len(values)
+    if count < 2:
+        return 0.0
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    denominator = sum((x - mean_x) ** 2 for x in range(count))
+    return numerator / denominator
+
+
+def harness_rss_mb():
+    """Return the current resident memory of this Python process in MB, or None without /proc.
+    
+    getrusage's ru_maxrss is no substitute: a peak never decreases, so its
+    slope could only ever point at a leak.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MemorySampler:
+    """Sample Chrome's Performance.getMetrics alongside the harness's own memory.
+    
+    Samples are grouped into named series (e.g. "search_scroll", "video_playback")
+    because Chrome's counters reset on navigation. Each metric's growth per sample
+    is fitted by least squares and compared with the configured slope limits, so a
+    leak in the page (JS heap, DOM nodes) can be told apart from one in the harness.
+    """
+    
+    # Chrome metric name -> (report name, scale)
+    CHROME_METRICS = {
+        "JSHeapUsedSize": ("js_heap_mb", 1 / (1024 * 1024)),
+        "Nodes": ("nodes", 1),
+        "LayoutCount": ("layout_count", 1),
+    }
+    
+    def __init__(self, driver, leak_slopes=None, min_samples=5):
+        self.driver = driver
+        self.leak_slopes = leak_slopes or {}
+        self.min_samples = min_samples
+        self.series = {}
+        self._enabled = False
+    
+    def enable(self):
+        """Turn on Chrome's performance metrics collection."""
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+            self._enabled = True
+        except Exception as e:
+            print(f"⚠️ Could not enable performance metrics: {e}")
+        return self
+    
+    def sample(self, series, label=None):
+        """Record one sample in the named series and return it."""
+        record = {"label": label, "time": round(time.time(), 3)}
+        rss_mb = harness_rss_mb()
+        if rss_mb is not None:
+            record["harness_rss_mb"] = round(rss_mb, 2)
+        if self._enabled:
+            try:
+                metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+                values = {metric["name"]: metric["value"] for metric in metrics}
+                for chrome_name, (name, scale) in self.CHROME_METRICS.items():
+                    if chrome_name in values:
+                        record[name] = round(values[chrome_name] * scale, 3)
+            except Exception as e:
+                print(f"⚠️ Could not read performance metrics: {e}")
+        self.series.setdefault(series, []).append(record)
+        return record
+    
+    def trends(self):
+        """Return the per-sample slope of every metric in every series."""
+        trends = {}
+        for series, samples in self.series.items():
+            names = [name for name, _ in self.CHROME_METRICS.values()] + ["harness_rss_mb"]
+            trends[series] = {
+                name: round(slope([sample[name] for sample in samples if name in sample]), 4)
+                for name in names
+                if any(name in sample for sample in samples)
+            }
+        return trends
+    
+    def suspected_leaks(self):
+        """Return human-readable slope violations for series with enough samples."""
+        leaks = []
+        for series, metrics in self.trends().items():
+            if len(self.series[series]) < self.min_samples:
+                continue
+            for name, growth in metrics.items():
+                limit = self.leak_slopes.get(name)
+                if limit is not None and growth > limit:
+                    source = "harness" if name == "harness_rss_mb" else "page"
+                    leaks.append(f"{series}: {name} grows {growth}/sample (limit {limit}, {source})")
+        return leaks
+    
+    def write_report(self, test_name, report_dir="reports/memory", attach_to_allure=True):
+        """Write samples, trends and suspected leaks to JSON and attach them to Allure."""
+        report = {
+            "test": test_name,
+            "trends": self.trends(),
+            "suspected_leaks": self.suspected_leaks(),
+            "series": self.series,
+        }
+        os.makedirs(report_dir, exist_ok=True)
+        filepath = os.path.join(report_dir, re.sub(r"[^\w.-]+", "_", test_name or "test") + ".json")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        
+        for leak in report["suspected_leaks"]:
+            print(f"⚠️ Suspected memory leak: {leak}")
+        
+        if attach_to_allure:
+            try:
+                allure.attach(json.dumps(report, indent=2), name="Memory samples",
+                              attachment_type=AttachmentType.JSON)
+            except Exception as e:
+                print(f"⚠️ Failed to attach memory samples to Allure: {e}")
+        return filepath
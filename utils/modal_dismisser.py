@@ -0,0 +1,78 @@
+"""
+In-browser auto-dismisser for modals, consent banners and mature-content gates.
+"""
+import json
+
+
+# Clicks every visible element matching the selectors as soon as it appears,
+# once per element, and counts the dismissals in window.__modalDismissals.
+# Mutations are batched into one sweep per animation frame, so a page that
+# mutates constantly is queried (and laid out) at most once per frame.
+_DISMISS_SCRIPT = """
+(function (selectors) {
+    if (window.__modalDismissals !== undefined) { return; }
+    window.__modalDismissals = 0;
+    window.__modalDismissed = [];
+    var clicked = new WeakSet();
+    function visible(element) {
+        var rect = element.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(element).visibility !== 'hidden';
+    }
+    function sweep() {
+        selectors.forEach(function (selector) {
+            var matches;
+            try { matches = document.querySelectorAll(selector); } catch (e) { return; }
+            matches.forEach(function (element) {
+                if (clicked.has(element) || !visible(element)) { return; }
+                clicked.add(element);
+                element.click();
+                window.__modalDismissals += 1;
+                window.__modalDismissed.push(selector);
+                if (window.__modalDismissed.length > 50) { window.__modalDismissed.shift(); }
+            });
+        });
+    }
+    var scheduled = false;
+    function scheduleSweep() {
+        if (scheduled) { return; }
+        scheduled = true;
+        requestAnimationFrame(function () {
+            scheduled = false;
+            sweep();
+        });
+    }
+    new MutationObserver(scheduleSweep).observe(document, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style', 'hidden']
+    });
+    document.addEventListener('DOMContentLoaded', sweep);
+})(%s);
+"""
+
+# Clicks the first visible element matching the selectors (arguments[0]), in order,
+# and returns its selector (null if none): an explicit, one-shot probe
+PROBE_SCRIPT = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var matches;
+    try { matches = document.querySelectorAll(selectors[i]); } catch (e) { continue; }
+    for (var j = 0; j < matches.length; j++) {
+        var rect = matches[j].getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0 && getComputedStyle(matches[j]).visibility !== 'hidden') {
+            matches[j].click();
+            return selectors[i];
+        }
+    }
+}
+return null;
+"""
+
+# Reads the counter and the selectors that fired since the page loaded
+COUNTER_SCRIPT = """
+return window.__modalDismissals === undefined ? null
+    : {count: window.__modalDismissals, selectors: window.__modalDismissed.slice()};
+"""
+
+
+def dismiss_script(selectors):
+    """Return the document-start script that dismisses elements matching the selectors."""
+    return _DISMISS_SCRIPT % json.dumps(list(selectors))
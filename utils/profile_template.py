@@ -0,0 +1,161 @@
+"""
+Reusable Chrome profile template with fast per-session clones.
+
+The template is a --user-data-dir that Chrome has already initialised (first
+run done, component updates downloaded, settings written). Each session gets
+its own clone, so parallel sessions stay isolated but skip first-run work.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent workers may each build a template
+    fcntl = None
+
+
+# Chrome's process-singleton files must never be carried over into a clone
+SKIPPED_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+# Component directories Chrome only ever adds new versioned files to (updates
+# land in a new version directory), so hard links to them are safe. Everything
+# else is copied: profiles (SQLite, LevelDB, Preferences), shader caches and
+# Crashpad settings are written in place and would leak between sessions.
+WRITE_ONCE_DIRS = (
+    "AutofillStates", "CertificateRevocation", "ClientSidePhishing", "CookieReadinessList", "Crowd Deny",
+    "FileTypePolicies", "FirstPartySetsPreloaded", "MEIPreload", "MaskedDomainListPreloaded",
+    "OnDeviceHeadSuggestModel", "OriginTrials", "PKIMetadata", "PrivacySandboxAttestationsPreloaded",
+    "SSLErrorAssistant", "SafetyTips", "TpcdMetadata", "TrustTokenKeyCommitments", "WidevineCdm",
+    "ZxcvbnData", "hyphen-data",
+)
+
+READY_MARKER = "template_ready.json"
+
+
+def _ignore_singletons(directory, names):
+    return [name for name in names if name in SKIPPED_FILES]
+
+
+def _copy(source, destination):
+    shutil.copytree(source, destination, symlinks=True, ignore=_ignore_singletons)
+
+
+def _reflink(source, destination):
+    """Copy-on-write clone (btrfs, XFS, APFS); raises when the filesystem can't."""
+    flag = "-c" if sys.platform == "darwin" else "--reflink=always"
+    subprocess.run(["cp", "-a", flag, source, destination], check=True, capture_output=True)
+    for name in SKIPPED_FILES:
+        path = os.path.join(destination, name)
+        if os.path.lexists(path):
+            os.remove(path)
+
+
+def _hardlink(source, destination):
+    """Hard-link write-once component data and copy everything else."""
+    os.makedirs(destination)
+    for entry in os.scandir(source):
+        if entry.name in SKIPPED_FILES or entry.name == READY_MARKER:
+            continue
+        target = os.path.join(destination, entry.name)
+        if entry.is_dir(follow_symlinks=False) and entry.name in WRITE_ONCE_DIRS:
+            shutil.copytree(entry.path, target, symlinks=True, copy_function=os.link, ignore=_ignore_singletons)
+        elif entry.is_dir(follow_symlinks=False):
+            _copy(entry.path, target)
+        else:
+            # Top-level files such as "Local State" are rewritten in place
+            shutil.copy2(entry.path, target, follow_symlinks=False)
+
+
+class ProfileTemplate:
+    """Build a Chrome profile template once and hand out clones of it."""
+    
+    CLONE_METHODS = (("reflink", _reflink), ("hardlink", _hardlink), ("copy", _copy))
+    
+    def __init__(self, root=".chrome_profiles", max_age_hours=24):
+        self.root = os.path.abspath(root)
+        self.template_dir = os.path.join(self.root, "template")
+        self.clones_dir = os.path.join(self.root, "clones")
+        self.max_age_hours = max_age_hours
+        self.clone_method = None
+    
+    def is_ready(self):
+        """Return True when a template younger than max_age_hours exists."""
+        try:
+            with open(os.path.join(self.template_dir, READY_MARKER), encoding="utf-8") as f:
+                built_at = json.load(f)["built_at"]
+        except (OSError, ValueError, KeyError):
+            return False
+        return time.time() - built_at < self.max_age_hours * 3600
+    
+    def ensure(self, build):
+        """Build the template with build(template_dir) unless a fresh one exists."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, "template.lock"), "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            if self.is_ready():
+                return self.template_dir
+            
+            shutil.rmtree(self.template_dir, ignore_errors=True)
+            started = time.perf_counter()
+            build(self.template_dir)
+            with open(os.path.join(self.template_dir, READY_MARKER), "w", encoding="utf-8") as f:
+                json.dump({"built_at": time.time()}, f)
+            print(f"✅ Chrome profile template built in {time.perf_counter() - started:.1f}s: {self.template_dir}")
+        return self.template_dir
+    
+    def clone(self):
+        """Return a new private copy of the template, using the cheapest method available."""
+        os.makedirs(self.clones_dir, exist_ok=True)
+        destination = os.path.join(self.clones_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        methods = self.CLONE_METHODS
+        if self.clone_method:
+            # Skip methods that already failed on this filesystem
+            names = [name for name, _ in methods]
+            methods = methods[names.index(self.clone_method):]
+        
+        for name, method in methods:
+            try:
+                method(self.template_dir, destination)
+                self.clone_method = name
+                return destination
+            except (OSError, subprocess.CalledProcessError, shutil.Error):
+                shutil.rmtree(destination, ignore_errors=True)
+        raise OSError(f"Could not clone Chrome profile template {self.template_dir}")
+    
+    @staticmethod
+    def remove_clone(path):
+        """Delete a clone once its browser has quit."""
+        shutil.rmtree(path, ignore_errors=True)
+    
+    def collect_garbage(self):
+        """Delete clones whose owning process is gone (or whose name carries no pid).
+        
+        A clone's age says nothing about whether it is in use: a long-lived owner
+        such as the browser broker keeps its browsers, and their clones, for hours.
+        """
+        if not os.path.isdir(self.clones_dir):
+            return 0
+        removed = 0
+        for entry in os.scandir(self.clones_dir):
+            pid = entry.name.split("-", 1)[0]
+            if not pid.isdigit() or not _process_alive(int(pid)):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+def _process_alive(pid):
+    """Return True if a process with this pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
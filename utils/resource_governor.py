@@ -0,0 +1,267 @@
+"""
+Resource-aware concurrency governor for browser sessions.
+
+Sessions are admitted from live system state rather than a fixed count: free
+memory (/proc/meminfo), CPU load (/proc/loadavg) and the measured memory of
+the sessions already running (their process trees under /proc). A session
+that does not fit waits until one ends or memory frees up.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from config.config import Config
+
+
+def read_meminfo():
+    """Return /proc/meminfo as {field: MB}, or {} where /proc is unavailable."""
+    fields = {}
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                fields[name] = int(value.split()[0]) // 1024
+    except (OSError, ValueError):
+        pass
+    return fields
+
+
+def available_memory_mb():
+    """Return available system memory in MB from /proc/meminfo, or None if unknown."""
+    return read_meminfo().get("MemAvailable")
+
+
+def load_average():
+    """Return the 1-minute load average, or None if unknown."""
+    try:
+        with open("/proc/loadavg") as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.getloadavg()[0]
+    except (OSError, AttributeError):
+        return None
+
+
+def _children_by_parent():
+    """Map each pid to the pids of its direct children, from /proc/<pid>/stat."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after its closing paren
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    return children
+
+
+def _process_memory_kb(pid):
+    """Proportional set size of a process (shared pages split between sharers), falling back to RSS."""
+    for path, field in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(field):
+                        return int(line.split()[1])
+        except (OSError, ValueError):
+            continue
+    return 0
+
+
+def process_tree_memory_mb(pid, children=None):
+    """Return the memory of a process and all its descendants in MB (None if /proc is unavailable).
+    
+    For a ChromeDriver service this covers the browser, its renderers and GPU process.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children = children if children is not None else _children_by_parent()
+    total_kb, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        total_kb += _process_memory_kb(current)
+        pending.extend(children.get(current, ()))
+    return total_kb / 1024
+
+
+class ResourceGovernor:
+    """Admit browser sessions while memory and CPU allow, and queue the rest.
+    
+    A new session is admitted when free memory, minus a reserve and the growth
+    still expected from sessions that are starting up, covers one more session,
+    and the load average per CPU is below a ceiling. The expected size of a
+    session starts at Config.CHROME_MEMORY_MB and follows the measured process
+    trees of tracked sessions. The first session is always admitted.
+    """
+    
+    def __init__(self, memory_per_session_mb=None, reserve_mb=None, max_load_per_cpu=None,
+                 max_sessions=None, poll_interval=None):
+        config = Config()
+        self.memory_per_session_mb = memory_per_session_mb or config.CHROME_MEMORY_MB
+        self.reserve_mb = reserve_mb if reserve_mb is not None else config.GOVERNOR_RESERVE_MB
+        self.max_load_per_cpu = max_load_per_cpu or config.GOVERNOR_MAX_LOAD_PER_CPU
+        self.max_sessions = max_sessions
+        self.poll_interval = poll_interval or config.GOVERNOR_POLL_INTERVAL
+        self.cpus = os.cpu_count() or 1
+        self._slots = {}  # slot id -> tracked pid (None until the browser is up)
+        self._next_slot = 0
+        self._condition = threading.Condition()
+        self._counters = {"admitted": 0, "queued": 0, "wait_s": 0.0, "peak_sessions": 0}
+        self._measured_mb = {}
+    
+    def capacity(self):
+        """Return how many more sessions could start now."""
+        with self._condition:
+            return self._capacity(self._snapshot())
+    
+    def try_acquire(self):
+        """Return a slot id if a session fits right now, else None."""
+        with self._condition:
+            if self._capacity(self._snapshot()) < 1:
+                return None
+            return self._admit(0.0)
+    
+    def acquire(self, timeout=None):
+        """Block until a session fits, then return its slot id (TimeoutError after timeout seconds)."""
+        started = time.monotonic()
+        queued = False
+        with self._condition:
+            while self._capacity(self._snapshot()) < 1:
+                if not queued:
+                    queued = True
+                    self._counters["queued"] += 1
+                    print(f"⏳ Session queued by resource governor: {self._describe(self._snapshot())}")
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No capacity for another browser session within {timeout}s")
+                # Memory and load change without any release, so re-check periodically
+                self._condition.wait(self.poll_interval if remaining is None else min(remaining, self.poll_interval))
+            return self._admit(time.monotonic() - started)
+    
+    def _admit(self, waited_s):
+        """Create a slot (call under lock)."""
+        slot = self._next_slot
+        self._next_slot += 1
+        self._slots[slot] = None
+        self._counters["admitted"] += 1
+        self._counters["wait_s"] += waited_s
+        self._counters["peak_sessions"] = max(self._counters["peak_sessions"], len(self._slots))
+        return slot
+    
+    def track(self, slot, pid):
+        """Attribute a process tree (e.g. the ChromeDriver service) to a slot for memory measurement."""
+        with self._condition:
+            if slot in self._slots:
+                self._slots[slot] = pid
+    
+    def release(self, slot):
+        """End a session and wake up queued ones."""
+        with self._condition:
+            self._slots.pop(slot, None)
+            self._measured_mb.pop(slot, None)
+            self._condition.notify_all()
+    
+    @contextmanager
+    def session(self, timeout=None):
+        """Hold a slot for the duration of a with-block."""
+        slot = self.acquire(timeout)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+    
+    def recommended_sessions(self):
+        """Concurrency the machine can take right now from scratch (at least 1); used to size worker pools."""
+        snapshot = self._snapshot()
+        free_mb, load = snapshot["free_mb"], snapshot["load"]
+        sessions = self.max_sessions or self.cpus
+        if load is not None:
+            # Leave room for whatever else is already keeping the CPUs busy
+            sessions = min(sessions, self.cpus * self.max_load_per_cpu - load)
+        if free_mb is not None:
+            sessions = min(sessions, (free_mb - self.reserve_mb) // self.memory_per_session_mb)
+        return max(1, int(sessions))
+    
+    def metrics(self):
+        """Current utilisation and admission counters."""
+        with self._condition:
+            snapshot = self._snapshot()
+            counters = dict(self._counters)
+            sessions = len(self._slots)
+        free_mb, total_mb, load = snapshot["free_mb"], snapshot["total_mb"], snapshot["load"]
+        return {
+            "sessions": sessions,
+            "capacity": self.capacity(),
+            "free_mb": free_mb,
+            "memory_utilisation": round(1 - free_mb / total_mb, 3) if free_mb is not None and total_mb else None,
+            "load_per_cpu": round(load / self.cpus, 2) if load is not None else None,
+            "session_memory_mb": round(snapshot["per_session_mb"], 1),
+            "sessions_memory_mb": round(sum(snapshot["measured"].values()), 1),
+            "admitted": counters["admitted"],
+            "queued": counters["queued"],
+            "avg_wait_s": round(counters["wait_s"] / counters["admitted"], 3) if counters["admitted"] else None,
+            "peak_sessions": counters["peak_sessions"],
+        }
+    
+    def _snapshot(self):
+        """Read system state and measure tracked sessions (call under lock)."""
+        meminfo = read_meminfo()
+        tracked = {slot: pid for slot, pid in self._slots.items() if pid is not None}
+        children = _children_by_parent() if tracked and meminfo else None
+        for slot, pid in tracked.items():
+            measured = process_tree_memory_mb(pid, children)
+            if measured:
+                # Keep the peak: a session grows while it runs
+                self._measured_mb[slot] = max(measured, self._measured_mb.get(slot, 0))
+        measured = {slot: self._measured_mb[slot] for slot in tracked if slot in self._measured_mb}
+        per_session_mb = self.memory_per_session_mb
+        if measured:
+            # Sessions seen so far are the best estimate of the next one, never below the floor
+            per_session_mb = max(per_session_mb, sum(measured.values()) / len(measured))
+        return {
+            "free_mb": meminfo.get("MemAvailable"),
+            "total_mb": meminfo.get("MemTotal"),
+            "load": load_average(),
+            "measured": measured,
+            "per_session_mb": per_session_mb,
+        }
+    
+    def _capacity(self, snapshot):
+        sessions = len(self._slots)
+        if sessions == 0:
+            return 1
+        limits = []
+        if self.max_sessions:
+            limits.append(self.max_sessions - sessions)
+        if snapshot["load"] is not None and snapshot["load"] / self.cpus > self.max_load_per_cpu:
+            limits.append(0)
+        if snapshot["free_mb"] is not None:
+            per_session_mb = snapshot["per_session_mb"]
+            # Sessions still starting up will take more memory than they hold now
+            growth_mb = sum(max(0.0, per_session_mb - snapshot["measured"].get(slot, 0.0)) for slot in self._slots)
+            headroom_mb = snapshot["free_mb"] - self.reserve_mb - growth_mb
+            limits.append(int(headroom_mb // per_session_mb))
+        return max(0, min(limits)) if limits else 1
+    
+    def _describe(self, snapshot):
+        load = f"{snapshot['load'] / self.cpus:.2f}" if snapshot["load"] is not None else "?"
+        return (f"{len(self._slots)} running, {snapshot['free_mb']} MB free, "
+                f"~{snapshot['per_session_mb']:.0f} MB per session, load {load} per CPU")
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def process_governor():
+    """Return the governor shared by every browser pool in this process."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = ResourceGovernor()
+        return _governor
@@ -0,0 +1,181 @@
+"""
+Multi-term search mode: fan search terms out across a pool of browser sessions.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from config.config import Config
+from utils.driver_factory import DriverFactory
+from utils.resource_governor import process_governor
+
+
+def load_search_terms(source):
+    """Load search terms from a list, a file path, or a comma-separated string."""
+    if isinstance(source, (list, tuple)):
+        terms = source
+    elif os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            terms = [line for line in f if not line.lstrip().startswith("#")]
+    else:
+        terms = source.split(",")
+    return [term.strip() for term in terms if term.strip()]
+
+
+class SearchPool:
+    """Run Homepage searches for many terms with bounded browser concurrency.
+    
+    Each pool thread owns one browser session and reuses it for every term it
+    picks up; Selenium calls release the GIL while waiting on the browser, so
+    throughput is bounded by the number of Chrome processes, not by Python.
+    Each result is appended to a JSONL report as soon as its term finishes.
+    New sessions are admitted by the process's resource governor, so threads
+    queue instead of launching browsers the machine has no memory for.
+    """
+    
+    def __init__(self, pool_size=None, report_path=None, result_timeout=None):
+        self.config = Config()
+        self.pool_size = pool_size or self.config.SEARCH_POOL_SIZE or os.cpu_count() or 1
+        self.report_path = report_path or self.config.SEARCH_REPORT
+        self.result_timeout = result_timeout or self.config.EXPLICIT_WAIT
+        self._local = threading.local()
+        self._governor = process_governor()
+        self._sessions = []
+        self._slots = {}
+        self._report = None
+        self._lock = threading.Lock()
+    
+    def run(self, terms=None):
+        """Search every term (default: Config.SEARCH_TERMS) and return a run summary."""
+        terms = load_search_terms(terms if terms is not None else self.config.SEARCH_TERMS)
+        if not terms:
+            raise ValueError("No search terms given")
+        pool_size = min(self.pool_size, len(terms)) or 1
+        report_dir = os.path.dirname(self.report_path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        
+        print(f"🔎 Searching {len(terms)} terms across {pool_size} browser sessions")
+        started = time.perf_counter()
+        try:
+            with open(self.report_path, "w", encoding="utf-8") as report:
+                self._report = report
+                with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="search") as executor:
+                    records = list(executor.map(self._search_term, terms))
+        finally:
+            self._report = None
+            self._quit_sessions()
+        failures = sum(1 for record in records if not record["ok"])
+        
+        elapsed = time.perf_counter() - started
+        summary = {
+            "terms": len(terms),
+            "failures": failures,
+            "sessions": pool_size,
+            "elapsed_s": round(elapsed, 3),
+            "terms_per_minute": round(len(terms) / elapsed * 60, 1) if elapsed else None,
+        }
+        print(f"✅ Search run finished: {summary}")
+        print(f"🧮 Resources: {self._governor.metrics()}")
+        print(f"📊 Report written to {self.report_path}")
+        return summary
+    
+    def _search_term(self, term):
+        """Search one term on this thread's session and build its report record."""
+        from pages.homepage import Homepage
+        from pages.search_results_page import SearchResultsPage
+        
+        record = {"term": term, "ok": False, "result_count": 0, "timings": {}, "error": None}
+        started = time.perf_counter()
+        try:
+            driver_manager = self._session()
+            homepage = Homepage(driver_manager)
+            results_page = SearchResultsPage(driver_manager)
+            
+            with self._timed(record, "navigate"):
+                driver_manager.navigate_to_twitch()
+            with self._timed(record, "search"):
+                homepage.click_search_icon()
+                homepage.search_for_term(term)
+            with self._timed(record, "results"):
+                cards = self._wait_for_cards(results_page)
+            
+            record["result_count"] = len(cards)
+            record["top_results"] = [card.title for card in cards[:5]]
+            record["ok"] = bool(cards)
+        except Exception as e:
+            record["error"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+            self._discard_session()
+        record["timings"]["total"] = round(time.perf_counter() - started, 3)
+        
+        # Stream each record to the report as soon as its term completes
+        with self._lock:
+            self._report.write(json.dumps(record) + "\n")
+            self._report.flush()
+        return {"term": term, "ok": record["ok"]}
+    
+    def _wait_for_cards(self, results_page):
+        """Poll the bulk extractor until result cards appear or the timeout expires."""
+        try:
+            return WebDriverWait(results_page.driver, self.result_timeout, poll_frequency=0.25).until(
+                lambda driver: results_page.extract_results(fields=("title", "href")))
+        except TimeoutException:
+            return []
+    
+    @contextmanager
+    def _timed(self, record, phase):
+        """Record the duration of one phase of a search in the record."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record["timings"][phase] = round(time.perf_counter() - started, 3)
+    
+    def _session(self):
+        """Return this thread's browser session, starting one if needed."""
+        driver_manager = getattr(self._local, "driver_manager", None)
+        if driver_manager is None:
+            slot = self._governor.acquire()
+            driver_manager = DriverFactory()
+            try:
+                driver_manager.setup_driver()
+            except Exception:
+                self._governor.release(slot)
+                raise
+            self._governor.track(slot, driver_manager.browser_pid())
+            self._local.driver_manager = driver_manager
+            with self._lock:
+                self._sessions.append(driver_manager)
+                self._slots[driver_manager] = slot
+        return driver_manager
+    
+    def _discard_session(self):
+        """Quit this thread's session after a failure so the next term starts clean."""
+        driver_manager = getattr(self._local, "driver_manager", None)
+        self._local.driver_manager = None
+        if driver_manager is not None:
+            with self._lock:
+                self._sessions.remove(driver_manager)
+            self._quit(driver_manager)
+    
+    def _quit_sessions(self):
+        """Quit every browser session started by the pool."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for driver_manager in sessions:
+            self._quit(driver_manager)
+    
+    def _quit(self, driver_manager):
+        """Quit one session and give its governor slot back."""
+        try:
+            driver_manager.quit_driver()
+        except Exception as e:
+            print(f"⚠️ Failed to quit browser session: {e}")
+        with self._lock:
+            slot = self._slots.pop(driver_manager, None)
+        if slot is not None:
+            self._governor.release(slot)
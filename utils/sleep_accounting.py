@@ -0,0 +1,215 @@
+"""
+Sleep-vs-work accounting across the suite.
+
+SleepAccountingPlugin patches time.sleep, WebDriverWait.until/until_not and
+RemoteConnection.execute while tests run, and attributes the time spent in
+each to the framework or test line that called it. Time inside an explicit
+wait (its polling sleeps and commands included) counts as wait-poll for the
+wait's call site, so nothing is counted twice. Whatever remains of a test's
+wall-clock time is Python.
+"""
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+CATEGORIES = ("sleep", "wait-poll", "webdriver", "python")
+
+# Frames from these files are skipped when looking for the call site
+_SKIPPED_FILES = ("sleep_accounting.py", "step_timing.py", "command_tracer.py", "contextlib.py")
+
+
+class SleepAccountingPlugin:
+    """Pytest plugin producing a ranked report of where wall-clock time goes."""
+    
+    def __init__(self, report_path="reports/sleep_report.json", top=25):
+        self.report_path = report_path
+        self.top = top
+        self.sites = {}
+        self.tests = {}
+        self.worker_id = None
+        self._root = os.getcwd() + os.sep
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._current_test = None
+        self._test_started = None
+        self._originals = {}
+    
+    # Pytest hooks
+    
+    def pytest_configure(self, config):
+        workerinput = getattr(config, "workerinput", None)
+        self.worker_id = workerinput["workerid"] if workerinput else None
+        if self.worker_id is None:
+            # Worker reports from an earlier run would be merged into this one
+            for path in glob.glob(self._worker_path("*")):
+                os.remove(path)
+        self._install()
+    
+    def pytest_unconfigure(self, config):
+        self._uninstall()
+    
+    def pytest_runtest_protocol(self, item, nextitem):
+        """Account for the whole test, fixtures included."""
+        self.tests[item.nodeid] = {category: 0.0 for category in CATEGORIES}
+        self._current_test = item.nodeid
+        self._test_started = time.perf_counter()
+        # Returning None lets the default protocol run the test
+    
+    def pytest_runtest_logfinish(self, nodeid, location):
+        if self._current_test != nodeid:
+            return
+        wall = time.perf_counter() - self._test_started
+        totals = self.tests[nodeid]
+        totals["python"] = max(0.0, wall - sum(totals.values()))
+        totals["wall"] = wall
+        self._current_test = None
+    
+    def pytest_sessionfinish(self, session):
+        path = self._worker_path(self.worker_id) if self.worker_id else self.report_path
+        self._write(path, self.sites, self.tests)
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        sites, tests = self.sites, self.tests
+        worker_paths = glob.glob(self._worker_path("*"))
+        if worker_paths:
+            sites, tests = self._merge(worker_paths)
+            self._write(self.report_path, sites, tests)
+        if not tests:
+            return
+        
+        totals = {category: sum(test.get(category, 0.0) for test in tests.values()) for category in CATEGORIES}
+        wall = sum(test.get("wall", 0.0) for test in tests.values()) or 1.0
+        terminalreporter.section("Sleep vs work")
+        terminalreporter.write_line("  ".join(
+            f"{category}: {seconds:.1f}s ({seconds / wall * 100:.0f}%)" for category, seconds in totals.items()
+        ))
+        terminalreporter.write_line(f"{'seconds':>9} {'calls':>6}  {'category':<10} call site")
+        for site in self._ranked(sites)[:self.top]:
+            terminalreporter.write_line(
+                f"{site['seconds']:>9.2f} {site['calls']:>6}  {site['category']:<10} {site['site']}"
+            )
+        terminalreporter.write_line(f"Full report: {self.report_path}")
+    
+    # Accounting
+    
+    def _install(self):
+        plugin = self
+        self._originals = {
+            "sleep": time.sleep,
+            "until": WebDriverWait.until,
+            "until_not": WebDriverWait.until_not,
+            "execute": RemoteConnection.execute,
+        }
+        original_sleep = self._originals["sleep"]
+        original_until = self._originals["until"]
+        original_until_not = self._originals["until_not"]
+        original_execute = self._originals["execute"]
+        
+        def sleep(seconds):
+            return plugin._measure("sleep", original_sleep, seconds)
+        
+        def until(wait, method, message=""):
+            return plugin._measure("wait-poll", original_until, wait, method, message)
+        
+        def until_not(wait, method, message=""):
+            return plugin._measure("wait-poll", original_until_not, wait, method, message)
+        
+        def execute(connection, command, params):
+            return plugin._measure("webdriver", original_execute, connection, command, params)
+        
+        time.sleep = sleep
+        WebDriverWait.until = until
+        WebDriverWait.until_not = until_not
+        RemoteConnection.execute = execute
+    
+    def _uninstall(self):
+        if not self._originals:
+            return
+        time.sleep = self._originals["sleep"]
+        WebDriverWait.until = self._originals["until"]
+        WebDriverWait.until_not = self._originals["until_not"]
+        RemoteConnection.execute = self._originals["execute"]
+        self._originals = {}
+    
+    def _measure(self, category, func, *args):
+        test = self._current_test
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        if test is None or (stack and stack[-1]["category"] == "wait-poll"):
+            # Outside tests, or polling inside an explicit wait: counted by the wait itself
+            return func(*args)
+        
+        frame = {"category": category, "children": 0.0}
+        stack.append(frame)
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            if stack:
+                stack[-1]["children"] += elapsed
+            exclusive = elapsed - frame["children"]
+            site = self._call_site()
+            with self._lock:
+                record = self.sites.setdefault((category, site), {"seconds": 0.0, "calls": 0})
+                record["seconds"] += exclusive
+                record["calls"] += 1
+                self.tests[test][category] += exclusive
+    
+    def _call_site(self):
+        """Return "path:line (function)" of the innermost caller inside the project."""
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if (filename.startswith(self._root) and "site-packages" not in filename
+                    and not filename.endswith(_SKIPPED_FILES)):
+                relative = os.path.relpath(filename, self._root)
+                return f"{relative}:{frame.f_lineno} ({frame.f_code.co_name})"
+            frame = frame.f_back
+        return "<outside project>"
+    
+    # Reports
+    
+    def _worker_path(self, worker_id):
+        root, extension = os.path.splitext(self.report_path)
+        return f"{root}.{worker_id}{extension}"
+    
+    @staticmethod
+    def _ranked(sites):
+        rows = [
+            {"category": category, "site": site, "seconds": round(stats["seconds"], 3), "calls": stats["calls"]}
+            for (category, site), stats in sites.items()
+        ]
+        return sorted(rows, key=lambda row: -row["seconds"])
+    
+    def _write(self, path, sites, tests):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "call_sites": self._ranked(sites),
+                "tests": {nodeid: {key: round(value, 3) for key, value in totals.items()}
+                          for nodeid, totals in tests.items()},
+            }, f, indent=2)
+    
+    def _merge(self, paths):
+        """Combine the per-worker reports written under xdist."""
+        sites, tests = {}, {}
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                report = json.load(f)
+            for row in report["call_sites"]:
+                record = sites.setdefault((row["category"], row["site"]), {"seconds": 0.0, "calls": 0})
+                record["seconds"] += row["seconds"]
+                record["calls"] += row["calls"]
+            tests.update(report["tests"])
+        return sites, tests
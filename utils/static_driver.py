@@ -0,0 +1,260 @@
+"""
+Browserless HTTP tier: fetch pages with a pooled HTTP client and answer
+WebDriver-style element queries from the parsed HTML.
+
+StaticDriver implements the read-only part of the WebDriver API the page
+objects use (find_element(s), title, current_url, page_source and element
+text, attributes and visibility), so BasePage locators and methods work
+unchanged. Only the HTML as served is seen: no scripts run, so checks on
+client-rendered markup still need a browser.
+"""
+import os
+import re
+import threading
+from urllib.parse import urljoin
+import urllib3
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+from config.config import Config
+from config.devices import get_device
+from utils.driver_factory import DriverFactory
+
+
+# Attributes Selenium's get_attribute returns as resolved properties
+URL_ATTRIBUTES = ("href", "src", "action")
+
+HIDDEN_STYLE = re.compile(r"(display\s*:\s*none|visibility\s*:\s*hidden)", re.IGNORECASE)
+NON_RENDERED_TAGS = {"head", "script", "style", "template", "noscript", "title", "meta", "link"}
+
+_http = None
+_http_lock = threading.Lock()
+_compiled = {}
+
+
+def http_pool():
+    """Return the process-wide pooled HTTP client (keep-alive connections per host)."""
+    global _http
+    with _http_lock:
+        if _http is None:
+            _http = urllib3.PoolManager(num_pools=10, maxsize=Config.HTTP_TIER_POOL_SIZE,
+                                        retries=urllib3.Retry(total=2, redirect=5))
+        return _http
+
+
+def _compile(by, value):
+    """Compile a locator to a function of a context node, cached across pages."""
+    key = (by, value)
+    query = _compiled.get(key)
+    if query is not None:
+        return query
+    if by == By.CSS_SELECTOR:
+        query = CSSSelector(value, translator="html")
+    elif by == By.XPATH:
+        query = etree.XPath(value)
+    elif by == By.ID:
+        query = etree.XPath(".//*[@id=$value]")
+    elif by == By.NAME:
+        query = etree.XPath(".//*[@name=$value]")
+    elif by == By.CLASS_NAME:
+        query = CSSSelector(f".{value}", translator="html")
+    elif by == By.TAG_NAME:
+        query = etree.XPath(f".//{value}")
+    elif by == By.LINK_TEXT:
+        query = etree.XPath(".//a[normalize-space(.)=normalize-space($value)]")
+    elif by == By.PARTIAL_LINK_TEXT:
+        query = etree.XPath(".//a[contains(normalize-space(.), $value)]")
+    else:
+        raise WebDriverException(f"Locator strategy not supported by the HTTP tier: {by}")
+    if isinstance(query, etree.XPath) and "$value" in query.path:
+        parametrized = query
+        query = lambda node: parametrized(node, value=value)
+    _compiled[key] = query
+    return query
+
+
+def _query(driver, node, by, value):
+    """Return StaticElements for every element node the locator matches."""
+    return [StaticElement(driver, match) for match in _compile(by, value)(node)
+            if isinstance(match, etree.ElementBase) and isinstance(match.tag, str)]
+
+
+class StaticElement:
+    """Read-only WebElement over a parsed HTML node."""
+    
+    __slots__ = ("_driver", "_node")
+    
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+    
+    @property
+    def tag_name(self):
+        return self._node.tag
+    
+    @property
+    def text(self):
+        """Text content with whitespace collapsed (empty for hidden elements, like Selenium)."""
+        return " ".join(self._node.text_content().split()) if self.is_displayed() else ""
+    
+    def get_attribute(self, name):
+        """Attribute value; URLs are resolved against the page like the DOM properties Selenium returns."""
+        value = self._node.get(name)
+        if value is not None and name in URL_ATTRIBUTES:
+            return urljoin(self._driver.current_url, value)
+        if value is None and name in ("textContent", "innerText"):
+            return self._node.text_content()
+        return value
+    
+    def get_dom_attribute(self, name):
+        return self._node.get(name)
+    
+    def is_displayed(self):
+        """False for non-rendered tags, hidden inputs and elements hidden by an attribute or inline style."""
+        if self._node.tag == "input" and (self._node.get("type") or "").lower() == "hidden":
+            return False
+        node = self._node
+        while node is not None:
+            if node.tag in NON_RENDERED_TAGS or node.get("hidden") is not None:
+                return False
+            if HIDDEN_STYLE.search(node.get("style") or ""):
+                return False
+            node = node.getparent()
+        return True
+    
+    def is_enabled(self):
+        return self._node.get("disabled") is None
+    
+    def is_selected(self):
+        return self._node.get("checked") is not None or self._node.get("selected") is not None
+    
+    def find_element(self, by=By.ID, value=None):
+        return self._driver._first(_query(self._driver, self._node, by, value), by, value)
+    
+    def find_elements(self, by=By.ID, value=None):
+        return _query(self._driver, self._node, by, value)
+    
+    def click(self):
+        """Follow the enclosing link; any other click needs a browser."""
+        node = self._node
+        while node is not None and not (node.tag == "a" and node.get("href")):
+            node = node.getparent()
+        if node is None:
+            raise WebDriverException("Only link clicks are supported by the HTTP tier")
+        self._driver.get(urljoin(self._driver.current_url, node.get("href")))
+    
+    def send_keys(self, *value):
+        raise WebDriverException("Typing needs a browser; remove the http_tier marker from this test")
+    
+    def clear(self):
+        raise WebDriverException("Typing needs a browser; remove the http_tier marker from this test")
+
+
+class StaticDriver:
+    """WebDriver stand-in that fetches pages over HTTP and queries the parsed HTML."""
+    
+    def __init__(self, user_agent=None, timeout=None):
+        self.http = http_pool()
+        self.headers = {"Accept": "text/html,application/xhtml+xml", "Accept-Language": "en-US,en;q=0.9"}
+        if user_agent:
+            self.headers["User-Agent"] = user_agent
+        self.timeout = timeout or Config.PAGE_LOAD_TIMEOUT
+        self.current_url = None
+        self.page_source = ""
+        self.status = None
+        self._root = None
+    
+    def get(self, url):
+        """Fetch a page (following redirects) and parse it."""
+        response = self.http.request("GET", url, headers=self.headers, timeout=self.timeout, preload_content=True)
+        self.status = response.status
+        self.current_url = response.geturl() or url
+        if not self.current_url.startswith(("http://", "https://")):
+            self.current_url = urljoin(url, self.current_url)
+        content_type = response.headers.get("Content-Type", "")
+        charset = content_type.split("charset=")[-1].split(";")[0].strip() if "charset=" in content_type else "utf-8"
+        self.page_source = response.data.decode(charset, errors="replace")
+        self._root = lxml.html.document_fromstring(response.data) if response.data.strip() else None
+    
+    @property
+    def title(self):
+        if self._root is None:
+            return ""
+        return " ".join((self._root.findtext(".//title") or "").split())
+    
+    @property
+    def window_handles(self):
+        return ["static"]
+    
+    def find_element(self, by=By.ID, value=None):
+        return self._first(self.find_elements(by, value), by, value)
+    
+    def find_elements(self, by=By.ID, value=None):
+        if self._root is None:
+            return []
+        return _query(self, self._root, by, value)
+    
+    @staticmethod
+    def _first(elements, by, value):
+        if not elements:
+            raise NoSuchElementException(f"No element matches {by}={value!r} in the served HTML")
+        return elements[0]
+    
+    def execute_script(self, script, *args):
+        raise WebDriverException("Scripts need a browser; remove the http_tier marker from this test")
+    
+    execute_async_script = execute_script
+    
+    def save_screenshot(self, filename):
+        raise WebDriverException("Screenshots need a browser; remove the http_tier marker from this test")
+    
+    def implicitly_wait(self, seconds):
+        pass
+    
+    def quit(self):
+        # Connections stay in the shared pool for the next session
+        self._root = None
+
+
+class StaticDriverFactory(DriverFactory):
+    """DriverFactory for http_tier tests: page objects get a StaticDriver instead of Chrome."""
+    
+    def setup_driver(self, user_data_dir=None, device=None):
+        """Create a StaticDriver sending the device profile's user agent."""
+        self.device = get_device(device or self.config.DEVICE)
+        self.driver = StaticDriver(self.device["user_agent"])
+        print(f"✅ HTTP tier session ready ({self.device['name']})")
+        return self.driver
+    
+    def performance_log_enabled(self):
+        return False
+    
+    def navigate_to_twitch(self):
+        """Fetch the Twitch homepage."""
+        if not self.driver:
+            self.setup_driver()
+        self.driver.get(self.config.TWITCH_URL)
+        print(f"✅ Fetched {self.config.TWITCH_URL} ({self.driver.status})")
+    
+    def take_screenshot(self, filename):
+        """Save the served HTML in place of a screenshot."""
+        os.makedirs("screenshots", exist_ok=True)
+        filepath = os.path.join("screenshots", f"{os.path.splitext(filename)[0]}.html")
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(self.driver.page_source)
+        print(f"HTML snapshot saved: {filepath}")
+        return filepath
+    
+    def handle_modal_popup(self):
+        """No scripts run, so no modal can open."""
+        return False
+    
+    def wait_for_page_load(self):
+        """The page is complete once fetched."""
+    
+    def quit_driver(self):
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
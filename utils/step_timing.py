@@ -0,0 +1,177 @@
+"""
+Step-level timing for page-object methods.
+
+When STEP_TIMING=true, BasePage wraps every public method of its subclasses
+with timed_step, which reports each call as an Allure step and appends it to
+a JSONL timeline. With CHROME_TRACE=steps the same wrapper also brackets each
+outermost step in a Chrome trace, kept when the step exceeds its budget.
+Aggregate timelines from many runs into p50/p95 per action:
+    
+    python -m utils.step_timing reports/step_timeline*.jsonl
+"""
+import contextlib
+import functools
+import glob
+import inspect
+import json
+import math
+import os
+import sys
+import threading
+import time
+import allure
+from config.config import Config
+
+
+# Steps run on SearchPool and async-pool threads too, so each thread keeps its own stack
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def _active_steps():
+    """Return the steps currently running on this thread, innermost last."""
+    steps = getattr(_local, "steps", None)
+    if steps is None:
+        steps = _local.steps = []
+    return steps
+
+
+def record_branch(locator):
+    """Note the locator (fallback branch) that just succeeded inside the current step."""
+    steps = _active_steps()
+    if steps:
+        steps[-1]["branch"] = locator[1] if isinstance(locator, tuple) else locator
+
+
+def _write_record(record):
+    """Append one step record to the timeline file."""
+    path = Config.STEP_TIMELINE_FILE
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def timed_step(func):
+    """Time a page-object method, report it as an Allure step and record it in the timeline."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        name = f"{type(self).__name__}.{func.__name__}"
+        active_steps = _active_steps()
+        step = {
+            "step": name,
+            "test": os.environ.get("PYTEST_CURRENT_TEST", "").split(" ")[0],
+            "depth": len(active_steps),
+            "branch": None,
+        }
+        # Slow-step Chrome tracing (CHROME_TRACE=steps) brackets the outermost step
+        tracer = getattr(getattr(self, "driver_manager", None), "chrome_tracer", None)
+        if Config.CHROME_TRACE == "steps" and tracer is not None and not active_steps:
+            span = tracer.trace(name)
+        else:
+            span = contextlib.nullcontext({})
+        trace = {}
+        active_steps.append(step)
+        started = time.time()
+        perf_started = time.perf_counter()
+        outcome = "ok"
+        try:
+            with allure.step(name), span as trace:
+                result = func(self, *args, **kwargs)
+            if result is False:
+                outcome = "false"
+            return result
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            active_steps.pop()
+            if trace.get("trace"):
+                step["trace"] = trace["trace"]
+            step.update(
+                started=round(started, 3),
+                duration_ms=round((time.perf_counter() - perf_started) * 1000, 3),
+                outcome=outcome,
+            )
+            if Config.STEP_TIMING:
+                _write_record(step)
+    
+    wrapper.__timed_step__ = True
+    return wrapper
+
+
+def instrument_class(cls):
+    """Wrap the public methods defined directly on a page-object class.
+    
+    Generator methods such as iter_results are left alone: wrapping them would
+    only time the creation of the generator, not the work done while iterating.
+    """
+    for attribute, value in list(vars(cls).items()):
+        if attribute.startswith("_") or not callable(value) or isinstance(value, (staticmethod, classmethod, type)):
+            continue
+        if inspect.isgeneratorfunction(value) or inspect.isasyncgenfunction(value):
+            continue
+        if getattr(value, "__timed_step__", False):
+            continue
+        setattr(cls, attribute, timed_step(value))
+    return cls
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def aggregate(paths):
+    """Aggregate timeline files into count, p50, p95 and branch usage per step."""
+    durations = {}
+    branches = {}
+    failures = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                name = record["step"]
+                durations.setdefault(name, []).append(record["duration_ms"])
+                if record.get("branch"):
+                    counts = branches.setdefault(name, {})
+                    counts[record["branch"]] = counts.get(record["branch"], 0) + 1
+                if record.get("outcome") != "ok":
+                    failures[name] = failures.get(name, 0) + 1
+    
+    return {
+        name: {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 0.50), 1),
+            "p95_ms": round(percentile(values, 0.95), 1),
+            "total_ms": round(sum(values), 1),
+            "not_ok": failures.get(name, 0),
+            "branches": branches.get(name, {}),
+        }
+        for name, values in durations.items()
+    }
+
+
+def main():
+    """Print p50/p95 per page-object step for the given timeline files."""
+    patterns = sys.argv[1:] or [Config.STEP_TIMELINE_FILE]
+    paths = [path for pattern in patterns for path in sorted(glob.glob(pattern))]
+    if not paths:
+        print(f"❌ No timeline files found for: {' '.join(patterns)}")
+        sys.exit(1)
+    
+    stats = aggregate(paths)
+    print(f"{'Step':<55} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'not ok':>7}")
+    for name, row in sorted(stats.items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"{name:<55} {row['count']:>6} {row['p50_ms']:>10} {row['p95_ms']:>10} {row['not_ok']:>7}")
+        for branch, count in sorted(row["branches"].items(), key=lambda item: -item[1]):
+            print(f"    ↳ {count:>5}× {branch}")
+
+
+if __name__ == "__main__":
+    main()
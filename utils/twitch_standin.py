@@ -0,0 +1,410 @@
+"""
+Local Twitch stand-in site for hermetic performance benchmarks.
+
+Serves synthetic homepage, search, category and streamer pages whose markup
+matches the locators in pages/. Run it and point TWITCH_URL at it:
+    
+    python -m utils.twitch_standin --port 8765 --results 1000 --latency-ms 50 --lazy --modal
+    TWITCH_URL=http://127.0.0.1:8765 CONNECTIVITY_CHECK_URL=http://127.0.0.1:8765 python run_tests.py
+"""
+import argparse
+import html
+import json
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote_plus
+
+
+MAX_RESULTS = 10000
+CATEGORIES = ["StarCraft II", "StarCraft", "StarCraft: Brood War", "Just Chatting", "Minecraft"]
+
+PAGE_STYLE = """
+    body { margin: 0; font-family: sans-serif; }
+    #page-main-content-wrapper { min-height: 3000px; padding: 8px; }
+    .result-card { display: block; margin: 8px 0; }
+    .tw-image { width: 320px; height: 180px; }
+    .modal-overlay { position: fixed; inset: 0; background: rgba(0, 0, 0, 0.6); z-index: 1000; }
+    .modal-overlay button { position: absolute; top: 40%; left: 40%; padding: 16px; }
+"""
+
+# Shared client-side behaviour: modal popups and lazily loaded result cards
+PAGE_SCRIPT = """
+(function () {
+    var cfg = window.STANDIN;
+    // API requests carry the page's knobs, since the server reads them from each query string
+    window.standinApiUrl = function (path, params) {
+        var query = ['results=' + cfg.results, 'lazy=' + (cfg.lazy ? 1 : 0),
+                     'batch_size=' + cfg.batchSize, 'latency_ms=' + cfg.latencyMs];
+        Object.keys(params).forEach(function (name) { query.push(name + '=' + encodeURIComponent(params[name])); });
+        return path + '?' + query.join('&');
+    };
+    if (cfg.modal) {
+        setTimeout(function () {
+            var overlay = document.createElement('div');
+            overlay.className = 'modal-overlay';
+            overlay.setAttribute('role', 'dialog');
+            overlay.innerHTML = '<button aria-label="Close" class="modal-close-button">Close</button>';
+            overlay.querySelector('button').addEventListener('click', function () { overlay.remove(); });
+            document.body.appendChild(overlay);
+        }, cfg.modalDelayMs);
+    }
+    window.standinLoadCards = function (container) {
+        if (!container || !cfg.lazy) { return; }
+        var sentinel = document.createElement('div');
+        sentinel.className = 'lazy-sentinel';
+        container.after(sentinel);
+        var loading = false;
+        var observer = new IntersectionObserver(function (entries) {
+            var offset = parseInt(container.getAttribute('data-offset'), 10);
+            if (!entries[0].isIntersecting || loading || offset >= cfg.results) { return; }
+            loading = true;
+            fetch(window.standinApiUrl('/api/cards', { offset: offset, limit: cfg.batchSize, term: cfg.term }))
+                .then(function (response) { return response.text(); })
+                .then(function (fragment) {
+                    container.insertAdjacentHTML('beforeend', fragment);
+                    container.setAttribute('data-offset', Math.min(offset + cfg.batchSize, cfg.results));
+                    loading = false;
+                    observer.unobserve(sentinel);
+                    observer.observe(sentinel);
+                });
+        }, { rootMargin: '800px' });
+        observer.observe(sentinel);
+    };
+    window.standinLoadCards(document.getElementById('result-cards'));
+})();
+"""
+
+# Live search: render suggestions and the results section as the user types
+SEARCH_SCRIPT = """
+(function () {
+    var input = document.querySelector("input[data-a-target='tw-input']");
+    var timer = null;
+    input.addEventListener('input', function () {
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+            var term = input.value.trim();
+            window.STANDIN.term = term;
+            if (!term) { return; }
+            fetch(window.standinApiUrl('/api/search', { term: term }))
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    document.getElementById('suggestions').innerHTML = data.suggestions;
+                    document.getElementById('search-results').innerHTML = data.results;
+                    window.standinLoadCards(document.getElementById('result-cards'));
+                });
+        }, 150);
+    });
+})();
+"""
+
+# Synthetic live video: a canvas stream, so media events fire without any media file
+VIDEO_SCRIPT = """
+(function () {
+    var video = document.querySelector('video');
+    var canvas = document.createElement('canvas');
+    canvas.width = 320;
+    canvas.height = 180;
+    var context = canvas.getContext('2d');
+    var frame = 0;
+    setInterval(function () {
+        context.fillStyle = 'hsl(' + (frame++ % 360) + ', 70%, 50%)';
+        context.fillRect(0, 0, canvas.width, canvas.height);
+    }, 33);
+    setTimeout(function () {
+        video.srcObject = canvas.captureStream(30);
+        video.play();
+    }, window.STANDIN.videoDelayMs);
+})();
+"""
+
+
+def slugify(name):
+    """Return the Twitch-style URL slug of a category name."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def solid_png(width, height, rgb):
+    """Build a solid-colour PNG in memory (used as the thumbnail image)."""
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+    
+    row = b"\x00" + bytes(rgb) * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(row * height, 9)) + chunk(b"IEND", b""))
+
+
+class StandinSite:
+    """Knobs and HTML rendering for the stand-in pages."""
+    
+    def __init__(self, results=200, latency_ms=0, lazy=False, batch_size=20,
+                 modal=False, modal_delay_ms=500, video_delay_ms=500):
+        self.results = min(results, MAX_RESULTS)
+        self.latency_ms = latency_ms
+        self.lazy = lazy
+        self.batch_size = batch_size
+        self.modal = modal
+        self.modal_delay_ms = modal_delay_ms
+        self.video_delay_ms = video_delay_ms
+        self.thumbnail = solid_png(320, 180, (100, 65, 165))
+    
+    def settings(self, query):
+        """Return the knobs for one request, with query-string overrides applied."""
+        def flag(name, default):
+            return query[name][0].lower() in ("1", "true", "yes") if name in query else default
+        
+        def number(name, default):
+            return int(query[name][0]) if name in query else default
+        
+        return {
+            "results": min(number("results", self.results), MAX_RESULTS),
+            "latencyMs": number("latency_ms", self.latency_ms),
+            "lazy": flag("lazy", self.lazy),
+            "batchSize": number("batch_size", self.batch_size),
+            "modal": flag("modal", self.modal),
+            "modalDelayMs": number("modal_delay_ms", self.modal_delay_ms),
+            "videoDelayMs": number("video_delay_ms", self.video_delay_ms),
+            "term": query.get("term", [""])[0],
+        }
+    
+    def page(self, title, body, settings, extra_script=""):
+        """Wrap a page body with the shared head, settings and scripts."""
+        settings_json = json.dumps(settings).replace("</", "<\\/")
+        return (
+            "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+            "<meta name='viewport' content='width=device-width, initial-scale=1'>"
+            f"<title>{html.escape(title)}</title><style>{PAGE_STYLE}</style></head><body>"
+            f"<script>window.STANDIN = {settings_json};</script>"
+            f"{self.top_nav()}{body}"
+            f"<script>{PAGE_SCRIPT}</script>"
+            f"{f'<script>{extra_script}</script>' if extra_script else ''}"
+            "</body></html>"
+        )
+    
+    def top_nav(self):
+        """Header matching Homepage.TWITCH_LOGO and Homepage.SEARCH_ICON (#root/div[2]/a[2])."""
+        return (
+            "<div id='root'>"
+            "<div><a href='/' aria-label='Go to the Twitch home page'>Twitch</a></div>"
+            "<div><a href='/'>Home</a><a href='/search' data-a-target='browse-link'>"
+            "<div class='Layout-sc-1xcs6mc-0 iwaIid'>"
+            "<div class='ScSvgWrapper-sc-wkgzod-0 dKXial tw-svg'>"
+            "<svg width='20' height='20' viewBox='0 0 20 20'><circle cx='8' cy='8' r='6'/></svg></div>"
+            "<div class='CoreText-sc-1txzju1-0 irZUBM'>Browse</div></div></a></div>"
+            "</div>"
+        )
+    
+    def cards(self, offset, limit, settings):
+        """Render result cards [offset, offset + limit) as an HTML fragment."""
+        lazy = " loading='lazy'" if settings["lazy"] else ""
+        parts = []
+        for index in range(offset, min(offset + limit, settings["results"])):
+            viewers = (index * 7919) % 25000
+            parts.append(
+                f"<a class='result-card' data-a-target='search-result-card' href='/videos/{index}'>"
+                f"<img alt='' class='tw-image' src='/thumbnails/{index}.png'{lazy}>"
+                f"<p class='CoreText-sc-1txzju1-0' title='Streamer {index}'>Streamer {index}</p>"
+                f"<span data-a-target='preview-card-viewer-count'>{viewers} viewers</span></a>"
+            )
+        return "".join(parts)
+    
+    def card_container(self, settings):
+        """Render the result card list; lazy mode renders only the first batch."""
+        initial = settings["batchSize"] if settings["lazy"] else settings["results"]
+        initial = min(initial, settings["results"])
+        return (f"<div id='result-cards' data-offset='{initial}'>"
+                f"{self.cards(0, initial, settings)}</div>")
+    
+    def suggestions(self, term):
+        """Render the live-search suggestion list items for a term."""
+        names = [name for name in CATEGORIES if term.lower() in name.lower()] or [term]
+        return "".join(
+            f"<li><a href='/search?term={quote_plus(name)}'>"
+            f"<p class='CoreText-sc-1txzju1-0 gQCPzm' title='{html.escape(name, quote=True)}'>"
+            f"{html.escape(name)}</p></a></li>"
+            for name in names
+        )
+    
+    def results_section(self, term, settings):
+        """Render the results section; the category button matches STARCRAFT_SELECTORS[0]."""
+        name = next((name for name in CATEGORIES if name.lower() == term.lower()), term)
+        slug = slugify(name)
+        escaped = html.escape(name)
+        return (
+            "<div><div><div></div><div></div><div><div><article>"
+            f"<button onclick=\"location.href='/directory/category/{slug}'\">{escaped}</button>"
+            f"<a class='ScCoreLink-sc-16kq0mq-0 kLgTJj tw-link' href='/directory/category/{slug}'>{escaped}</a>"
+            "</article></div></div></div></div>"
+            f"{self.card_container(settings)}"
+        )
+    
+    def homepage(self, settings):
+        """Render the homepage."""
+        body = ("<main id='page-main-content-wrapper'><div><h2>Live channels we think you'll like</h2></div>"
+                f"{self.card_container(settings)}</main>")
+        return self.page("Twitch", body, settings)
+    
+    def search_page(self, settings):
+        """Render the search page, pre-rendering results when a term is given."""
+        term = settings["term"]
+        body = (
+            "<div><input type='search' data-a-target='tw-input' placeholder='Search' "
+            f"value='{html.escape(term, quote=True)}'></div>"
+            "<main id='page-main-content-wrapper'>"
+            f"<div><ul id='suggestions'>{self.suggestions(term) if term else ''}</ul></div>"
+            "<div><h2>Search results</h2></div>"
+            "<div id='search-results' data-a-target='search-results'>"
+            f"{self.results_section(term, settings) if term else ''}</div>"
+            "</main>"
+        )
+        title = f"{term} - Search - Twitch" if term else "Search - Twitch"
+        return self.page(title, body, settings, SEARCH_SCRIPT)
+    
+    def category_page(self, slug, settings):
+        """Render a category directory page."""
+        name = next((name for name in CATEGORIES if slugify(name) == slug), slug.replace("-", " ").title())
+        settings = dict(settings, term=name)
+        body = (
+            "<main id='page-main-content-wrapper'>"
+            f"<h1 class='CoreText-sc-1txzju1-0 kuIRux'>{html.escape(name)}</h1>"
+            "<button data-a-target='game-directory-follow-button'>"
+            "<div data-a-target='tw-core-button-label-text'>Follow</div></button>"
+            f"{self.card_container(settings)}</main>"
+        )
+        return self.page(f"{name} - Twitch", body, settings)
+    
+    def streamer_page(self, video_id, settings):
+        """Render a streamer video page with a synthetic playing video."""
+        name = f"Streamer {video_id}"
+        body = (
+            "<main id='page-main-content-wrapper'>"
+            "<div data-a-target='player-overlay-click-handler'>"
+            "<video muted playsinline width='320' height='180'></video></div>"
+            f"<h1 title='{name}'>{name}</h1>"
+            f"<p data-a-target='stream-title'>Synthetic stream {video_id}</p>"
+            "<button data-a-target='follow-button'>Follow</button>"
+            "<button><div data-a-target='tw-core-button-label-text'>Share</div></button>"
+            "</main>"
+        )
+        return self.page(f"{name} - Twitch", body, settings, VIDEO_SCRIPT)
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """Route requests to the stand-in pages and APIs."""
+    
+    site = None
+    
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        settings = self.site.settings(parse_qs(parsed.query))
+        if settings["latencyMs"]:
+            time.sleep(settings["latencyMs"] / 1000)
+        
+        path = parsed.path.rstrip("/") or "/"
+        if path == "/":
+            self._send(self.site.homepage(settings))
+        elif path == "/search":
+            self._send(self.site.search_page(settings))
+        elif path.startswith("/directory/category/"):
+            self._send(self.site.category_page(path.rsplit("/", 1)[1], settings))
+        elif re.fullmatch(r"/videos/\d+", path):
+            self._send(self.site.streamer_page(path.rsplit("/", 1)[1], settings))
+        elif re.fullmatch(r"/thumbnails/\d+\.png", path):
+            self._send(self.site.thumbnail, "image/png", cache=True)
+        elif path == "/api/search":
+            term = settings["term"]
+            payload = {"suggestions": self.site.suggestions(term),
+                       "results": self.site.results_section(term, settings)}
+            self._send(json.dumps(payload), "application/json")
+        elif path == "/api/cards":
+            query = parse_qs(parsed.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(settings["batchSize"])])[0])
+            self._send(self.site.cards(offset, limit, settings))
+        else:
+            self.send_error(404)
+    
+    def _send(self, body, content_type="text/html; charset=utf-8", cache=False):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "public, max-age=3600" if cache else "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging; benchmarks issue thousands of requests."""
+
+
+class StandinServer:
+    """Run the stand-in site on a background thread."""
+    
+    def __init__(self, host="127.0.0.1", port=0, **site_options):
+        handler = type("BoundStandinRequestHandler", (StandinRequestHandler,),
+                       {"site": StandinSite(**site_options)})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self):
+        """Base URL of the running server (use as TWITCH_URL)."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="twitch-standin", daemon=True)
+        self._thread.start()
+        print(f"✅ Twitch stand-in site running at {self.url}")
+        return self
+    
+    def stop(self):
+        """Stop the server and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+def main():
+    """Run the stand-in site in the foreground."""
+    parser = argparse.ArgumentParser(description="Local Twitch stand-in site")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--results", type=int, default=200, help=f"Result cards per page (max {MAX_RESULTS})")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every response")
+    parser.add_argument("--lazy", action="store_true", help="Load result cards in batches while scrolling")
+    parser.add_argument("--batch-size", type=int, default=20, help="Cards per lazy-loaded batch")
+    parser.add_argument("--modal", action="store_true", help="Show a modal popup after each page load")
+    parser.add_argument("--modal-delay-ms", type=int, default=500)
+    args = parser.parse_args()
+    
+    server = StandinServer(
+        args.host, args.port, results=args.results, latency_ms=args.latency_ms, lazy=args.lazy,
+        batch_size=args.batch_size, modal=args.modal, modal_delay_ms=args.modal_delay_ms
+    )
+    print(f"✅ Twitch stand-in site running at {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
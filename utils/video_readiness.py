@@ -0,0 +1,136 @@
+"""
+Event-based video readiness, time-to-first-frame and rebuffer metrics.
+"""
+
+
+# Installed at document start so first-frame and playing events are not missed.
+# Each <video> keeps its own stats (performance.now() ms), restarted whenever it
+# loads a new source. window.__videoStats.origin is the point metrics are
+# reported from: document start, moved by baseline() when a wait begins, since
+# Twitch navigates client-side and homepage preview players play long before
+# the streamer page is reached.
+MONITOR_SCRIPT = """
+(function () {
+    if (window.__videoStats) { return; }
+    var monitor = window.__videoStats = { origin: 0 };
+    var videos = document.getElementsByTagName('video');
+    function fresh(video, lateInstall) {
+        video.__videoStats = {
+            firstFrameMs: null, playingMs: null, rebuffers: 0, rebufferMs: 0, stalledSince: null, lateInstall: lateInstall
+        };
+        var stats = video.__videoStats;
+        function firstFrame() {
+            if (stats.firstFrameMs === null) { stats.firstFrameMs = performance.now(); }
+        }
+        if (video.requestVideoFrameCallback) {
+            video.requestVideoFrameCallback(firstFrame);
+        } else {
+            video.addEventListener('loadeddata', firstFrame, { once: true });
+        }
+    }
+    function watch(video) {
+        if (video.__videoStats) { return; }
+        fresh(video, video.readyState >= 2);
+        // A new source (e.g. a client-side navigation reusing the player) starts a new measurement
+        video.addEventListener('loadstart', function () { fresh(video, false); });
+        video.addEventListener('playing', function () {
+            var stats = video.__videoStats;
+            if (stats.playingMs === null) { stats.playingMs = performance.now(); }
+            if (stats.stalledSince !== null) {
+                stats.rebufferMs += performance.now() - stats.stalledSince;
+                stats.stalledSince = null;
+            }
+        });
+        video.addEventListener('waiting', function () {
+            var stats = video.__videoStats;
+            // Stalls before the first "playing" are startup, not rebuffering
+            if (stats.playingMs !== null && stats.stalledSince === null) {
+                stats.rebuffers += 1;
+                stats.stalledSince = performance.now();
+            }
+        });
+    }
+    // Report from now on: earlier first frames count as already playing and rebuffer counters restart
+    monitor.baseline = function () {
+        var now = performance.now();
+        monitor.origin = now;
+        Array.prototype.forEach.call(videos, function (video) {
+            var stats = video.__videoStats;
+            if (!stats) { return; }
+            stats.rebuffers = 0;
+            stats.rebufferMs = 0;
+            if (stats.stalledSince !== null) { stats.stalledSince = now; }
+        });
+    };
+    function scan() { for (var i = 0; i < videos.length; i++) { watch(videos[i]); } }
+    scan();
+    new MutationObserver(scan).observe(document, { childList: true, subtree: true });
+})();
+"""
+
+# Current playback state of the largest <video> plus its counters, relative to the origin
+_STATE_FUNCTION = """
+function videoState() {
+    var video = null, area = -1;
+    Array.prototype.forEach.call(document.getElementsByTagName('video'), function (candidate) {
+        var rect = candidate.getBoundingClientRect();
+        if (rect.width * rect.height > area) { video = candidate; area = rect.width * rect.height; }
+    });
+    var origin = window.__videoStats.origin;
+    var stats = video && video.__videoStats;
+    function since(ms) { return stats && !stats.lateInstall && ms !== null && ms >= origin ? ms - origin : null; }
+    var stalled = stats && stats.stalledSince !== null ? performance.now() - stats.stalledSince : 0;
+    return {
+        has_video: video !== null,
+        ready_state: video ? video.readyState : null,
+        paused: video ? video.paused : null,
+        current_time: video ? video.currentTime : null,
+        ttff_ms: stats ? since(stats.firstFrameMs) : null,
+        time_to_playing_ms: stats ? since(stats.playingMs) : null,
+        rebuffer_count: stats ? stats.rebuffers : 0,
+        rebuffer_ms: stats ? stats.rebufferMs + stalled : 0
+    };
+}
+"""
+
+STATE_SCRIPT = MONITOR_SCRIPT + _STATE_FUNCTION + """
+return JSON.stringify(videoState());
+"""
+
+# Async script: resolves as soon as the video has data (readyState >= 3), is not
+# paused and currentTime has advanced, driven by media events on the document
+# (capture phase) with a slow poll as a safety net. Gives up early when no
+# <video> shows up within the grace period.
+# Metrics are measured from the start of the wait; a video whose first frame
+# came earlier reports no TTFF.
+WAIT_FOR_PLAYBACK_SCRIPT = MONITOR_SCRIPT + _STATE_FUNCTION + """
+var timeoutMs = arguments[0], noVideoGraceMs = arguments[1];
+var done = arguments[arguments.length - 1];
+window.__videoStats.baseline();
+var started = performance.now(), baseline = null, finished = false;
+var events = ['loadeddata', 'canplay', 'playing', 'timeupdate'];
+var poll = setInterval(check, 250);
+function finish(ready) {
+    if (finished) { return; }
+    finished = true;
+    clearInterval(poll);
+    events.forEach(function (name) { document.removeEventListener(name, check, true); });
+    var state = videoState();
+    state.ready = ready;
+    state.waited_ms = performance.now() - started;
+    done(JSON.stringify(state));
+}
+function check() {
+    var state = videoState(), elapsed = performance.now() - started;
+    if (state.has_video && state.ready_state >= 3 && !state.paused) {
+        if (baseline === null) {
+            baseline = state.current_time;
+        } else if (state.current_time > baseline) {
+            return finish(true);
+        }
+    }
+    if (elapsed > timeoutMs || (!state.has_video && elapsed > noVideoGraceMs)) { finish(false); }
+}
+events.forEach(function (name) { document.addEventListener(name, check, true); });
+check();
+"""
@@ -0,0 +1,192 @@
+"""
+Warm-state snapshot and restore: cookies, localStorage, sessionStorage and IndexedDB.
+
+A warm state is captured once per run from a session that has already been
+through Twitch's first-visit UI (consent, mature-content gates, modals) and is
+restored into every new session before its first navigation.
+"""
+import json
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent workers may each capture a state
+    fcntl = None
+
+
+# Restored cookies may only carry Network.CookieParam fields
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+
+# Storage key marking a document whose storage was already seeded in this session
+RESTORED_MARKER = "__warmStateRestored"
+
+# Async script returning the origin's localStorage, sessionStorage and IndexedDB
+# contents (JSON-serializable records only, at most arguments[0] per store).
+DUMP_STORAGE_SCRIPT = """
+var maxRecords = arguments[0], done = arguments[arguments.length - 1];
+function entries(storage) {
+    var out = {};
+    for (var i = 0; i < storage.length; i++) { out[storage.key(i)] = storage.getItem(storage.key(i)); }
+    return out;
+}
+function serializable(value) {
+    try { return value !== undefined && JSON.stringify(value) !== undefined; } catch (e) { return false; }
+}
+function dumpDatabase(info) {
+    return new Promise(function (resolve) {
+        var request = indexedDB.open(info.name);
+        request.onerror = function () { resolve(null); };
+        request.onsuccess = function () {
+            var db = request.result, names = Array.prototype.slice.call(db.objectStoreNames);
+            var result = { name: db.name, version: db.version, stores: {} };
+            if (!names.length) { db.close(); return resolve(result); }
+            var tx = db.transaction(names, 'readonly');
+            names.forEach(function (name) {
+                var store = tx.objectStore(name);
+                var meta = result.stores[name] = {
+                    keyPath: store.keyPath, autoIncrement: store.autoIncrement, indexes: [], records: []
+                };
+                Array.prototype.forEach.call(store.indexNames, function (indexName) {
+                    var index = store.index(indexName);
+                    meta.indexes.push({ name: indexName, keyPath: index.keyPath, unique: index.unique, multiEntry: index.multiEntry });
+                });
+                store.openCursor().onsuccess = function (event) {
+                    var cursor = event.target.result;
+                    if (!cursor || meta.records.length >= maxRecords) { return; }
+                    if (serializable(cursor.key) && serializable(cursor.value)) {
+                        meta.records.push([store.keyPath === null ? cursor.key : null, cursor.value]);
+                    }
+                    cursor.continue();
+                };
+            });
+            tx.oncomplete = tx.onerror = function () { db.close(); resolve(result); };
+        };
+    });
+}
+var listing = indexedDB.databases ? indexedDB.databases() : Promise.resolve([]);
+listing.then(function (databases) { return Promise.all(databases.map(dumpDatabase)); })
+    .catch(function () { return []; })
+    .then(function (databases) {
+        done(JSON.stringify({
+            origin: location.origin,
+            local_storage: entries(localStorage),
+            session_storage: entries(sessionStorage),
+            indexeddb: databases.filter(Boolean)
+        }));
+    });
+"""
+
+# Document-start script seeding storage on the captured origin. The marker keeps
+# later documents from overwriting what the site itself changed since.
+_SEED_SCRIPT = """
+(function (state, marker) {
+    if (location.origin !== state.origin) { return; }
+    function seed(storage, values) {
+        if (storage.getItem(marker)) { return false; }
+        Object.keys(values).forEach(function (key) { storage.setItem(key, values[key]); });
+        storage.setItem(marker, '1');
+        return true;
+    }
+    var firstDocument;
+    try {
+        firstDocument = seed(localStorage, state.local_storage);
+        seed(sessionStorage, state.session_storage);
+    } catch (e) { return; }
+    if (!firstDocument) { return; }
+    state.indexeddb.forEach(function (database) {
+        var request = indexedDB.open(database.name, database.version);
+        request.onupgradeneeded = function () {
+            var db = request.result;
+            Object.keys(database.stores).forEach(function (name) {
+                if (db.objectStoreNames.contains(name)) { return; }
+                var meta = database.stores[name];
+                var store = db.createObjectStore(name, { keyPath: meta.keyPath, autoIncrement: meta.autoIncrement });
+                meta.indexes.forEach(function (index) {
+                    store.createIndex(index.name, index.keyPath, { unique: index.unique, multiEntry: index.multiEntry });
+                });
+            });
+        };
+        request.onsuccess = function () {
+            var db = request.result;
+            var names = Object.keys(database.stores).filter(function (name) { return db.objectStoreNames.contains(name); });
+            if (!names.length) { db.close(); return; }
+            var tx = db.transaction(names, 'readwrite');
+            names.forEach(function (name) {
+                var store = tx.objectStore(name);
+                database.stores[name].records.forEach(function (record) {
+                    if (record[0] === null) { store.put(record[1]); } else { store.put(record[1], record[0]); }
+                });
+            });
+            tx.oncomplete = tx.onerror = function () { db.close(); };
+        };
+    });
+})(%s, %s);
+"""
+
+
+def capture_warm_state(driver, max_records=500):
+    """Return the browser's cookies and the current origin's storage as a dict."""
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    state = json.loads(driver.execute_async_script(DUMP_STORAGE_SCRIPT, max_records))
+    state["local_storage"].pop(RESTORED_MARKER, None)
+    state["session_storage"].pop(RESTORED_MARKER, None)
+    state["cookies"] = [_cookie_param(cookie) for cookie in cookies]
+    state["captured_at"] = time.time()
+    return state
+
+
+def _cookie_param(cookie):
+    """Convert a Network.Cookie into a Network.CookieParam (session cookies keep no expiry)."""
+    param = {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+    if cookie.get("session"):
+        param.pop("expires", None)
+    return param
+
+
+def seed_script(state):
+    """Return the document-start script that restores the state's storage."""
+    storage = {key: state[key] for key in ("origin", "local_storage", "session_storage", "indexeddb")}
+    return _SEED_SCRIPT % (json.dumps(storage), json.dumps(RESTORED_MARKER))
+
+
+def save_warm_state(state, path):
+    """Write a captured state to the cache file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(temporary, path)
+
+
+def load_warm_state(path, max_age_seconds):
+    """Return the cached state, or None when it is missing, unreadable or too old."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - state.get("captured_at", 0) > max_age_seconds:
+        return None
+    return state
+
+
+def ensure_warm_state(path, max_age_seconds, capture):
+    """Return a fresh cached state, calling capture() to create one if needed.
+    
+    A lock file makes concurrent xdist workers wait for a single capture.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f"{path}.lock", "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        state = load_warm_state(path, max_age_seconds)
+        if state is None:
+            state = capture()
+            if state:
+                save_warm_state(state, path)
+        return state
@@ -0,0 +1,63 @@
+"""
+Front-end performance metrics: Navigation Timing, Resource Timing, LCP, CLS and long tasks.
+"""
+
+
+# Injected at document start (CDP Page.addScriptToEvaluateOnNewDocument) so the
+# observers see every entry from the first paint on. Also usable lazily: with
+# buffered observers, entries recorded before installation are still delivered.
+OBSERVER_SCRIPT = """
+(function () {
+    if (window.__webVitals) { return; }
+    var vitals = window.__webVitals = { lcp: null, cls: 0, longTasks: [] };
+    function observe(type, callback) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+                .observe({ type: type, buffered: true });
+        } catch (e) { /* entry type not supported by this browser */ }
+    }
+    observe('largest-contentful-paint', function (entry) { vitals.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+    observe('layout-shift', function (entry) { if (!entry.hadRecentInput) { vitals.cls += entry.value; } });
+    observe('longtask', function (entry) { vitals.longTasks.push(entry.duration); });
+})();
+"""
+
+# Async script: installs the observers if needed, lets buffered entries arrive,
+# then serializes everything in one round trip.
+COLLECT_SCRIPT = OBSERVER_SCRIPT + """
+var done = arguments[arguments.length - 1];
+setTimeout(function () {
+    var vitals = window.__webVitals;
+    var nav = performance.getEntriesByType('navigation')[0];
+    var resources = performance.getEntriesByType('resource');
+    var transfer = 0;
+    resources.forEach(function (entry) { transfer += entry.transferSize || 0; });
+    var slowest = resources.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, 5);
+    var longTaskTotal = vitals.longTasks.reduce(function (sum, value) { return sum + value; }, 0);
+    done(JSON.stringify({
+        url: location.href,
+        ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+        load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+        lcp_ms: vitals.lcp,
+        cls: vitals.cls,
+        long_task_count: vitals.longTasks.length,
+        long_tasks_total_ms: longTaskTotal,
+        resource_count: resources.length,
+        transfer_kb: transfer / 1024,
+        slowest_resources: slowest.map(function (entry) {
+            return { name: entry.name, type: entry.initiatorType, duration_ms: entry.duration };
+        })
+    }));
+}, 50);
+"""
+
+
+def check_budget(metrics, budget):
+    """Return human-readable violations of a {metric: maximum} budget."""
+    violations = []
+    for metric, maximum in budget.items():
+        value = metrics.get(metric)
+        if value is not None and value > maximum:
+            violations.append(f"{metric} = {round(value, 3)} exceeds budget {maximum}")
+    return violations